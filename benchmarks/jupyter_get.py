@@ -0,0 +1,102 @@
+"""
+Measures the latency of the Jupyter contents manager's get() on a project
+with a chain of notebooks (each one depends on the previous one), with and
+without changes to the pipeline between calls
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from statistics import median
+
+import nbformat
+from jupyter_server.services.contents.filemanager import FileContentsManager
+
+from ploomber.jupyter.manager import derive_class
+
+
+def make_project(root, n_notebooks):
+    (root / 'nbs').mkdir(parents=True, exist_ok=True)
+    tasks = []
+
+    for i in range(n_notebooks):
+        upstream = 'None' if not i else f'["nb_{i - 1}"]'
+        params = nbformat.v4.new_code_cell(
+            f'upstream = {upstream}\nproduct = None')
+        params.metadata['tags'] = ['parameters']
+
+        nb = nbformat.v4.new_notebook()
+        nb.cells = [params, nbformat.v4.new_code_cell('x = 1\n' * 20)]
+        nb.metadata['kernelspec'] = {
+            'name': 'python3',
+            'language': 'python',
+            'display_name': 'Python 3'
+        }
+        nbformat.write(nb, root / 'nbs' / f'nb_{i}.ipynb')
+        tasks.append(f'  - source: nbs/nb_{i}.ipynb\n'
+                     f'    product: output/nb_{i}.ipynb\n')
+
+    (root / 'pipeline.yaml').write_text('tasks:\n' + ''.join(tasks))
+
+
+def set_upstream(path, upstream):
+    nb = json.loads(path.read_text())
+    nb['cells'][0]['source'] = f'upstream = {upstream}\nproduct = None'
+    path.write_text(json.dumps(nb))
+
+
+def timed_get(cm, path):
+    start = time.perf_counter()
+    model = cm.get(path)
+    return time.perf_counter() - start, model
+
+
+def main(root, n_notebooks, repeat):
+    root = Path(root).resolve()
+    make_project(root, n_notebooks)
+    os.chdir(root)
+
+    cm = derive_class(FileContentsManager)(root_dir=str(root))
+    cm.log.setLevel(logging.WARNING)
+
+    middle = n_notebooks // 2
+    first, _ = timed_get(cm, f'nbs/nb_{middle}.ipynb')
+    same = [
+        timed_get(cm, f'nbs/nb_{middle}.ipynb')[0] for _ in range(repeat)
+    ]
+    others = [
+        timed_get(cm, f'nbs/nb_{i}.ipynb')[0]
+        for i in range(middle + 1, min(middle + 1 + repeat, n_notebooks))
+    ]
+
+    # what happens when the user edits the upstream of a notebook
+    set_upstream(root / 'nbs' / f'nb_{n_notebooks - 1}.ipynb', '["nb_0"]')
+    changed, model = timed_get(cm, f'nbs/nb_{n_notebooks - 1}.ipynb')
+    injected = [
+        cell for cell in model['content']['cells']
+        if 'injected-parameters' in cell['metadata'].get('tags', [])
+    ]
+
+    print(f'first get(): {first:.2f}s')
+    print(f'get(), same notebook: median {median(same) * 1000:.1f}ms')
+    print(f'get(), other notebooks: median {median(others) * 1000:.1f}ms')
+    print(f'get() after changing upstream: {changed:.2f}s')
+    print('injected cell has the new upstream:', 'nb_0' in
+          injected[0]['source'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--notebooks', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--path', help='Directory to create the project')
+    args = parser.parse_args()
+
+    if args.path:
+        main(args.path, args.notebooks, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            main(tmp, args.notebooks, args.repeat)
@@ -0,0 +1,94 @@
+"""
+Compares the throughput of SQLDump when writing parquet files: one file per
+chunk (ParquetIO), a single file with one row group per chunk
+(ParquetRowGroupIO) and, if duckdb is installed, fetching the chunks in
+Arrow format from a DuckDB cursor
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ploomber import DAG
+from ploomber.clients import DBAPIClient
+from ploomber.io import ParquetIO, ParquetRowGroupIO
+from ploomber.products import File
+from ploomber.tasks import SQLDump
+
+try:
+    import duckdb
+except ModuleNotFoundError:
+    duckdb = None
+
+
+def make_data(n_rows):
+    return pd.DataFrame({
+        'a': np.arange(n_rows),
+        'b': np.random.rand(n_rows),
+        'c': ['x%d' % i for i in range(n_rows)],
+    })
+
+
+def dump(client, product, io_handler, chunksize):
+    dag = DAG()
+    SQLDump('SELECT * FROM numbers',
+            File(product),
+            dag,
+            name='dump',
+            client=client,
+            chunksize=chunksize,
+            io_handler=io_handler)
+
+    start = time.perf_counter()
+    dag.build(force=True, show_progress=False)
+    return time.perf_counter() - start
+
+
+def main(path, n_rows, chunksize):
+    path = Path(path)
+    df = make_data(n_rows)
+
+    conn = sqlite3.connect(path / 'numbers.db')
+    df.to_sql('numbers', conn, index=False, if_exists='replace')
+    conn.close()
+
+    sqlite = (sqlite3.connect, dict(database=str(path / 'numbers.db')))
+    runs = [
+        ('sqlite, ParquetIO (one file per chunk)', sqlite,
+         path / 'sqlite-parquet', ParquetIO),
+        ('sqlite, ParquetRowGroupIO', sqlite,
+         path / 'sqlite-row-groups.parquet', ParquetRowGroupIO),
+    ]
+
+    if duckdb is not None:
+        conn = duckdb.connect(str(path / 'numbers.duckdb'))
+        conn.execute('CREATE OR REPLACE TABLE numbers AS SELECT * FROM df')
+        conn.close()
+
+        duck = (duckdb.connect, dict(database=str(path / 'numbers.duckdb')))
+        runs.append(('duckdb, ParquetRowGroupIO (Arrow batches)', duck,
+                     path / 'duckdb-row-groups.parquet', ParquetRowGroupIO))
+
+    for name, (connect, params), product, io_handler in runs:
+        # the DAG closes the client when the build finishes
+        client = DBAPIClient(connect, params)
+        elapsed = dump(client, product, io_handler, chunksize)
+        print(f'{name}: {elapsed:.1f}s ({n_rows / elapsed:,.0f} rows/s)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--path', help='Directory to store the data')
+    args = parser.parse_args()
+
+    if args.path:
+        main(args.path, args.rows, args.chunksize)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            main(tmp, args.rows, args.chunksize)
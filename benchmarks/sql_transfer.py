@@ -0,0 +1,87 @@
+"""
+Compares SQLTransfer against the pandas read_sql_query/to_sql path it
+replaced, by copying a table between two local SQLite databases
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ploomber import DAG
+from ploomber.clients import SQLAlchemyClient
+from ploomber.products import SQLiteRelation
+from ploomber.tasks import SQLTransfer
+
+
+def make_source(path, n_rows):
+    df = pd.DataFrame({
+        'a': np.arange(n_rows),
+        'b': np.random.rand(n_rows),
+        'c': ['x%d' % i for i in range(n_rows)],
+    })
+    client = SQLAlchemyClient(f'sqlite:///{path}')
+    df.to_sql('numbers', client.engine, index=False, if_exists='replace')
+    client.close()
+
+
+def transfer_pandas(source, destination, chunksize):
+    chunks = pd.read_sql_query('SELECT * FROM numbers',
+                               source.engine,
+                               chunksize=chunksize)
+
+    for i, chunk in enumerate(chunks):
+        chunk.to_sql('numbers_pandas',
+                     destination.engine,
+                     if_exists='replace' if not i else 'append',
+                     index=False)
+
+
+def transfer_ploomber(source, destination, chunksize):
+    dag = DAG()
+    SQLTransfer('SELECT * FROM numbers',
+                SQLiteRelation((None, 'numbers_ploomber', 'table'),
+                               client=destination),
+                dag,
+                name='transfer',
+                client=source,
+                chunksize=chunksize)
+    dag.build(force=True, show_progress=False)
+
+
+def timeit(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main(path, n_rows, chunksize):
+    path = Path(path)
+    make_source(path / 'source.db', n_rows)
+
+    source = SQLAlchemyClient(f'sqlite:///{path / "source.db"}')
+    destination = SQLAlchemyClient(f'sqlite:///{path / "destination.db"}')
+
+    for name, fn in [('pandas', transfer_pandas),
+                     ('SQLTransfer', transfer_ploomber)]:
+        elapsed = timeit(fn, source, destination, chunksize)
+        print(f'{name}: {elapsed:.1f}s ({n_rows / elapsed:,.0f} rows/s)')
+
+    source.close()
+    destination.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunksize', type=int, default=10_000)
+    parser.add_argument('--path', help='Directory to store the databases')
+    args = parser.parse_args()
+
+    if args.path:
+        main(args.path, args.rows, args.chunksize)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            main(tmp, args.rows, args.chunksize)
@@ -33,7 +33,10 @@ NB = [
     'papermill',
     'jupytext',
     'ipykernel>=1.5.2',
-    'jupyter_client>=5.3.1',
+    # AsyncKernelManager (kernel_pool engine)
+    'jupyter_client>=6.1.12',
+    # jupyter_core.utils.run_sync (kernel_pool engine)
+    'jupyter_core>=5.1',
     'nbconvert>=5.6.0',
     'nbformat',
     # for notebook validation
@@ -0,0 +1,219 @@
+"""
+Connection pools for database clients. Pools are kept per process and are
+shared by all copies of the same client (tasks executed in worker processes
+receive a pickled copy of the client), so connections are reused across
+tasks running in the same worker
+"""
+import os
+import uuid
+import threading
+
+# pool key -> (pid, ConnectionPool)
+_pools = {}
+_lock = threading.Lock()
+
+
+# query used to check that a connection still works
+PING = 'SELECT 1'
+
+
+def _is_valid(connection):
+    """
+    Returns False if the connection was invalidated (SQLAlchemy connections
+    have is_valid, DBAPI connections do not), this does not contact the
+    database
+    """
+    return getattr(connection, 'is_valid', True)
+
+
+def _ping(connection, reset=False):
+    """
+    Returns True if the connection can run a query. If reset, rolls back
+    any pending transaction (like SQLAlchemy does when a connection returns
+    to its pool), so uncommitted changes do not leak to the next task
+    """
+    if not _is_valid(connection):
+        return False
+
+    try:
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute(PING)
+            cursor.fetchall()
+        finally:
+            cursor.close()
+
+        if reset and hasattr(connection, 'rollback'):
+            connection.rollback()
+    except Exception:
+        return False
+
+    return True
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    """
+    A bounded pool of connections, acquire() blocks if max_size connections
+    are in use. Connections are checked (by running a trivial query) when
+    acquired and released, the ones that fail are discarded
+
+    Parameters
+    ----------
+    connect : callable
+        Function that opens a new connection
+
+    max_size : int
+        Maximum number of open connections
+    """
+    def __init__(self, connect, max_size):
+        self._connect = connect
+        self.max_size = max_size
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Returns an idle connection (discarding the ones that are no longer
+        valid), or opens a new one if there are less than max_size
+        """
+        while True:
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    self._condition.wait()
+
+                if self._idle:
+                    connection = self._idle.pop()
+                else:
+                    self._size += 1
+                    break
+
+            # ping outside the lock, so other threads are not blocked
+            if _ping(connection):
+                return connection
+
+            with self._condition:
+                self._discard(connection)
+                self._condition.notify()
+
+        try:
+            return self._connect()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+
+            raise
+
+    def release(self, connection):
+        """Returns a connection to the pool
+        """
+        # e.g., the task closed the connection
+        valid = not self._closed and _ping(connection, reset=True)
+
+        with self._condition:
+            if self._closed or not valid:
+                self._discard(connection)
+            else:
+                self._idle.append(connection)
+
+            self._condition.notify()
+
+    def close(self):
+        """
+        Closes idle connections, connections in use are closed when
+        released
+        """
+        with self._condition:
+            self._closed = True
+
+            for connection in self._idle:
+                self._discard(connection)
+
+            self._idle = []
+
+    def _discard(self, connection):
+        self._size -= 1
+        _close_quietly(connection)
+
+
+def get_pool(key, connect, max_size):
+    """
+    Returns the pool for the key in the current process (creates it if
+    needed), pools inherited from a parent process are not reused
+    """
+    pid = os.getpid()
+
+    with _lock:
+        pid_pool = _pools.get(key)
+
+        if pid_pool is None or pid_pool[0] != pid or pid_pool[1]._closed:
+            pid_pool = (pid, ConnectionPool(connect, max_size))
+            _pools[key] = pid_pool
+
+        return pid_pool[1]
+
+
+def close_pool(key):
+    """Closes the pool for the key in the current process (if any)
+    """
+    with _lock:
+        pid_pool = _pools.pop(key, None)
+
+    if pid_pool is not None and pid_pool[0] == os.getpid():
+        pid_pool[1].close()
+
+
+class PooledClientMixin:
+    """
+    Adds an optional connection pool to a client. Subclasses must implement
+    _connect() and initialize self._connection to None
+    """
+    def _init_pool(self, pool_size, max_concurrency):
+        for name, value in (('pool_size', pool_size), ('max_concurrency',
+                                                       max_concurrency)):
+            if value is not None and (not isinstance(value, int)
+                                      or isinstance(value, bool)
+                                      or value < 1):
+                raise ValueError(f'{name} must be a positive integer or '
+                                 f'None, got: {value!r}')
+
+        self.pool_size = pool_size
+        self.max_concurrency = max_concurrency
+        # identifies the pool, it is the same in all copies of this client
+        self._pool_key = uuid.uuid4().hex
+
+    def _get_pool(self):
+        return get_pool(self._pool_key, self._connect, self.pool_size)
+
+    def _pooled_connection(self):
+        if self._connection is not None and not _is_valid(self._connection):
+            self._get_pool().release(self._connection)
+            self._connection = None
+
+        if self._connection is None:
+            self._connection = self._get_pool().acquire()
+
+        return self._connection
+
+    def release(self):
+        """
+        Returns the connection to the pool (if pool_size is not None), so
+        the next task in the same process can reuse it
+        """
+        if self.pool_size is not None and self._connection is not None:
+            self._get_pool().release(self._connection)
+            self._connection = None
+
+    def _close_pool(self):
+        self.release()
+        close_pool(self._pool_key)
@@ -0,0 +1,93 @@
+"""
+Execute SQL scripts with several statements, used by DBAPIClient and
+SQLAlchemyClient
+"""
+import sqlite3
+from time import perf_counter
+from collections import namedtuple
+
+# index is the position of the first statement in the batch
+Timing = namedtuple('Timing', ['index', 'statement', 'elapsed'])
+
+
+def _dbapi_connection(connection):
+    # SQLAlchemy wraps the DBAPI connection
+    return getattr(connection, 'dbapi_connection', connection)
+
+
+def supports_multiple_statements(connection):
+    """
+    Returns False if the driver can only execute one statement per call
+    """
+    return not isinstance(_dbapi_connection(connection), sqlite3.Connection)
+
+
+def _batches(statements, batch_size, token):
+    for i in range(0, len(statements), batch_size):
+        # statements may end with a line comment, so the token must go in
+        # the next line
+        yield i, f'\n{token}\n'.join(statements[i:i + batch_size])
+
+
+def execute_script(connection, statements, batch_size=None, token=';'):
+    """
+    Executes statements and commits (rolls back if any of them fails)
+
+    Parameters
+    ----------
+    connection
+        A DBAPI connection
+
+    statements : list of str
+        The statements to execute
+
+    batch_size : int, default=None
+        If None, each statement is sent in a separate call (in the
+        connection's current transaction mode). Otherwise, statements are
+        executed in a single explicit transaction, sending batch_size
+        statements per call (joined with token), if the driver supports it
+        (otherwise, they are sent one at a time)
+
+    token : str, default=';'
+        Token to join statements in the same batch
+
+    Returns
+    -------
+    list of Timing
+        The elapsed time (in seconds) of each call
+    """
+    if batch_size is not None:
+        if not supports_multiple_statements(connection):
+            batch_size = 1
+
+        calls = list(_batches(statements, batch_size, token))
+    else:
+        calls = list(enumerate(statements))
+
+    timings = []
+    cursor = connection.cursor()
+
+    try:
+        # some drivers (e.g., sqlite3) do not open a transaction before DDL
+        # statements, which commits after each one
+        if (batch_size is not None
+                and getattr(connection, 'in_transaction', None) is False):
+            cursor.execute('BEGIN')
+
+        for index, code in calls:
+            start = perf_counter()
+            cursor.execute(code)
+            timings.append(Timing(index, code, perf_counter() - start))
+
+        connection.commit()
+    except BaseException:
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+
+        raise
+    finally:
+        cursor.close()
+
+    return timings
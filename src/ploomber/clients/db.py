@@ -10,6 +10,8 @@ except ImportError:
     sqlalchemy = None
 
 from ploomber.clients.client import Client
+from ploomber.clients._pool import PooledClientMixin
+from ploomber.clients._script import execute_script
 from ploomber.util import requires
 
 
@@ -21,6 +23,24 @@ def code_split(code, token=';'):
             yield part
 
 
+def _validate_batch_size(batch_size):
+    if batch_size is not None and (not isinstance(batch_size, int)
+                                   or isinstance(batch_size, bool)
+                                   or batch_size < 1):
+        raise ValueError('batch_size must be a positive integer or None, '
+                         f'got: {batch_size!r}')
+
+    return batch_size
+
+
+def _execute(connection, code, token, batch_size):
+    statements = list(code_split(code, token=token)) if token else [code]
+    return execute_script(connection,
+                          statements,
+                          batch_size=batch_size,
+                          token=token or ';')
+
+
 def _get_url_obj(uri):
     if isinstance(uri, str):
         return sqlalchemy.engine.make_url(uri)
@@ -32,7 +52,7 @@ def _get_url_obj(uri):
                         f'{type(uri).__name__}')
 
 
-class DBAPIClient(Client):
+class DBAPIClient(PooledClientMixin, Client):
     """A client for a PEP 249 compliant client library
 
     Parameters
@@ -49,6 +69,29 @@ class DBAPIClient(Client):
         character (e.g. ';') and send them one at a time. Defaults to
         None (no splitting)
 
+    pool_size : int, optional
+        If not None, connections are taken from a pool (one per process)
+        with at most this number of connections, instead of opening one per
+        client. The pool is shared by all the tasks that use this client in
+        the same process (including worker processes in the Parallel
+        executor, which return the connection to the pool after each task).
+        Connections are checked before being reused and the pool is closed
+        with the client (e.g., by ``DAG.close_clients()``)
+
+    max_concurrency : int, optional
+        Maximum number of tasks using this client that the Parallel
+        executor runs at the same time (by default, it's only limited by
+        the number of processes)
+
+    batch_size : int, optional
+        If not None, scripts run in a single explicit transaction (rolled
+        back if any statement fails) and statements are sent ``batch_size``
+        at a time (joined with ``split_source``), reducing the number of
+        round trips (the driver must support several statements per call).
+        ``sqlite3`` connections get one transaction but statements are sent
+        one at a time. ``execute`` returns the time it took to run each
+        batch
+
     Examples
     --------
 
@@ -155,22 +198,36 @@ class DBAPIClient(Client):
         A client to connect to a database using sqlalchemy as backend
 
     """
-    def __init__(self, connect_fn, connect_kwargs, split_source=None):
+    def __init__(self,
+                 connect_fn,
+                 connect_kwargs,
+                 split_source=None,
+                 pool_size=None,
+                 max_concurrency=None,
+                 batch_size=None):
         super().__init__()
         self.connect_fn = connect_fn
         self.connect_kwargs = connect_kwargs
         self.split_source = split_source
+        self.batch_size = _validate_batch_size(batch_size)
+        self._init_pool(pool_size, max_concurrency)
 
         # there is no open connection by default
         self._connection = None
 
+    def _connect(self):
+        return self.connect_fn(**self.connect_kwargs)
+
     @property
     def connection(self):
         """Return a connection, open one if there isn't any
         """
+        if self.pool_size is not None:
+            return self._pooled_connection()
+
         # if there isn't an open connection, open one...
         if self._connection is None:
-            self._connection = self.connect_fn(**self.connect_kwargs)
+            self._connection = self._connect()
 
         return self._connection
 
@@ -178,23 +235,18 @@ class DBAPIClient(Client):
         return self.connection.cursor()
 
     def execute(self, code):
-        """Execute code with the existing connection
+        """Execute code with the existing connection, returns the time it
+        took to run each statement (or batch if using batch_size)
         """
-        cur = self.connection.cursor()
-
-        if self.split_source:
-            for command in code_split(code, token=self.split_source):
-                cur.execute(command)
-        else:
-            cur.execute(code)
-
-        self.connection.commit()
-        cur.close()
+        return _execute(self.connection, code, self.split_source,
+                        self.batch_size)
 
     def close(self):
         """Close connection if there is an active one
         """
-        if self._connection is not None:
+        if self.pool_size is not None:
+            self._close_pool()
+        elif self._connection is not None:
             self._connection.close()
 
     def __getstate__(self):
@@ -203,7 +255,7 @@ class DBAPIClient(Client):
         return state
 
 
-class SQLAlchemyClient(Client):
+class SQLAlchemyClient(PooledClientMixin, Client):
     """Client for connecting with any SQLAlchemy supported database
 
     Parameters
@@ -224,6 +276,29 @@ class SQLAlchemyClient(Client):
     create_engine_kwargs : dict, optional
         Keyword arguments to pass to ``sqlalchemy.create_engine``
 
+    pool_size : int, optional
+        If not None, connections are taken from a pool (one per process)
+        with at most this number of connections, instead of opening one per
+        client. The pool is shared by all the tasks that use this client in
+        the same process (including worker processes in the Parallel
+        executor, which return the connection to the pool after each task).
+        Connections are checked before being reused and the pool is closed
+        with the client (e.g., by ``DAG.close_clients()``)
+
+    max_concurrency : int, optional
+        Maximum number of tasks using this client that the Parallel
+        executor runs at the same time (by default, it's only limited by
+        the number of processes)
+
+    batch_size : int, optional
+        If not None, scripts run in a single explicit transaction (rolled
+        back if any statement fails) and statements are sent ``batch_size``
+        at a time (joined with the split token), reducing the number of
+        round trips. Drivers that only execute one statement per call
+        (e.g., ``sqlite3``) still get one transaction, which avoids
+        committing after each statement. ``execute`` returns the time it
+        took to run each batch
+
     Notes
     -----
     SQLite client does not support sending more than one command at a time,
@@ -342,7 +417,13 @@ class SQLAlchemyClient(Client):
     split_source_mapping = {'sqlite': ';'}
 
     @requires(['sqlalchemy'], 'SQLAlchemyClient')
-    def __init__(self, uri, split_source='default', create_engine_kwargs=None):
+    def __init__(self,
+                 uri,
+                 split_source='default',
+                 create_engine_kwargs=None,
+                 pool_size=None,
+                 max_concurrency=None,
+                 batch_size=None):
         super().__init__()
         self._uri = uri
 
@@ -359,11 +440,19 @@ class SQLAlchemyClient(Client):
             parent_folder.mkdir(exist_ok=True, parents=True)
 
         self._connection = None
+        self.batch_size = _validate_batch_size(batch_size)
+        self._init_pool(pool_size, max_concurrency)
+
+    def _connect(self):
+        return self.engine.raw_connection()
 
     @property
     def connection(self):
         """Return a connection from the pool
         """
+        if self.pool_size is not None:
+            return self._pooled_connection()
+
         # we have to keep this reference here,
         # if we just return self.engine.raw_connection(),
         # any cursor from that connection will fail
@@ -382,29 +471,26 @@ class SQLAlchemyClient(Client):
         return self.connection.cursor()
 
     def execute(self, code):
-        cur = self.connection.cursor()
-
+        """Execute code, returns the time it took to run each statement (or
+        batch if using batch_size)
+        """
         # if split_source is default, and there's a default token defined,
         # use it
-        if (self.split_source == 'default'
-                and self.flavor in self.split_source_mapping):
-            token = self.split_source_mapping[self.flavor]
-            for command in code_split(code, token=token):
-                cur.execute(command)
-        # otherwise interpret split_source as the token
-        elif self.split_source:
-            for command in code_split(code, token=self.split_source):
-                cur.execute(command)
-        # if no split_source, execute all at once
+        if self.split_source == 'default':
+            token = self.split_source_mapping.get(self.flavor)
+        # otherwise interpret split_source as the token (if no split_source,
+        # execute all at once)
         else:
-            cur.execute(code)
+            token = self.split_source
 
-        self.connection.commit()
-        cur.close()
+        return _execute(self.connection, code, token, self.batch_size)
 
     def close(self):
         """Closes all connections
         """
+        if self.pool_size is not None:
+            self._close_pool()
+
         if self._engine is not None:
             self._engine.dispose()
             self._engine = None
@@ -1,11 +1,15 @@
 import glob
 import abc
-from pathlib import PurePosixPath, Path
+import contextlib
+from pathlib import PurePath, PurePosixPath, Path
 
 from ploomber.clients.storage.util import _resolve
 
 
 class AbstractStorageClient(abc.ABC):
+    # remote files listed by _listing()
+    _index = None
+
     @abc.abstractmethod
     def __init__(self):
         pass
@@ -87,13 +91,115 @@ class AbstractStorageClient(abc.ABC):
 
     def _remote_exists(self, local):
         remote = self._remote_path(local)
-        is_file = self._is_file(remote)
+        is_file = self._is_file_listed(remote)
 
         if is_file:
             return True
 
-        return self._is_dir(remote)
+        return self._is_dir_listed(remote)
+
+    def _list(self, prefix):
+        """
+        Returns the remote paths of all files under a prefix (recursively).
+        Clients that do not implement this method check if each remote file
+        exists with separate calls
+        """
+        raise NotImplementedError
+
+    @contextlib.contextmanager
+    def _listing(self, paths):
+        """
+        Lists the remote folders where the given local paths are stored
+        (one call per folder), while the context manager is active, checking
+        if any of those paths exist remotely uses the listing instead of
+        making one call per path
+        """
+        prefixes = _minimal_prefixes(
+            str(PurePosixPath(_as_key(self._remote_path(path))).parent)
+            for path in paths)
+        keys = []
+
+        try:
+            for prefix in prefixes:
+                keys.extend(self._list('' if prefix == '.' else prefix))
+        except NotImplementedError:
+            yield
+            return
+
+        self._index = _RemoteIndex(prefixes, keys)
+
+        try:
+            yield
+        finally:
+            self._index = None
+
+    def _is_file_listed(self, remote):
+        """Like _is_file but uses the listing, if available
+        """
+        is_file = None if self._index is None else self._index.is_file(remote)
+        return self._is_file(remote) if is_file is None else is_file
+
+    def _is_dir_listed(self, remote):
+        """Like _is_dir but uses the listing, if available
+        """
+        is_dir = None if self._index is None else self._index.is_dir(remote)
+        return self._is_dir(remote) if is_dir is None else is_dir
 
     def close(self):
         # required to comply with the Client API
         pass
+
+
+def _as_key(path):
+    """Normalizes a remote path (str or pathlib.Path) to a posix str
+    """
+    return path.as_posix() if isinstance(path, PurePath) else str(path)
+
+
+def _minimal_prefixes(prefixes):
+    """
+    Removes duplicated prefixes and the ones contained in another prefix
+    (listing is recursive)
+    """
+    prefixes = set(prefixes)
+
+    # the project root contains everything else
+    if '.' in prefixes:
+        return ['.']
+
+    return sorted(
+        prefix for prefix in prefixes
+        if not any(str(parent) in prefixes
+                   for parent in PurePosixPath(prefix).parents))
+
+
+class _RemoteIndex:
+    """
+    Files that exist in remote storage under a set of prefixes, returned by
+    AbstractStorageClient._listing. Lookups return None for paths outside
+    the listed prefixes
+    """
+    def __init__(self, prefixes, keys):
+        self._prefixes = set(prefixes)
+        self._files = set(_as_key(key) for key in keys)
+        self._dirs = set()
+
+        for key in self._files:
+            for parent in PurePosixPath(key).parents:
+                self._dirs.add(str(parent))
+
+    def __len__(self):
+        return len(self._files)
+
+    def _covers(self, key):
+        return '.' in self._prefixes or any(
+            str(parent) in self._prefixes
+            for parent in PurePosixPath(key).parents)
+
+    def is_file(self, remote):
+        key = _as_key(remote)
+        return key in self._files if self._covers(key) else None
+
+    def is_dir(self, remote):
+        key = _as_key(remote)
+        return key in self._dirs if self._covers(key) else None
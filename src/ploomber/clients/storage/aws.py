@@ -211,7 +211,7 @@ class S3Client(AbstractStorageClient):
 
         # FIXME: call _download directly and catch the exception to avoid
         # doing to api calls
-        if self._is_file(remote):
+        if self._is_file_listed(remote):
             self._download(destination, remote)
         else:
             paginator = self._client.get_paginator('list_objects_v2')
@@ -238,6 +238,16 @@ class S3Client(AbstractStorageClient):
         Path(local).parent.mkdir(exist_ok=True, parents=True)
         self._client.download_file(self._bucket_name, remote, str(local))
 
+    def _list(self, prefix):
+        paginator = self._client.get_paginator('list_objects_v2')
+        kwargs = dict(Prefix=f'{prefix}/') if prefix else dict()
+
+        return [
+            remote_file['Key']
+            for page in paginator.paginate(Bucket=self._bucket_name, **kwargs)
+            for remote_file in page.get('Contents', [])
+        ]
+
     def _is_file(self, remote):
         resource = boto3.resource('s3', **self._client_kwargs)
 
@@ -213,7 +213,7 @@ class GCloudStorageClient(AbstractStorageClient):
         destination = destination or local
 
         # FIXME: downlod and catch exception to avoid making two API calls
-        if self._is_file(remote):
+        if self._is_file_listed(remote):
             self._download(destination, remote)
         else:
             counter = 0
@@ -231,6 +231,12 @@ class GCloudStorageClient(AbstractStorageClient):
                                          f'{local!r} using client {self}: '
                                          'No such file or directory')
 
+    def _list(self, prefix):
+        return [
+            blob.name for blob in self._bucket.client.list_blobs(
+                self._bucket_name, prefix=f'{prefix}/' if prefix else None)
+        ]
+
     def _is_file(self, remote):
         return self._bucket.blob(remote).exists()
 
@@ -44,15 +44,12 @@ class LocalStorageClient(AbstractStorageClient):
         relative = _resolve(local).relative_to(self._path_to_project_root)
         return Path(self._path_to_backup_dir, relative)
 
-    def _remote_exists(self, local):
-        return self._remote_path(local).exists()
-
     def download(self, local, destination=None):
         remote = self._remote_path(local)
         destination = destination or local
         Path(destination).parent.mkdir(exist_ok=True, parents=True)
 
-        if remote.is_file():
+        if self._is_file_listed(remote):
             # shutil.copy tries to preserve metadata, we found a race
             # condition on macOS (our CI would fail from time to time)
             # so we are now using copyfile since it doesn't copy metadata
@@ -76,14 +73,22 @@ class LocalStorageClient(AbstractStorageClient):
     def _download(self, local, remote):
         raise NotImplementedError
 
+    def _list(self, prefix):
+        path = Path(prefix)
+
+        if not path.is_dir():
+            return []
+
+        return [str(file_) for file_ in path.rglob('*') if file_.is_file()]
+
     def _upload(self, local):
         raise NotImplementedError
 
     def _is_file(self, remote):
-        raise NotImplementedError
+        return Path(remote).is_file()
 
     def _is_dir(self, remote):
-        raise NotImplementedError
+        return Path(remote).is_dir()
 
     def __repr__(self):
         return f'{type(self).__name__}({str(self._path_to_backup_dir)!r})'
@@ -2,8 +2,17 @@
 Utils for comparing source code
 """
 import io
+import os
+import json
+import uuid
+import sqlite3
+import hashlib
+import weakref
+import threading
 import tokenize
 from difflib import Differ
+from pathlib import Path
+from collections import OrderedDict
 import parso
 import ast
 
@@ -19,6 +28,22 @@ except ImportError:
 from ploomber.products.serializeparams import remove_non_serializable_top_keys
 
 
+class _Memo(OrderedDict):
+    """In-memory cache of normalized code
+    """
+    def __init__(self):
+        super().__init__()
+        # normalizing is CPU-bound, so threads that miss the cache at the
+        # same time normalize one at a time (and reuse each other's
+        # results) instead of competing for the GIL
+        self.lock = threading.Lock()
+
+
+# differ id -> in-memory cache, so copies of a differ in the same process
+# (e.g., tasks running in threads) share it
+_memos = weakref.WeakValueDictionary()
+
+
 def normalize_null(code):
     return code
 
@@ -104,14 +129,236 @@ def diff_strings(a, b):
     return out
 
 
+def _normalizer_version(extension):
+    """
+    Version of the library used to normalize code, cached normalized code
+    is invalidated if it changes
+    """
+    if extension == 'py':
+        return getattr(autopep8, '__version__', None)
+    elif extension == 'sql':
+        return getattr(sqlparse, '__version__', None)
+
+    return None
+
+
+def _sha256(code):
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+class NormalizedCodeCache:
+    """
+    Stores normalized code in a SQLite database, keyed by a hash of the raw
+    code, the extension and the version of the library used to normalize it
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Path to the database, parent directories are created if needed
+
+    max_size : int, default=10000
+        Maximum number of entries, the oldest ones are deleted when it's
+        exceeded
+
+    Notes
+    -----
+    The connection is opened lazily and it is not pickled, so the cache
+    can be sent to other processes
+    """
+    def __init__(self, path, max_size=10000):
+        self.path = Path(path).resolve()
+        self.max_size = max_size
+        self._conn = None
+        self._pid = None
+
+    def __repr__(self):
+        return f'{type(self).__name__}({str(self.path)!r})'
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        state['_pid'] = None
+        return state
+
+    def get(self, key):
+        """Returns the normalized code for the key, None if missing
+        """
+        row = self._connection().execute(
+            'SELECT code FROM normalized WHERE key = ?', (key, )).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, key, code):
+        """Stores normalized code and deletes the oldest entries if needed
+        """
+        conn = self._connection()
+
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO normalized (key, code) VALUES (?, ?)',
+                (key, code))
+            conn.execute(
+                'DELETE FROM normalized WHERE rowid <= '
+                '(SELECT MAX(rowid) FROM normalized) - ?', (self.max_size, ))
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connection(self):
+        # sqlite connections cannot be shared with forked processes
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=60)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            # rowid increases with each insertion (INSERT OR REPLACE
+            # deletes the old row), so the smallest ones are the oldest
+            self._conn.execute('CREATE TABLE IF NOT EXISTS normalized '
+                               '(key TEXT PRIMARY KEY, code TEXT NOT NULL)')
+            self._pid = os.getpid()
+
+        return self._conn
+
+
 class CodeDiffer:
+    """
+    Compares source code (after normalizing it) to determine if a task is
+    outdated
+
+    Parameters
+    ----------
+    cache : str or pathlib.Path, default=None
+        Path to a SQLite database to store normalized code, so it is reused
+        across processes and sessions. If None, normalized code is only
+        cached in memory
+
+    max_size : int, default=10000
+        Maximum number of entries in the in-memory and on-disk caches
+
+    Notes
+    -----
+    Normalizing Python (autopep8) and SQL (sqlparse) code is slow, so
+    normalized code is cached, keyed by a hash of the raw code
+    """
     NORMALIZERS = {
         None: normalize_null,
         'py': normalize_python,
         'sql': normalize_sql
     }
 
-    def is_different(self, a, b, a_params, b_params, extension=None):
+    def __init__(self, cache=None, max_size=10000):
+        self.max_size = max_size
+        self._cache = (None if cache is None else NormalizedCodeCache(
+            cache, max_size=max_size))
+        self._id = uuid.uuid4().hex
+        self._memo = _memos.setdefault(self._id, _Memo())
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the in-memory cache is not pickled, copies in the same process
+        # reuse it
+        del state['_memo']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._memo = _memos.setdefault(self._id, _Memo())
+
+    def normalize(self, code, extension=None):
+        """
+        Normalizes code (cached), returns it as is for extensions that do
+        not have a normalizer
+        """
+        normalizer = self._get_normalizer(extension)
+
+        if code is None or normalizer is normalize_null:
+            return normalizer(code)
+
+        key = self._key(code, extension)
+
+        # the cache may be shared with other threads, an entry can be
+        # evicted between calls
+        try:
+            self._memo.move_to_end(key)
+            return self._memo[key]
+        except KeyError:
+            pass
+
+        with self._memo.lock:
+            normalized = self._memo.get(key)
+
+            if normalized is not None:
+                return normalized
+
+            normalized = (None
+                          if self._cache is None else self._cache.get(key))
+
+            if normalized is None:
+                normalized = normalizer(code)
+
+                if self._cache is not None and normalized is not None:
+                    self._cache.set(key, normalized)
+
+            self._memo[key] = normalized
+
+            if len(self._memo) > self.max_size:
+                self._memo.popitem(last=False)
+
+        return normalized
+
+    def normalized_digest(self, code, extension=None, compute=True):
+        """
+        Returns a digest of the code and the normalized code
+        ({raw}:{normalized}), it is stored in the product's metadata so
+        is_different only has to normalize the current source code
+
+        Parameters
+        ----------
+        compute : bool, default=True
+            If False, returns None instead of normalizing the code if it
+            is not in the in-memory or on-disk caches
+        """
+        if code is None:
+            return None
+
+        if compute:
+            normalized = self.normalize(code, extension)
+        else:
+            normalized = self._cached(code, extension)
+
+            if normalized is None:
+                return None
+
+        return '{}:{}'.format(_sha256(code), _sha256(normalized))
+
+    def _key(self, code, extension):
+        return hashlib.sha256(
+            json.dumps([extension, _normalizer_version(extension),
+                        code]).encode('utf-8')).hexdigest()
+
+    def _cached(self, code, extension):
+        """
+        Returns the normalized code if it does not require normalizing it
+        (it's cached or there is no normalizer), None otherwise
+        """
+        if self._get_normalizer(extension) is normalize_null:
+            return normalize_null(code)
+
+        key = self._key(code, extension)
+        normalized = self._memo.get(key)
+
+        if normalized is None and self._cache is not None:
+            normalized = self._cache.get(key)
+
+        return normalized
+
+    def is_different(self,
+                     a,
+                     b,
+                     a_params,
+                     b_params,
+                     extension=None,
+                     a_digest=None):
         """
         Compares code and params to determine if it's changed. Ignores top-keys
         in a_params or b_params if they're no JSON serializable.
@@ -135,6 +382,10 @@ class CodeDiffer:
             as whitespace to trigger false positives. Normalization only
             available for .py and .sql, other languages are compared as is
 
+        a_digest : str, default=None
+            Digest of a (see normalized_digest), if its normalized part
+            matches the normalized b, a is not normalized
+
         Returns
         -------
         result : bool
@@ -148,12 +399,6 @@ class CodeDiffer:
         -----
         Params comparison is ignored if either a_params or b_params is None
         """
-        # TODO: this can be more efficient. ie only compare source code
-        # if params are the same and only get diff if result is True
-        normalizer = self._get_normalizer(extension)
-        a_norm = normalizer(a)
-        b_norm = normalizer(b)
-
         if a_params is None or b_params is None:
             outdated_params = False
         else:
@@ -161,6 +406,24 @@ class CodeDiffer:
             b_params_ = remove_non_serializable_top_keys(b_params)
             outdated_params = (a_params_ != b_params_)
 
+        # equal raw code (the most common case) does not need normalization
+        if a == b:
+            return outdated_params, self.get_diff(a, b, normalize=False)
+
+        # the stored digest is only valid if it was computed from a (e.g.,
+        # metadata may have been edited)
+        raw, _, normalized = (a_digest or '').partition(':')
+
+        if (a is not None and b is not None and raw == _sha256(a)
+                and normalized == _sha256(self.normalize(b, extension))):
+            b_norm = self.normalize(b, extension)
+            return outdated_params, self.get_diff(b_norm,
+                                                  b_norm,
+                                                  normalize=False)
+
+        a_norm = self.normalize(a, extension)
+        b_norm = self.normalize(b, extension)
+
         result = outdated_params or (a_norm != b_norm)
         # TODO: improve diff view, also show a params diff view. probably
         # we need to normalize them first (maybe using pprint?) then take
@@ -175,10 +438,8 @@ class CodeDiffer:
         # TODO: remove normalize param, we are already normalizing in the
         # is_different method
         if normalize:
-            normalizer = self._get_normalizer(extension)
-
-            a = normalizer(a)
-            b = normalizer(b)
+            a = self.normalize(a, extension)
+            b = self.normalize(b, extension)
 
         diff = diff_strings(a, b)
 
@@ -0,0 +1,175 @@
+"""
+Incremental rendering: keep track of the state of each task the last time it
+was rendered so subsequent DAG.render() calls only process the tasks that
+changed (and their downstream dependencies)
+"""
+import os
+from hashlib import md5
+
+from ploomber.constants import TaskStatus
+from ploomber.products.file import File
+from ploomber.products.metaproduct import MetaProduct
+
+# only tasks that rendered successfully are cached, the rest are always
+# rendered again
+_CACHEABLE = {
+    TaskStatus.WaitingExecution,
+    TaskStatus.WaitingUpstream,
+    TaskStatus.WaitingDownload,
+    TaskStatus.Skipped,
+}
+
+
+def _stat(path):
+    """Returns a (mtime, size) tuple for a file or None if it doesn't exist
+    """
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _source_signature(source):
+    loc = source.loc
+
+    if loc is None:
+        return None
+
+    loc = str(loc)
+    # PythonCallableSource includes the line number (e.g., path/to/file.py:10)
+    path, sep, line = loc.rpartition(':')
+
+    if sep and line.isdigit():
+        loc = path
+
+    return loc, _stat(loc)
+
+
+def _params_signature(params):
+    params = params.to_json_serializable(params_only=True)
+    resources = params.get('resources_')
+
+    # files in resources_ are part of the outdated status, they are hashed
+    # when saving metadata so we check if they changed
+    if isinstance(resources, dict):
+        files = tuple((key, _stat(value))
+                      for key, value in sorted(resources.items(),
+                                               key=lambda item: item[0]))
+    else:
+        files = None
+
+    # sort by the str representation since keys may have different types
+    items = sorted(params.items(), key=lambda item: str(item[0]))
+    return md5(repr(items).encode('utf-8')).hexdigest(), files
+
+
+def _products(product):
+    return list(product) if isinstance(product, MetaProduct) else [product]
+
+
+def _product_signature(product):
+    """
+    (mtime, size) of each File (None if it doesn't exist), to detect
+    products deleted or modified outside ploomber. Other products (e.g.,
+    tables) are not checked, since it would require querying the database
+    """
+    return tuple(
+        _stat(str(p)) if isinstance(p, File) else None
+        for p in _products(product))
+
+
+def _product_has_cached_status(product):
+    """
+    Products cache their outdated status after rendering, the cache is
+    cleared when their metadata changes (e.g., after building the task), in
+    which case we have to render again
+    """
+    return all(
+        getattr(p, '_is_outdated_status', None) is not None
+        for p in _products(product))
+
+
+class RenderState:
+    """
+    Stores the status of each task after rendering along with a key that
+    identifies the conditions under which it was rendered (the task object,
+    the source file's modification time, the params, the upstream
+    dependencies and the modification time of its File products). A task is
+    dirty if its key changed, if its status changed since it was rendered
+    (e.g., it was executed), if its product discarded its cached outdated
+    status or if any of its upstream dependencies is dirty. If a product
+    changed outside ploomber (e.g., it was deleted), the metadata of the
+    task and its downstream dependencies is cleared, so their outdated
+    status is computed again
+
+    Notes
+    -----
+    Clean tasks are not rendered again, which implies that their on_render
+    hooks won't run, and warnings raised when rendering them won't be
+    displayed again
+    """
+    def __init__(self):
+        self._state = {}
+
+    def __len__(self):
+        return len(self._state)
+
+    def clear(self):
+        self._state = {}
+
+    def dirty(self, dag, force, outdated_by_code):
+        """
+        Returns a dictionary with the dirty tasks and the keys to store
+        once they are rendered (in topological order) and a dictionary
+        with the clean tasks and their cached status
+        """
+        dirty, clean = {}, {}
+        # tasks whose products (or upstream products) changed outside
+        # ploomber
+        changed = set()
+
+        for name in dag:
+            task = dag[name]
+            upstream = tuple(task.upstream)
+            product = _product_signature(task.product)
+            key = (id(task), force, outdated_by_code,
+                   _source_signature(task.source),
+                   _params_signature(task.params), upstream, product)
+            last = self._state.get(name)
+
+            # if the status changed, ploomber built the task and the
+            # metadata is up-to-date
+            if (last is not None and last[1] == task.exec_status
+                    and last[0][-1] != product) or any(up in changed
+                                                       for up in upstream):
+                task.product.metadata.clear()
+                changed.add(name)
+
+            is_dirty = (last is None or last[0] != key
+                        or last[1] != task.exec_status
+                        or any(up in dirty for up in upstream)
+                        or (not force
+                            and not _product_has_cached_status(task.product)))
+
+            if is_dirty:
+                dirty[name] = key
+            else:
+                clean[name] = last[1]
+
+        return dirty, clean
+
+    def update(self, dag, keys):
+        """Stores the status of the tasks that were rendered
+        """
+        for name, key in keys.items():
+            status = dag[name].exec_status
+
+            if status in _CACHEABLE:
+                self._state[name] = (key, status)
+            else:
+                self._state.pop(name, None)
+
+        for name in set(self._state) - set(dag._iter()):
+            del self._state[name]
@@ -93,6 +93,7 @@ from ploomber.dag.dagconfiguration import DAGConfiguration
 from ploomber.dag.daglogger import DAGLogger
 from ploomber.dag.dagclients import DAGClients
 from ploomber.dag.abstractdag import AbstractDAG
+from ploomber.dag._incremental import RenderState
 from ploomber.dag.util import (check_duplicated_products,
                                fetch_remote_metadata_in_parallel,
                                _path_for_plot)
@@ -231,6 +232,7 @@ class DAG(AbstractDAG):
         self._available_callback_kwargs = {'dag': self}
 
         self._params = DAGConfiguration()
+        self._render_state = RenderState()
 
         # task access differ using .dag.differ
         self.differ = self._params.differ
@@ -403,15 +405,38 @@ class DAG(AbstractDAG):
             if not force:
                 fetch_remote_metadata_in_parallel(self)
 
+                # load the metadata of all File products with one query
+                if self._params.metadata_store is not None:
+                    self._params.metadata_store.fetch_all()
+
+            # remote status is not cached by products, render everything
+            incremental = self._params.incremental_render and not remote
+
+            if incremental:
+                keys, clean = self._render_state.dirty(
+                    self,
+                    force=force,
+                    outdated_by_code=self._params.outdated_by_code)
+
+                # restore clean tasks first since dirty tasks use their
+                # status when rendering
+                for name, status in clean.items():
+                    self[name]._exec_status = status
+
+                to_render = [self[name] for name in keys]
+            else:
+                self._render_state.clear()
+                to_render = self.values()
+
             if show_progress:
-                tasks = tqdm(self.values(), total=len(self))
+                tasks = tqdm(to_render, total=len(to_render))
             else:
-                tasks = self.values()
+                tasks = to_render
 
             exceptions = RenderExceptionsCollector()
             warnings_ = RenderWarningsCollector()
 
-            # reset all tasks status
+            # reset tasks status
             for task in tasks:
                 task.exec_status = TaskStatus.WaitingRender
 
@@ -441,6 +466,9 @@ class DAG(AbstractDAG):
                     warnings_str = [str(w.message) for w in warnings_current]
                     warnings_.append(task=t, message='\n'.join(warnings_str))
 
+            if incremental:
+                self._render_state.update(self, keys)
+
             if warnings_:
                 # FIXME: maybe raise one by one to keep the warning type
                 warnings.warn(str(warnings_))
@@ -600,8 +628,10 @@ class DAG(AbstractDAG):
                 build_exception = None
 
             if build_exception is None:
+                cache = None if self._params.product_cache is None else ''
                 empty = [
-                    TaskReport.empty_with_name(t.name) for t in self.values()
+                    TaskReport.empty_with_name(t.name, cache=cache)
+                    for t in self.values()
                     if t.exec_status == TaskStatus.Skipped
                 ]
 
@@ -1,4 +1,9 @@
+from collections.abc import Mapping
+
 from ploomber.codediffer import CodeDiffer
+from ploomber.products._metadatastore import _make_metadata_store
+from ploomber.products._cache import _make_product_cache
+from ploomber.sources._nbcache import _make_notebook_cache
 
 
 def _logging_factory():
@@ -11,7 +16,8 @@ class DAGConfiguration:
     """
     __attrs = {
         'outdated_by_code', 'cache_rendered_status', 'logging_factory',
-        'differ', 'hot_reload'
+        'differ', 'hot_reload', 'incremental_render', 'metadata_store',
+        'product_cache', 'outdated_by_digest', 'notebook_cache'
     }
 
     @classmethod
@@ -25,7 +31,12 @@ class DAGConfiguration:
 
     def __init__(self):
         self.outdated_by_code = True
+        self.outdated_by_digest = False
         self.cache_rendered_status = False
+        self.incremental_render = False
+        self.metadata_store = None
+        self.product_cache = None
+        self.notebook_cache = None
         self.hot_reload = False
         self.logging_factory = _logging_factory
         self.differ = CodeDiffer()
@@ -41,6 +52,17 @@ class DAGConfiguration:
 
         self._outdated_by_code = value
 
+    @property
+    def outdated_by_digest(self):
+        return self._outdated_by_digest
+
+    @outdated_by_digest.setter
+    def outdated_by_digest(self, value):
+        if value not in {True, False}:
+            raise ValueError('outdated_by_digest must be True or False')
+
+        self._outdated_by_digest = value
+
     @property
     def hot_reload(self):
         return self._hot_reload
@@ -63,6 +85,41 @@ class DAGConfiguration:
 
         self._cache_rendered_status = value
 
+    @property
+    def incremental_render(self):
+        return self._incremental_render
+
+    @incremental_render.setter
+    def incremental_render(self, value):
+        if value not in {True, False}:
+            raise ValueError('incremental_render must be True or False')
+
+        self._incremental_render = value
+
+    @property
+    def metadata_store(self):
+        return self._metadata_store
+
+    @metadata_store.setter
+    def metadata_store(self, value):
+        self._metadata_store = _make_metadata_store(value)
+
+    @property
+    def product_cache(self):
+        return self._product_cache
+
+    @product_cache.setter
+    def product_cache(self, value):
+        self._product_cache = _make_product_cache(value)
+
+    @property
+    def notebook_cache(self):
+        return self._notebook_cache
+
+    @notebook_cache.setter
+    def notebook_cache(self, value):
+        self._notebook_cache = _make_notebook_cache(value)
+
     @property
     def differ(self):
         return self._differ
@@ -71,6 +128,8 @@ class DAGConfiguration:
     def differ(self, value):
         if value == 'default':
             value = CodeDiffer()
+        elif isinstance(value, Mapping):
+            value = CodeDiffer(**value)
 
         self._differ = value
 
@@ -23,6 +23,12 @@ class DAGConfigurator:
     Available parameters:
 
     outdated_by_code: whether source code differences make a task outdated
+
+    outdated_by_digest: If True, products store a digest of their contents
+    (Files, SQLite and PostgreSQL relations) in their metadata and a task
+    is outdated only if the contents of its upstream products changed, not
+    when they have a more recent timestamp (e.g., an upstream task ran again
+    but generated the same output). Products without a digest use timestamps
     cache_rendered_status: keep results from dag.render() whenever are needed
     again (e.g. when calling dag.build()) or compute it again every time.
 
@@ -32,6 +38,29 @@ class DAGConfigurator:
 
     hot_reload: Reload sources whenever they are updated
 
+    differ: CodeDiffer used to compare source code, pass a dictionary with
+    options (cache, max_size) to store normalized code in a SQLite
+    database (e.g., {'cache': '.ploomber/normalized.db'})
+
+    incremental_render: If True, dag.render() only renders tasks whose
+    source, params, product status or upstream dependencies changed since
+    the last call (and their downstream tasks), other tasks keep their status
+
+    metadata_store: Where to store the metadata of File products. If None,
+    each file has a sidecar file (.{name}.metadata), if 'sqlite', metadata is
+    stored in a single SQLite database (.ploomber/metadata.db)
+
+    notebook_cache: Path to a SQLite database to store the notebooks parsed
+    by NotebookRunner and ScriptRunner (e.g., '.ploomber/notebooks.db'), so
+    they are reused across processes and sessions. Parsed notebooks are
+    always cached in memory
+
+    product_cache: Content-addressed cache for File products. If not None,
+    tasks whose source, params and upstream products match a previous run
+    copy their products from the cache instead of running. Pass a path to
+    the cache directory or a dictionary with options (path, client,
+    max_size, link)
+
     Examples
     --------
     >>> from ploomber import DAGConfigurator
@@ -8,6 +8,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from ploomber.exceptions import DAGWithDuplicatedProducts
 from ploomber.products.metaproduct import MetaProduct
 from ploomber.products import File
+from ploomber.clients.storage.abc import AbstractStorageClient
 from ploomber.io import pretty_print
 
 
@@ -80,7 +81,7 @@ def fetch_remote_metadata_in_parallel(dag):
                              or isinstance(dag[t].product, MetaProduct))
 
     if files:
-        with ThreadPoolExecutor(max_workers=64) as executor:
+        with _listing(files), ThreadPoolExecutor(max_workers=64) as executor:
             future2file = {
                 executor.submit(file._remote._fetch_remote_metadata): file
                 for file in files
@@ -96,6 +97,37 @@ def fetch_remote_metadata_in_parallel(dag):
                         f'remote metadata for file {local!r}') from exception
 
 
+@contextlib.contextmanager
+def _listing(files):
+    """
+    Lists the remote folders where the files are stored (once per client and
+    folder) so checking if the remote copies exist does not require one call
+    per file
+    """
+    client2paths = defaultdict(list)
+    clients = {}
+
+    for file in files:
+        client = file.client
+
+        # clients that do not inherit from AbstractStorageClient
+        # check each file
+        if isinstance(client, AbstractStorageClient):
+            clients[id(client)] = client
+            client2paths[id(client)].extend(
+                [file._path_to_metadata, file._path_to_file])
+
+    with contextlib.ExitStack() as stack:
+        for key, client in clients.items():
+            try:
+                stack.enter_context(client._listing(client2paths[key]))
+            except Exception as e:
+                raise RuntimeError('An error occurred when listing '
+                                   f'remote files using {client!r}') from e
+
+        yield
+
+
 @contextlib.contextmanager
 def _path_for_plot(path_to_plot, fmt):
     """Context manager to manage DAG.plot
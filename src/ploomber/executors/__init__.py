@@ -1,5 +1,6 @@
 from ploomber.executors.serial import Serial
 from ploomber.executors.parallel import Parallel
 from ploomber.executors.parallel_dill import ParallelDill
+from ploomber.executors.concurrent import Concurrent
 
-__all__ = ['Serial', 'Parallel', 'ParallelDill']
+__all__ = ['Serial', 'Parallel', 'ParallelDill', 'Concurrent']
@@ -0,0 +1,186 @@
+"""
+Compact task serialization for executors that run tasks in other processes.
+
+Pickling a task pulls its DAG, which in turn pulls every other task (and
+their sources, products and clients), so the payload grows with the size
+of the pipeline. Once a DAG is rendered, a task has all it needs to run:
+the rendered source, params and product, hence, we replace the DAG and
+all other tasks with lightweight stand-ins
+"""
+import io
+import pickle
+
+from ploomber.dag.abstractdag import AbstractDAG
+from ploomber.tasks.abc import Task
+from ploomber.products.metaproduct import MetaProduct
+from ploomber.exceptions import MissingClientError
+
+
+class DAGStub:
+    """
+    Stands in for the DAG in the worker process. It only keeps what tasks
+    need during execution (clients and configuration). It does not hold any
+    tasks, so changing a task's status in the worker does not propagate
+    """
+    def __init__(self, dag):
+        self.name = dag.name
+        self.clients = dag.clients
+        self._params = dag._params
+
+    def values(self):
+        return []
+
+    def _get_upstream(self, task_name):
+        return {}
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.name!r})'
+
+
+class TaskStub:
+    """
+    Stands in for any task other than the one being executed (e.g., an
+    upstream task referenced by one of the products in the params)
+    """
+    def __init__(self, name, class_, dag):
+        self.name = name
+        self.dag = dag
+        self._class = class_
+
+    def __getattr__(self, key):
+        # some tasks patch their products with their own methods (e.g., Link
+        # and Input), bind them to the stub so the references still work
+        if key.startswith('__') or '_class' not in self.__dict__:
+            raise AttributeError(key)
+
+        attr = getattr(self._class, key)
+
+        if callable(attr):
+            return attr.__get__(self)
+
+        raise AttributeError(key)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.name!r})'
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file, task):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._task = task
+
+    def persistent_id(self, obj):
+        if isinstance(obj, AbstractDAG):
+            return ('dag', )
+        elif isinstance(obj, Task) and obj is not self._task:
+            return ('task', obj.name, type(obj))
+
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, dag):
+        super().__init__(file)
+        self._dag = dag
+
+    def persistent_load(self, pid):
+        if pid[0] == 'dag':
+            return self._dag
+        else:
+            return TaskStub(name=pid[1], class_=pid[2], dag=self._dag)
+
+
+class TaskPayload:
+    """
+    A picklable wrapper for a rendered task, the DAG and other tasks are
+    replaced by stubs when pickling, so the payload size does not depend on
+    the number of tasks in the pipeline
+
+    Parameters
+    ----------
+    task : Task
+        A rendered task
+    """
+    def __init__(self, task):
+        self._task = task
+        self._state = None
+
+    @property
+    def task(self):
+        # unpickle lazily, so errors happen when calling the function in
+        # the worker (and are sent back to the main process), instead of
+        # when receiving the arguments, which may hang the pool
+        if self._task is None:
+            file = io.BytesIO(self._state['task'])
+            self._task = _Unpickler(file, self._state['dag']).load()
+            self._state = None
+
+        return self._task
+
+    def __getstate__(self):
+        file = io.BytesIO()
+        _Pickler(file, self._task).dump(self._task)
+        return {'dag': DAGStub(self._task.dag), 'task': file.getvalue()}
+
+    def __setstate__(self, state):
+        self._task = None
+        self._state = state
+
+
+def _client(obj):
+    try:
+        return obj.client
+    except MissingClientError:
+        return None
+
+
+def task_clients(task):
+    """
+    Returns the clients used by a task (task-level and product-level, no
+    duplicates)
+    """
+    if isinstance(task.product, MetaProduct):
+        products = list(task.product)
+    else:
+        products = [task.product]
+
+    clients = []
+
+    for client in [_client(task)] + [_client(prod) for prod in products]:
+        if client is not None and not any(client is c for c in clients):
+            clients.append(client)
+
+    return clients
+
+
+def release_clients(task):
+    """
+    Returns pooled connections (clients with pool_size) so the next task
+    that runs in this process reuses them
+    """
+    for client in task_clients(task):
+        release = getattr(client, 'release', None)
+
+        if release is not None:
+            release()
+
+
+def close_clients(task):
+    """
+    Closes the clients of a task copy (pooled clients are released instead,
+    since the pool is shared with other copies of the same client)
+    """
+    for client in task_clients(task):
+        if getattr(client, 'pool_size', None) is None:
+            client.close()
+
+
+def build(payload, **kwargs):
+    """Builds the task in a TaskPayload, executors call this in the worker
+    """
+    task = payload.task
+
+    try:
+        return task._build(**kwargs)
+    finally:
+        release_clients(task)
@@ -0,0 +1,214 @@
+"""
+A process pool that can be reused across tasks and DAG.build() calls
+"""
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import resource
+except ModuleNotFoundError:
+    # not available on windows
+    resource = None
+
+from ploomber.io import pretty_print
+
+
+def _preload(modules):
+    """Runs when a worker starts, imports the modules in the list
+    """
+    for name in modules:
+        importlib.import_module(name)
+
+
+def _peak_memory():
+    """Peak resident set size of the current process (in MB)
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
+
+
+def _call_and_measure(fn, kwargs):
+    return fn(**kwargs), os.getpid(), _peak_memory()
+
+
+class WorkerPool:
+    """
+    Wraps a ProcessPoolExecutor so it can be used across several
+    DAG.build() calls. Workers can import modules when they start (to avoid
+    importing them on each task) and the pool can be replaced by a new one
+    once any of its workers has run a certain number of tasks or exceeded a
+    memory limit. The old pool is drained before starting the new one, so
+    there are never more than ``processes`` workers alive
+
+    Parameters
+    ----------
+    processes : int
+        Number of worker processes
+
+    mp_context : multiprocessing context, default=None
+        Context used to start the workers
+
+    preload : list of str, default=None
+        Modules to import when each worker starts
+
+    max_tasks_per_worker : int, default=None
+        The pool is replaced once any of its workers has run this number of
+        tasks. If None, the pool is never replaced due to the number of
+        tasks
+
+    max_memory_per_worker : int or float, default=None
+        The pool is replaced when the peak memory usage (resident set size,
+        in MB) of any of its workers exceeds this value. Ignored on Windows.
+        If None, the pool is never replaced due to memory usage
+    """
+    def __init__(self,
+                 processes,
+                 mp_context=None,
+                 preload=None,
+                 max_tasks_per_worker=None,
+                 max_memory_per_worker=None):
+        self.processes = processes
+        self.mp_context = mp_context
+        self.preload = list(preload or [])
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_memory_per_worker = max_memory_per_worker
+
+        missing = [
+            name for name in self.preload
+            if importlib.util.find_spec(name) is None
+        ]
+
+        if missing:
+            raise ValueError('Error initializing worker pool: the '
+                             'following modules in "preload" cannot be '
+                             f'imported: {pretty_print.iterable(missing)}')
+
+        self._logger = logging.getLogger(__name__)
+        self._executor = None
+        # the callbacks that update these run in a different thread
+        self._lock = threading.Lock()
+        self._tasks_per_worker = Counter()
+        self._in_flight = 0
+        self._recycle = False
+
+    @property
+    def recycles(self):
+        """True if the pool may be replaced
+        """
+        return (self.max_tasks_per_worker is not None
+                or self.max_memory_per_worker is not None)
+
+    def available(self):
+        """
+        Returns True if a task can be submitted without blocking. If the
+        pool may be replaced, there must be a free worker, and if it has to
+        be replaced, all the submitted tasks must have finished
+        """
+        if not self.recycles:
+            return True
+
+        with self._lock:
+            if self._should_recycle():
+                return self._in_flight == 0
+
+            return self._in_flight < self.processes
+
+    def submit(self, fn, **kwargs):
+        """
+        Submits fn(**kwargs) to the pool, returns a Future with the
+        output. If the pool has to be replaced, this blocks until the tasks
+        submitted to the current one finish
+        """
+        with self._lock:
+            start = self._executor is None or self._should_recycle()
+
+        if start:
+            self._start()
+
+        with self._lock:
+            self._in_flight += 1
+
+        inner = self._executor.submit(_call_and_measure, fn, kwargs)
+
+        outer = Future()
+        inner.add_done_callback(lambda inner: self._forward(inner, outer))
+        return outer
+
+    def close(self):
+        """Shuts down the pool, waits for any running tasks to finish
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _should_recycle(self):
+        # must be called with the lock held
+        if self._recycle:
+            return True
+
+        if self.max_tasks_per_worker is None or not self._tasks_per_worker:
+            return False
+
+        return (max(self._tasks_per_worker.values()) >=
+                self.max_tasks_per_worker)
+
+    def _start(self):
+        if self._executor is not None:
+            self._logger.debug('Replacing worker pool...')
+            # wait for the running and pending tasks, so the old workers
+            # exit before starting new ones
+            self._executor.shutdown(wait=True)
+
+        self._executor = ProcessPoolExecutor(max_workers=self.processes,
+                                             mp_context=self.mp_context,
+                                             initializer=_preload,
+                                             initargs=(self.preload, ))
+
+        with self._lock:
+            self._tasks_per_worker = Counter()
+            self._recycle = False
+
+    def _forward(self, inner, outer):
+        """Passes the result (or exception) from the worker to the caller
+        """
+        try:
+            output, pid, memory = inner.result()
+        except BrokenProcessPool as e:
+            with self._lock:
+                self._in_flight -= 1
+                # we can no longer use this pool, start a new one next time
+                self._recycle = True
+
+            outer.set_exception(e)
+        except BaseException as e:
+            with self._lock:
+                self._in_flight -= 1
+
+            outer.set_exception(e)
+        else:
+            exceeded = (self.max_memory_per_worker is not None
+                        and memory is not None
+                        and memory > self.max_memory_per_worker)
+
+            if exceeded:
+                self._logger.debug(
+                    'Worker exceeded the memory limit (%.1f MB)', memory)
+
+            with self._lock:
+                self._in_flight -= 1
+                self._tasks_per_worker[pid] += 1
+                self._recycle = self._recycle or exceeded
+
+            outer.set_result(output)
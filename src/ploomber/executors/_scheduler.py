@@ -0,0 +1,274 @@
+"""
+Scheduling utilities for executors that run several tasks at the same time
+"""
+import heapq
+from itertools import count
+
+import networkx as nx
+
+from ploomber.constants import TaskStatus
+from ploomber.executors._payload import task_clients
+
+# tasks in any of these status can be submitted for execution
+_RUNNABLE = {TaskStatus.WaitingExecution, TaskStatus.WaitingDownload}
+
+# tasks in any of these status do not have to run
+_FINISHED = {TaskStatus.Executed, TaskStatus.Skipped}
+
+
+class ReadyQueue:
+    """
+    Keeps track of the tasks that are ready for execution. Each task has a
+    counter with the number of upstream dependencies that haven't finished
+    yet, once it reaches zero, the task is added to the queue. Executors
+    should call ``done(task)`` once a task finishes (successfully or not) to
+    update the counters, this way, finding the next task to run does not
+    require iterating over the whole DAG
+
+    Parameters
+    ----------
+    dag : DAG
+        The DAG to schedule. Tasks with status Executed or Skipped are
+        considered finished
+
+    priority : str, default=None
+        How to sort ready tasks. If None, tasks are returned in the order
+        they became ready (in topological order for the initial ones). If
+        'critical_path', tasks with the longest downstream path are returned
+        first (see ``critical_path_ranks``)
+
+    Notes
+    -----
+    This object does not update the tasks' status, it relies on the
+    ``Task.exec_status`` setter to propagate changes downstream, hence,
+    ``done(task)`` must be called after the status of ``task`` is updated
+    """
+    priorities = ['critical_path']
+
+    def __init__(self, dag, priority=None):
+        self._G = dag._G
+        self._ready = []
+        self._finished = set()
+        self._counter = count()
+
+        if priority == 'critical_path':
+            self._ranks = critical_path_ranks(dag)
+        elif priority is None:
+            self._ranks = None
+        else:
+            raise ValueError(f'Invalid priority: {priority!r}. Valid '
+                             f'values are: {self.priorities!r} or None')
+
+        for name in dag._iter():
+            if dag[name].exec_status in _FINISHED:
+                self._finished.add(name)
+
+        self._pending = {
+            name: sum(1 for up in self._G.predecessors(name)
+                      if up not in self._finished)
+            for name in dag._iter() if name not in self._finished
+        }
+
+        # iterate in topological order so the initial queue preserves the
+        # order of dag.values()
+        roots = [
+            name for name in dag
+            if name in self._pending and not self._pending[name]
+        ]
+
+        for name in roots:
+            task = self._enqueue(name)
+
+            if task is not None:
+                self.done(task)
+
+    def __len__(self):
+        return len(self._ready)
+
+    @property
+    def finished(self):
+        """Names of the tasks that are finished
+        """
+        return self._finished
+
+    @property
+    def all_finished(self):
+        return len(self._finished) == len(self._G)
+
+    def pop(self, admit=None):
+        """
+        Returns the next task to execute or None if no tasks are ready. If
+        admit is not None, it returns the next task for which admit(task)
+        is True (the others stay in the queue)
+        """
+        if admit is None:
+            return heapq.heappop(self._ready)[-1] if self._ready else None
+
+        skipped = []
+        task = None
+
+        while self._ready:
+            item = heapq.heappop(self._ready)
+
+            if admit(item[-1]):
+                task = item[-1]
+                break
+
+            skipped.append(item)
+
+        for item in skipped:
+            heapq.heappush(self._ready, item)
+
+        return task
+
+    def done(self, task):
+        """
+        Marks a task as finished, returns a list with the downstream tasks
+        that were also marked as finished because they cannot run (e.g.,
+        they were aborted due to an upstream failure)
+        """
+        retired = []
+        stack = [task.name]
+
+        while stack:
+            name = stack.pop()
+            self._finished.add(name)
+
+            for down in self._G.successors(name):
+                self._pending[down] -= 1
+
+                if not self._pending[down]:
+                    down_task = self._enqueue(down)
+
+                    if down_task is not None:
+                        retired.append(down_task)
+                        stack.append(down)
+
+        return retired
+
+    def _enqueue(self, name):
+        """
+        Adds a task with no pending upstream dependencies to the queue, if
+        it cannot run, it returns it so the caller marks it as finished
+        """
+        task = self._G.nodes[name]['task']
+
+        if task.exec_status in _RUNNABLE:
+            # the counter breaks ties (first in, first out)
+            rank = () if self._ranks is None else self._ranks[name]
+            heapq.heappush(self._ready, (rank, next(self._counter), task))
+        else:
+            return task
+
+
+class Capacity:
+    """
+    Keeps track of the capacity used by running tasks. A task can run only
+    if all the resources it uses have capacity left. Resources are clients
+    with max_concurrency (each running task that uses the client takes one
+    unit) and the ones declared in ``task.resources`` that appear in
+    ``resources`` (resources not listed there are unlimited). Executors
+    should call ``acquire(task)`` when submitting a task and
+    ``release(task)`` once it finishes
+
+    Parameters
+    ----------
+    resources : dict, default=None
+        Maps resource names to the available amount (e.g.,
+        ``{'db': 4, 'memory_gb': 32}``)
+    """
+    def __init__(self, resources=None):
+        self._used = {}
+        self._limits = {('resource', key): amount
+                        for key, amount in (resources or {}).items()}
+        self._demands = {}
+
+    def check(self, tasks):
+        """
+        Raises a ValueError if any of the tasks uses more than the available
+        amount of a resource, since it would never run
+        """
+        for task in tasks:
+            for key, amount in self._demand(task).items():
+                if amount > self._limits[key]:
+                    raise ValueError(
+                        f'Task {task.name!r} requires {amount} of resource '
+                        f'{key[1]!r} but the executor only has '
+                        f'{self._limits[key]}')
+
+    def fits(self, task):
+        return all(
+            self._used.get(key, 0) + amount <= self._limits[key]
+            for key, amount in self._demand(task).items())
+
+    def acquire(self, task):
+        for key, amount in self._demand(task).items():
+            self._used[key] = self._used.get(key, 0) + amount
+
+    def release(self, task):
+        for key, amount in self._demand(task).items():
+            self._used[key] -= amount
+
+    def _demand(self, task):
+        if task.name not in self._demands:
+            demand = {}
+
+            for client in task_clients(task):
+                limit = getattr(client, 'max_concurrency', None)
+
+                if limit is not None:
+                    key = ('client', id(client))
+                    demand[key] = 1
+                    self._limits[key] = limit
+
+            for name, amount in getattr(task, 'resources', {}).items():
+                key = ('resource', name)
+
+                if key in self._limits:
+                    demand[key] = amount
+
+            self._demands[task.name] = demand
+
+        return self._demands[task.name]
+
+
+def critical_path_ranks(dag):
+    """
+    Computes a sorting key for each task in the DAG so tasks in the critical
+    path go first. A task's cost is the elapsed time the last time it was
+    built (stored in the product's metadata), tasks with no stored elapsed
+    time get the average of the known ones (or 1 if there are none). The
+    primary key is the cost of the longest path from the task to any
+    downstream sink, ties are broken by the number of tasks that
+    (directly or indirectly) depend on the task
+
+    Returns
+    -------
+    dict
+        Maps task names to sorting keys (smaller means higher priority)
+    """
+    G = dag._G
+
+    elapsed = {}
+
+    for name in G:
+        # skipped tasks don't run, their cost does not matter
+        task = G.nodes[name]['task']
+
+        if task.exec_status not in _FINISHED:
+            elapsed[name] = task.product.metadata.elapsed
+
+    known = [e for e in elapsed.values() if e is not None]
+    default = sum(known) / len(known) if known else 1
+
+    path = {}
+
+    for name in reversed(list(nx.topological_sort(G))):
+        cost = elapsed.get(name, 0)
+        cost = default if cost is None else cost
+        path[name] = cost + max((path[down] for down in G.successors(name)),
+                                default=0)
+
+    descendants = {name: len(nx.descendants(G, name)) for name in G}
+
+    return {name: (-path[name], -descendants[name]) for name in G}
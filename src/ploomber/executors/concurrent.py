@@ -0,0 +1,158 @@
+"""
+Executor that runs I/O-bound tasks in threads and the rest in processes
+"""
+import pickle
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from ploomber.executors.parallel import Parallel, TaskBuildWrapper
+from ploomber.executors._payload import close_clients
+
+
+def _build_in_thread(data, kwargs):
+    # the task is a copy (just like in a worker process), so running
+    # it does not modify the objects in the main thread
+    wrapper = pickle.loads(data)
+
+    try:
+        return wrapper(**kwargs)
+    finally:
+        # some drivers (e.g., sqlite3) only allow closing connections in
+        # the thread that opened them
+        if wrapper.payload._task is not None:
+            try:
+                close_clients(wrapper.task)
+            except Exception:
+                logging.getLogger(__name__).exception(
+                    'Error closing clients for task %s', wrapper.task.name)
+
+
+class Concurrent(Parallel):
+    """Runs I/O-bound tasks in a thread pool and the rest in a process pool
+
+    Tasks that spend most of their time waiting on a database or the network
+    (``SQLScript``, ``SQLDump``, ``SQLTransfer``, ``SQLUpload``,
+    ``PostgresCopyFrom``, ``ShellScript``, ``DownloadFromURL`` and
+    ``UploadToS3``) run in threads, so many of them can run at the same
+    time without starting a process for each one. Other tasks (e.g.,
+    ``PythonCallable`` and ``NotebookRunner``) run in worker processes, just
+    like in ``Parallel``
+
+    A task class declares which pool it prefers with the ``IO_BOUND`` class
+    attribute, it can also be set on a task instance
+    (``task.IO_BOUND = True``) to run it in the thread pool
+
+    Parameters
+    ----------
+    threads : int, default=32
+        The number of threads to run I/O-bound tasks
+
+    processes : int, default=None
+        The number of processes to run the rest of the tasks. If None, uses
+        ``os.cpu_count``. Processes are started only if there are tasks to
+        run in them
+
+    print_progress, start_method, priority, reuse_workers, preload, \
+max_tasks_per_worker, max_memory_per_worker, resources
+        Same as in ``Parallel``, ``reuse_workers`` also applies to the
+        thread pool
+
+    Examples
+    --------
+    Spec API:
+
+    .. code-block:: yaml
+        :class: text-editor
+        :name: pipeline-yaml
+
+        executor:
+          dotted_path: ploomber.executors.Concurrent
+          threads: 100
+
+    Python API:
+
+    >>> from ploomber import DAG
+    >>> from ploomber.executors import Concurrent
+    >>> dag = DAG(executor=Concurrent(threads=100, processes=4))
+
+    Notes
+    -----
+    Tasks running in threads share the process with the executor: clients
+    are copied for each task, clients with ``pool_size`` share their pool
+    (and connections) across threads, hence, the connections must be
+    usable from several threads (e.g., ``check_same_thread=False`` for
+    ``sqlite3``). Use ``max_concurrency`` in the clients or ``resources``
+    to limit how many tasks hit the same database at once
+
+    .. versionadded:: 0.21.8
+
+    See Also
+    --------
+    ploomber.executors.Parallel :
+        Parallel executor
+    """
+    def __init__(self,
+                 threads=32,
+                 processes=None,
+                 print_progress=False,
+                 start_method=None,
+                 priority=None,
+                 reuse_workers=False,
+                 preload=None,
+                 max_tasks_per_worker=None,
+                 max_memory_per_worker=None,
+                 resources=None):
+        if not isinstance(threads, int) or threads < 1:
+            raise ValueError('threads must be a positive integer, '
+                             f'got: {threads!r}')
+
+        self.threads = threads
+        self._thread_pool = None
+
+        super().__init__(processes=processes,
+                         print_progress=print_progress,
+                         start_method=start_method,
+                         priority=priority,
+                         reuse_workers=reuse_workers,
+                         preload=preload,
+                         max_tasks_per_worker=max_tasks_per_worker,
+                         max_memory_per_worker=max_memory_per_worker,
+                         resources=resources)
+
+    def _get_thread_pool(self):
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.threads, thread_name_prefix='ploomber-task')
+
+        return self._thread_pool
+
+    def _submit(self, task, task_kwargs):
+        if not task.IO_BOUND:
+            return super()._submit(task, task_kwargs)
+
+        # serialize here, other threads may be running other tasks
+        data = pickle.dumps(TaskBuildWrapper(task),
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        return self._get_thread_pool().submit(_build_in_thread, data,
+                                              task_kwargs)
+
+    def close(self):
+        """
+        Shuts down the worker processes and threads. Only needed when
+        ``reuse_workers=True``, otherwise, they are shut down at the end of
+        each build
+        """
+        super().close()
+
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=True)
+            self._thread_pool = None
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        del state['_thread_pool']
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._thread_pool = None
@@ -7,13 +7,19 @@ So think about which parts can go away and which ones should not
 """
 import os
 import logging
-from concurrent.futures import ProcessPoolExecutor
+from queue import SimpleQueue
 from concurrent.futures.process import BrokenProcessPool
 from ploomber.constants import TaskStatus
 from ploomber.executors.abc import Executor
 from ploomber.exceptions import DAGBuildError
 from ploomber.messagecollector import (BuildExceptionsCollector, Message)
 from ploomber.executors import _format
+from ploomber.executors._scheduler import ReadyQueue, Capacity
+from ploomber.executors._pool import WorkerPool
+from ploomber.executors import _payload
+from ploomber.executors._payload import TaskPayload
+from ploomber.tasks.abc import _validate_resources
+from ploomber.tasks._deferred import DeferredSteps
 from multiprocessing import get_context, get_start_method
 from ploomber.io import pretty_print
 
@@ -33,17 +39,24 @@ class TaskBuildWrapper:
     Wraps task._build. Traceback is lost when using ProcessPoolExecutor
     (future.exception().__traceback__ returns None), so we have to catch it
     here and return it so at the end of the DAG execution, a message with the
-    traceback can be printed
+    traceback can be printed. The task is wrapped in a TaskPayload so only
+    the task (and not the rest of the DAG) is sent to the worker
     """
     def __init__(self, task):
-        self.task = task
+        self.payload = TaskPayload(task)
+
+    @property
+    def task(self):
+        return self.payload.task
 
     def __call__(self, *args, **kwargs):
         try:
-            output = self.task._build(**kwargs)
+            output = _payload.build(self.payload, **kwargs)
             return output
         except Exception as e:
-            return Message(task=self.task, message=_format.exception(e), obj=e)
+            # the task is not sent back, get_future_result sets the one
+            # in the main process
+            return Message(task=None, message=_format.exception(e), obj=e)
 
 
 def _log(msg, logger, print_progress):
@@ -69,6 +82,42 @@ class Parallel(Executor):
         can be 'fork', 'spawn' or 'forkserver'. If None or empty then the
         default start_method is used.
 
+    priority : str, default=None
+        Which task to submit first when several are ready for execution. If
+        None, tasks are submitted in the order they become ready. If
+        'critical_path', tasks with the longest chain of downstream
+        dependencies go first, each task is weighted by the time it took to
+        run the last time (stored in the product's metadata), ties are
+        broken by the number of downstream dependencies. This can reduce
+        the total build time in pipelines with many tasks
+
+    reuse_workers : bool, default=False
+        If True, worker processes are kept alive after the build finishes and
+        reused in subsequent ``dag.build()`` calls (call ``.close()`` to shut
+        them down). Otherwise, workers are shut down at the end of each build
+
+    preload : list of str, default=None
+        Modules to import when each worker process starts (e.g.,
+        ``['pandas', 'sklearn']``), so tasks do not have to import them
+
+    max_tasks_per_worker : int, default=None
+        Replace the worker processes once any of them has run this number
+        of tasks. Running tasks finish before replacing the workers, so
+        there are never more than ``processes`` workers. If None, workers
+        are not replaced
+
+    max_memory_per_worker : int or float, default=None
+        Replace the worker processes when any of them reaches this peak memory
+        usage (in MB). Ignored on Windows. If None, workers are not replaced
+
+    resources : dict, default=None
+        Available amount of each resource (e.g., ``{'db': 4, 'memory_gb':
+        32}``). Tasks declare the resources they use in ``task.resources``
+        (``resources`` key in ``pipeline.yaml``) and are submitted only if
+        the resources they use have capacity left, resources that do not
+        appear here are unlimited. If None, tasks are only limited by
+        ``processes`` (and their clients' ``max_concurrency``)
+
     Examples
     --------
     Spec API:
@@ -80,12 +129,20 @@ class Parallel(Executor):
         # add at the top of your pipeline.yaml
         executor: parallel
 
+        # or, to customize it:
+        # executor:
+        #   dotted_path: ploomber.executors.Parallel
+        #   preload: [pandas, sklearn]
+        #   resources: {db: 4, memory_gb: 32}
+
         tasks:
           - source: script.py
             nb_product_key: [nb_ipynb, nb_html]
             product:
                 nb_ipynb: nb.ipynb
                 nb_html: report.html
+            # only if executor has resources
+            # resources: {db: 1, memory_gb: 16}
 
 
     Python API:
@@ -94,6 +151,14 @@ class Parallel(Executor):
     >>> from ploomber.executors import Parallel
     >>> dag = DAG(executor='parallel') # use with default values
     >>> dag = DAG(executor=Parallel(processes=2)) # customize
+    >>> # submit tasks in the critical path first
+    >>> dag = DAG(executor=Parallel(priority='critical_path'))
+    >>> # import pandas once per worker and keep workers between builds
+    >>> executor = Parallel(preload=['pandas'], reuse_workers=True)
+    >>> dag = DAG(executor=executor)
+    >>> executor.close()
+    >>> # at most 4 tasks with resources={'db': 1} run at the same time
+    >>> dag = DAG(executor=Parallel(resources={'db': 4}))
 
 
     DAG can exit gracefully on function tasks (PythonCallable):
@@ -133,6 +198,10 @@ class Parallel(Executor):
     .. versionadded:: 0.20
         Added `start_method` argument
 
+    .. versionadded:: 0.21.8
+        Added `priority`, `reuse_workers`, `preload`, `max_tasks_per_worker`,
+        `max_memory_per_worker` and `resources` arguments
+
     See Also
     --------
     ploomber.executors.Serial :
@@ -147,14 +216,20 @@ class Parallel(Executor):
     def __init__(self,
                  processes=None,
                  print_progress=False,
-                 start_method=None):
+                 start_method=None,
+                 priority=None,
+                 reuse_workers=False,
+                 preload=None,
+                 max_tasks_per_worker=None,
+                 max_memory_per_worker=None,
+                 resources=None):
         self.processes = processes or os.cpu_count()
         self.print_progress = print_progress
 
         self._logger = logging.getLogger(__name__)
-        self._i = 0
         start_method = start_method or get_start_method()
         self._bar = None
+        self._pool = None
         if start_method in self.multiprocessing_start_methods:
             self.start_method = start_method
         else:
@@ -163,31 +238,75 @@ class Parallel(Executor):
                 f'Valid values for start_method are: '
                 f'{pretty_print.iterable(self.multiprocessing_start_methods)}')
 
+        if priority is None or priority in ReadyQueue.priorities:
+            self.priority = priority
+        else:
+            raise ValueError(
+                'Invalid priority. '
+                f'Valid values for priority are: '
+                f'{pretty_print.iterable(ReadyQueue.priorities)} or None')
+
+        self.reuse_workers = reuse_workers
+        self.preload = preload
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_memory_per_worker = max_memory_per_worker
+        self.resources = _validate_resources(resources, name='Parallel')
+        # the pool does not start any processes until we submit tasks,
+        # initialize it here to validate the arguments
+        self._pool = self._get_pool()
+
+    def _get_pool(self):
+        # the pool is discarded when pickling the executor
+        if self._pool is None:
+            self._pool = WorkerPool(
+                processes=self.processes,
+                mp_context=get_context(self.start_method),
+                preload=self.preload,
+                max_tasks_per_worker=self.max_tasks_per_worker,
+                max_memory_per_worker=self.max_memory_per_worker)
+
+        return self._pool
+
+    def _submit(self, task, task_kwargs):
+        """Submits a task for execution, returns a Future
+        """
+        return self._get_pool().submit(TaskBuildWrapper(task), **task_kwargs)
+
+    def close(self):
+        """
+        Shuts down the worker processes. Only needed when
+        ``reuse_workers=True``, otherwise, workers are shut down at the end
+        of each build
+        """
+        if self._pool is not None:
+            self._pool.close()
+
     def __call__(self, dag, show_progress):
         super().__call__(dag)
 
         # TODO: Have to test this with other Tasks, especially the ones that
         # use clients - have to make sure they are serialized correctly
-        done = []
-        started = []
-        set_all = set(dag)
         future_mapping = {}
-
-        # there might be up-to-date tasks, add them to done
+        # limits the number of running tasks that use the same client
+        # (clients with max_concurrency) or resource
+        capacity = Capacity(self.resources)
+        # fail before running anything if a task can never be submitted
+        capacity.check(dag[name] for name in dag._iter())
+        # the callback runs in a different thread, it uses this queue to
+        # notify the main thread when a task finishes
+        completed = SimpleQueue()
+        # steps that tasks run after they finish (e.g., converting notebooks)
+        deferred = DeferredSteps()
+
+        # there might be up-to-date tasks, the queue marks them as finished
         # FIXME: this only happens when the dag is already build and then
         # then try to build again (in the same session), if the session
         # is restarted even up-to-date tasks will be WaitingExecution again
         # this is a bit confusing, so maybe change WaitingExecution
         # to WaitingBuild?
-        n_scheduled = 0
-
-        for name in dag:
-            if dag[name].exec_status in {
-                    TaskStatus.Executed, TaskStatus.Skipped
-            }:
-                done.append(dag[name])
-            else:
-                n_scheduled += 1
+        ready = ReadyQueue(dag, priority=self.priority)
+        n_total = len(dag)
+        n_scheduled = n_total - len(ready.finished)
 
         if show_progress:
             self._bar = tqdm(total=n_scheduled)
@@ -207,9 +326,8 @@ class Parallel(Executor):
             try:
                 result = future.result()
             except BrokenProcessPool:
-                # ignore the error here but flag the task,
-                # so next_task is able to stop the iteration,
-                # when we call result after breaking the loop,
+                # ignore the error here but flag the task, so the main loop
+                # stops, when we call result after breaking the loop,
                 # this will show up
                 task.exec_status = TaskStatus.BrokenProcessPool
                 if self._bar:
@@ -221,86 +339,96 @@ class Parallel(Executor):
                         self._bar.colour = 'red'
                 # successfully run task._build
                 else:
-                    # ignore report here, we just the metadata to update it
-                    _, meta = result
+                    report, meta = result
+                    status = task.exec_status
                     task.product.metadata.update_locally(meta)
                     task.exec_status = TaskStatus.Executed
+                    deferred.submit(task, status, report)
 
-            done.append(task)
+            completed.put(task)
 
-        def next_task():
-            """
-            Return the next Task to execute, returns None if no Tasks are
-            available for execution (cause their dependencies are not done yet)
-            and raises a StopIteration exception if there are no more tasks to
-            run, which means the DAG is done
-            """
-            for task in dag.values():
-                if task.exec_status in {TaskStatus.Aborted}:
-                    if self._bar:
-                        self._bar.update()
-                    done.append(task)
-                elif task.exec_status == TaskStatus.BrokenProcessPool:
-                    raise StopIteration
-
-            # iterate over tasks to find which is ready for execution
-            for task in dag.values():
-                # ignore tasks that are already started, I should probably add
-                # an executing status but that cannot exist in the task itself,
-                # maybe in the manaer?
-                if (task.exec_status in {
-                        TaskStatus.WaitingExecution, TaskStatus.WaitingDownload
-                } and task not in started):
-                    return task
-                # there might be some up-to-date tasks, add them
-
-            set_done = set([t.name for t in done])
-
-            if not self._i % 50000:
+        def log_progress():
+            if self.print_progress:
                 click.clear()
 
-                if set_done:
-                    _log(f'Finished: {pretty_print.iterable(set_done)}',
-                         self._logger.debug,
-                         print_progress=self.print_progress)
+            set_done = ready.finished
 
-                remaining = pretty_print.iterable(set_all - set_done)
-                _log(f'Remaining: {remaining}',
+            # building the lists is expensive on large DAGs, skip them if
+            # they are not going to be displayed
+            if self.print_progress or self._logger.isEnabledFor(
+                    logging.DEBUG):
+                _log(f'Finished: {pretty_print.iterable(set_done)}',
                      self._logger.debug,
                      print_progress=self.print_progress)
-                _log(f'Finished {len(set_done)} out of {len(set_all)} tasks',
-                     self._logger.info,
-                     print_progress=self.print_progress)
 
-            if set_done == set_all:
-                self._logger.debug('All tasks done')
+                remaining = pretty_print.iterable(set(dag._iter()) - set_done)
+                _log(f'Remaining: {remaining}',
+                     self._logger.debug,
+                     print_progress=self.print_progress)
 
-                raise StopIteration
+            _log(f'Finished {len(set_done)} out of {n_total} tasks',
+                 self._logger.info,
+                 print_progress=self.print_progress)
 
-            self._i += 1
+        task_kwargs = {'catch_exceptions': True, 'defer_steps': True}
 
-        task_kwargs = {'catch_exceptions': True}
+        n_running = 0
+        pool = self._get_pool()
 
-        context = get_context(self.start_method)
+        def next_task():
+            # if workers are recycled, the pool only accepts as many tasks
+            # as workers, so replacing it does not exceed the process limit
+            return ready.pop(admit=capacity.fits) if pool.available() else None
 
-        with ProcessPoolExecutor(max_workers=self.processes,
-                                 mp_context=context) as pool:
-            while True:
-                try:
+        try:
+            while not ready.all_finished:
+                task = next_task()
+
+                while task is not None:
+                    capacity.acquire(task)
+                    future = self._submit(task, task_kwargs)
+                    # the callback function uses the future mapping
+                    # so add it before registering the callback, otherwise
+                    # it might break and hang the whole process
+                    future_mapping[future] = task
+                    n_running += 1
+                    future.add_done_callback(callback)
+                    self._logger.info('Added %s to the pool...', task.name)
                     task = next_task()
-                except StopIteration:
+
+                # nothing running and nothing ready to run, the remaining
+                # tasks will never be ready (this should not happen)
+                if not n_running:
+                    self._logger.debug('No more tasks can be executed')
                     break
-                else:
-                    if task is not None:
-                        future = pool.submit(TaskBuildWrapper(task),
-                                             **task_kwargs)
-                        # the callback function uses the future mapping
-                        # so add it before registering the callback, otherwise
-                        # it might break and hang the whole process
-                        future_mapping[future] = task
-                        future.add_done_callback(callback)
-                        started.append(task)
-                        self._logger.info('Added %s to the pool...', task.name)
+
+                # block until a task finishes
+                task = completed.get()
+                n_running -= 1
+                capacity.release(task)
+
+                if task.exec_status == TaskStatus.BrokenProcessPool:
+                    break
+
+                # downstream tasks that won't run (e.g., aborted because
+                # this task failed)
+                for retired in ready.done(task):
+                    self._logger.debug('%s won\'t be executed (%s)',
+                                       retired.name, retired.exec_status)
+
+                    if self._bar:
+                        self._bar.update()
+
+                log_progress()
+
+            if ready.all_finished:
+                self._logger.debug('All tasks done')
+        finally:
+            if not self.reuse_workers:
+                self.close()
+
+            # tasks that finished may still be running their deferred steps
+            deferred_errors = deferred.wait()
 
         results = [
             # results are the output of Task._build: (report, metadata)
@@ -310,6 +438,7 @@ class Parallel(Executor):
         ]
 
         exps = [r for r in results if isinstance(r, Message)]
+        exps.extend(deferred_errors.messages)
 
         if self._bar:
             self._bar.close()
@@ -327,17 +456,27 @@ class Parallel(Executor):
         del state['_logger']
         # the progress bar is not pickable
         del state['_bar']
+        # worker processes cannot be shared
+        del state['_pool']
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
         self._logger = logging.getLogger(__name__)
         self._bar = None
+        self._pool = None
 
 
 def get_future_result(future, future_mapping):
     try:
-        return future.result()
+        result = future.result()
     except BrokenProcessPool as e:
         raise BrokenProcessPool('Broken pool {}'.format(
             future_mapping[future])) from e
+
+    if isinstance(result, Message):
+        result = Message(task=future_mapping[future],
+                         message=result.message,
+                         obj=result.obj)
+
+    return result
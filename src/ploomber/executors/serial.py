@@ -5,6 +5,11 @@ import logging
 from tqdm.auto import tqdm
 from ploomber.executors.abc import Executor
 from ploomber.executors import _format
+from ploomber.executors import _payload
+from ploomber.executors._pool import WorkerPool
+from ploomber.executors._payload import TaskPayload
+from ploomber.tasks._deferred import DeferredSteps
+from ploomber.io import pretty_print
 from ploomber.exceptions import DAGBuildError, DAGBuildEarlyStop
 from ploomber.messagecollector import (BuildExceptionsCollector,
                                        BuildWarningsCollector)
@@ -39,6 +44,26 @@ class Serial(Executor):
         and there is an error building the DAG, capture warnings are still
         shown before raising the collected exceptions.
 
+    reuse_workers : bool, default=False
+        Only used when ``build_in_subprocess=True``. If True, tasks are
+        executed in a long-lived subprocess (instead of starting a new one for
+        each task), which is kept alive across ``dag.build()`` calls (call
+        ``.close()`` to shut it down). Note that memory is no longer cleared
+        up after each task, use ``max_tasks_per_worker`` and
+        ``max_memory_per_worker`` to replace the subprocess periodically
+
+    preload : list of str, default=None
+        Modules to import when the subprocess starts (e.g.,
+        ``['pandas', 'sklearn']``). Requires ``reuse_workers=True``
+
+    max_tasks_per_worker : int, default=None
+        Replace the subprocess after running this number of tasks. Requires
+        ``reuse_workers=True``
+
+    max_memory_per_worker : int or float, default=None
+        Replace the subprocess when it reaches this peak memory usage (in MB).
+        Ignored on Windows. Requires ``reuse_workers=True``
+
     Examples
     --------
     Spec API:
@@ -64,6 +89,10 @@ class Serial(Executor):
     >>> from ploomber.executors import Serial
     >>> dag = DAG(executor='parallel') # use with default values
     >>> dag = DAG(executor=Serial(build_in_subprocess=False)) # customize
+    >>> # run all tasks in the same subprocess, importing pandas once
+    >>> executor = Serial(reuse_workers=True, preload=['pandas'])
+    >>> dag = DAG(executor=executor)
+    >>> executor.close()
 
 
     DAG can exit gracefully on function tasks (PythonCallable):
@@ -104,17 +133,54 @@ class Serial(Executor):
     def __init__(self,
                  build_in_subprocess=True,
                  catch_exceptions=True,
-                 catch_warnings=True):
+                 catch_warnings=True,
+                 reuse_workers=False,
+                 preload=None,
+                 max_tasks_per_worker=None,
+                 max_memory_per_worker=None):
         self._logger = logging.getLogger(__name__)
         self._build_in_subprocess = build_in_subprocess
         self._catch_exceptions = catch_exceptions
         self._catch_warnings = catch_warnings
+        self._reuse_workers = reuse_workers
+        self._pool_kwargs = dict(
+            preload=preload,
+            max_tasks_per_worker=max_tasks_per_worker,
+            max_memory_per_worker=max_memory_per_worker)
+        self._pool = None
+
+        if not (build_in_subprocess and reuse_workers):
+            passed = [k for k, v in self._pool_kwargs.items() if v is not None]
+
+            if passed:
+                raise ValueError(
+                    f'{pretty_print.iterable(passed)} can only be used when '
+                    'build_in_subprocess=True and reuse_workers=True')
+        else:
+            # validate arguments, this does not start the subprocess
+            self._get_pool()
 
     def __repr__(self):
         return ('Serial(build_in_subprocess={}, '
-                'catch_exceptions={}, catch_warnings={})'.format(
-                    self._build_in_subprocess, self._catch_exceptions,
-                    self._catch_warnings))
+                'catch_exceptions={}, catch_warnings={}, '
+                'reuse_workers={})'.format(self._build_in_subprocess,
+                                           self._catch_exceptions,
+                                           self._catch_warnings,
+                                           self._reuse_workers))
+
+    def _get_pool(self):
+        # the pool is discarded when pickling the executor
+        if self._pool is None:
+            self._pool = WorkerPool(processes=1, **self._pool_kwargs)
+
+        return self._pool
+
+    def close(self):
+        """
+        Shuts down the subprocess. Only needed when ``reuse_workers=True``
+        """
+        if self._pool is not None:
+            self._pool.close()
 
     def __call__(self, dag, show_progress):
         super().__call__(dag)
@@ -123,7 +189,12 @@ class Serial(Executor):
         warnings_all = BuildWarningsCollector()
         task_reports = []
 
-        task_kwargs = {'catch_exceptions': self._catch_exceptions}
+        task_kwargs = {
+            'catch_exceptions': self._catch_exceptions,
+            'defer_steps': True,
+        }
+        # steps that tasks run after they finish (e.g., converting notebooks)
+        deferred = DeferredSteps()
 
         scheduled = [
             dag[t] for t in dag if dag[t].exec_status != TaskStatus.Skipped
@@ -132,60 +203,71 @@ class Serial(Executor):
         if show_progress:
             scheduled = tqdm(scheduled, total=len(scheduled))
 
-        for t in scheduled:
-            if t.exec_status == TaskStatus.Aborted:
-                continue
-
-            if show_progress:
-                label = ('Building task'
-                         if t.exec_status == TaskStatus.WaitingExecution else
-                         'Downloading product')
-                scheduled.set_description(f'{label} {t.name!r}')
-
-            if self._build_in_subprocess:
-                fn = LazyFunction(
-                    build_in_subprocess, {
-                        'task': t,
-                        'build_kwargs': task_kwargs,
-                        'reports_all': task_reports
-                    }, t)
-            else:
-                fn = LazyFunction(
-                    build_in_current_process, {
-                        'task': t,
-                        'build_kwargs': task_kwargs,
-                        'reports_all': task_reports
-                    }, t)
-
-            if self._catch_warnings:
-                fn = LazyFunction(fn=catch_warnings,
-                                  kwargs={
-                                      'fn': fn,
-                                      'warnings_all': warnings_all
-                                  },
-                                  task=t)
-            else:
-                # NOTE: this isn't doing anything
-                fn = LazyFunction(fn=pass_exceptions,
-                                  kwargs={'fn': fn},
-                                  task=t)
-
-            if self._catch_exceptions:
-                fn = LazyFunction(fn=catch_exceptions,
-                                  kwargs={
-                                      'fn': fn,
-                                      'exceptions_all': exceptions_all
-                                  },
-                                  task=t)
-
-            fn()
-
-        # end of for loop
+        try:
+            for t in scheduled:
+                if t.exec_status == TaskStatus.Aborted:
+                    continue
+
+                if show_progress:
+                    label = ('Building task' if t.exec_status
+                             == TaskStatus.WaitingExecution else
+                             'Downloading product')
+                    scheduled.set_description(f'{label} {t.name!r}')
+
+                if self._build_in_subprocess:
+                    fn = LazyFunction(
+                        build_in_subprocess, {
+                            'task': t,
+                            'build_kwargs': task_kwargs,
+                            'reports_all': task_reports,
+                            'deferred': deferred,
+                            'pool': (self._get_pool()
+                                     if self._reuse_workers else None),
+                        }, t)
+                else:
+                    fn = LazyFunction(
+                        build_in_current_process, {
+                            'task': t,
+                            'build_kwargs': task_kwargs,
+                            'reports_all': task_reports,
+                            'deferred': deferred,
+                        }, t)
+
+                if self._catch_warnings:
+                    fn = LazyFunction(fn=catch_warnings,
+                                      kwargs={
+                                          'fn': fn,
+                                          'warnings_all': warnings_all
+                                      },
+                                      task=t)
+                else:
+                    # NOTE: this isn't doing anything
+                    fn = LazyFunction(fn=pass_exceptions,
+                                      kwargs={'fn': fn},
+                                      task=t)
+
+                if self._catch_exceptions:
+                    fn = LazyFunction(fn=catch_exceptions,
+                                      kwargs={
+                                          'fn': fn,
+                                          'exceptions_all': exceptions_all
+                                      },
+                                      task=t)
+
+                fn()
+        finally:
+            # tasks that finished may still be running their deferred steps
+            deferred_errors = deferred.wait()
 
         if warnings_all and self._catch_warnings:
             # NOTE: maybe raise one by one to keep the warning type
             warnings.warn(str(warnings_all))
 
+        if deferred_errors and not self._catch_exceptions:
+            raise deferred_errors.messages[0].obj
+
+        exceptions_all.messages.extend(deferred_errors.messages)
+
         if exceptions_all and self._catch_exceptions:
             early_stop = any(
                 [isinstance(m.obj, DAGBuildEarlyStop) for m in exceptions_all])
@@ -203,11 +285,14 @@ class Serial(Executor):
     def __getstate__(self):
         state = self.__dict__.copy()
         del state['_logger']
+        # worker processes cannot be shared
+        del state['_pool']
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
         self._logger = logging.getLogger(__name__)
+        self._pool = None
 
 
 class LazyFunction:
@@ -301,7 +386,7 @@ def pass_exceptions(fn):
     fn()
 
 
-def build_in_current_process(task, build_kwargs, reports_all):
+def build_in_current_process(task, build_kwargs, reports_all, deferred):
     """
     Execute the current task in the current process. Runs if the parameter
     build_in_subprocess is false.
@@ -317,12 +402,21 @@ def build_in_current_process(task, build_kwargs, reports_all):
 
     reports_all: list
         Collects the build report when executing the current DAG.
+
+    deferred: DeferredSteps
+        Runs the deferred steps of the task after it finishes.
     """
+    status = task.exec_status
     report, meta = task._build(**build_kwargs)
     reports_all.append(report)
+    deferred.submit(task, status, report)
 
 
-def build_in_subprocess(task, build_kwargs, reports_all):
+def build_in_subprocess(task,
+                        build_kwargs,
+                        reports_all,
+                        deferred,
+                        pool=None):
     """
     Execute the current task in a subprocess. Runs if the parameter
     build_in_subprocess is true.
@@ -338,8 +432,31 @@ def build_in_subprocess(task, build_kwargs, reports_all):
 
     reports_all: list
         Collects the build report when executing the current DAG.
+
+    deferred: DeferredSteps
+        Runs the deferred steps of the task after it finishes.
+
+    pool: WorkerPool, default=None
+        If not None, the task is executed in the pool's subprocess, otherwise
+        a new subprocess is created
     """
-    if callable(task.source.primitive):
+    status = task.exec_status
+
+    if callable(task.source.primitive) and pool is not None:
+        try:
+            report, meta = pool.submit(_payload.build,
+                                       payload=TaskPayload(task),
+                                       **build_kwargs).result()
+        except Exception:
+            # we have to update status since this is ran in a subprocess
+            task.exec_status = TaskStatus.Errored
+            raise
+        else:
+            task.product.metadata.update_locally(meta)
+            task.exec_status = TaskStatus.Executed
+            reports_all.append(report)
+
+    elif callable(task.source.primitive):
 
         try:
             p = Pool(processes=1)
@@ -353,7 +470,9 @@ def build_in_subprocess(task, build_kwargs, reports_all):
             else:
                 raise
 
-        res = p.apply_async(func=task._build, kwds=build_kwargs)
+        res = p.apply_async(func=_payload.build,
+                            args=(TaskPayload(task), ),
+                            kwds=build_kwargs)
         # calling this make sure we catch the exception, from the docs:
         # Return the result when it arrives. If timeout is not None and
         # the result does not arrive within timeout seconds then
@@ -380,3 +499,5 @@ def build_in_subprocess(task, build_kwargs, reports_all):
         report, meta = task._build(**build_kwargs)
         task.product.metadata.update_locally(meta)
         reports_all.append(report)
+
+    deferred.submit(task, status, report)
@@ -1,4 +1,4 @@
-from ploomber.io.file import CSVIO, ParquetIO
+from ploomber.io.file import CSVIO, ParquetIO, ParquetRowGroupIO
 from ploomber.io.terminalwriter import TerminalWriter
 from ploomber.io.loaders import FileLoaderMixin
 from ploomber.io.serialize import serializer, serializer_pickle
@@ -7,6 +7,7 @@ from ploomber.io.unserialize import unserializer, unserializer_pickle
 __all__ = [
     'CSVIO',
     'ParquetIO',
+    'ParquetRowGroupIO',
     'TerminalWriter',
     'FileLoaderMixin',
     'serializer',
@@ -0,0 +1,96 @@
+"""
+Write chunks in a background thread, so the caller can fetch the next chunk
+(e.g., from a database) while the previous one is written to disk
+"""
+import queue
+import threading
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """
+    Wraps an io handler (e.g., ploomber.io.CSVIO) and calls its write methods
+    in a background thread, in the same order they were called
+
+    Parameters
+    ----------
+    handler
+        The io handler
+
+    queue_size : int
+        Maximum number of chunks waiting to be written, once reached, calls
+        to write() block until the writer catches up. This bounds memory
+        usage to (queue_size + 2) chunks
+
+    Notes
+    -----
+    If writing fails, the exception is raised in the next call to write()
+    or close()
+    """
+    def __init__(self, handler, queue_size):
+        if queue_size < 1:
+            raise ValueError('queue_size must be at least 1, '
+                             f'got: {queue_size!r}')
+
+        self._handler = handler
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._consume,
+                                        name='ploomber-background-writer',
+                                        daemon=True)
+        self._thread.start()
+
+    def write(self, data, headers):
+        self._put((self._handler.write, (data, headers)))
+
+    def write_table(self, table):
+        self._put((self._handler.write_table, (table, )))
+
+    def close(self):
+        """
+        Waits until all chunks are written and closes the handler (if it
+        implements close)
+        """
+        if self._thread.is_alive():
+            self._put(_STOP, check=False)
+            self._thread.join()
+
+        if hasattr(self._handler, 'close'):
+            self._handler.close()
+
+        self._raise_if_failed()
+
+    def _put(self, item, check=True):
+        # do not block forever if the writer stopped consuming
+        while True:
+            if check:
+                self._raise_if_failed()
+
+            try:
+                self._queue.put(item, timeout=0.1)
+            except queue.Full:
+                if not self._thread.is_alive():
+                    return
+            else:
+                return
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise RuntimeError('Error writing chunk in the background '
+                               'thread') from self._error
+
+    def _consume(self):
+        while True:
+            item = self._queue.get()
+
+            if item is _STOP:
+                return
+
+            if self._error is None:
+                method, args = item
+
+                try:
+                    method(*args)
+                except BaseException as e:
+                    self._error = e
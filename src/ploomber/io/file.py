@@ -2,6 +2,7 @@
 Handling file I/O for writing files, optionally saving them in chunks
 """
 import abc
+import copy
 import warnings
 import csv
 from pathlib import Path
@@ -42,15 +43,39 @@ class FileIO(abc.ABC):
 
         # only used when chunked
         self.i = 0
+        self._prefix = ''
 
     def write(self, data, headers):
         if self.chunked:
-            path = self.path / '{i}.{ext}'.format(i=self.i, ext=self.extension)
-            self.write_in_path(str(path), data, headers)
+            self.write_in_path(str(self._chunk_path()), data, headers)
             self.i = self.i + 1
         else:
             self.write_in_path(str(self.path), data, headers)
 
+    def partition(self, name):
+        """
+        Returns a handler that writes chunks in the same directory, prefixing
+        file names with name (e.g., {name}-0.csv), used to write several
+        partitions at the same time
+        """
+        if not self.chunked:
+            raise ValueError(f'{type(self).__name__} must be chunked to '
+                             'write partitions')
+
+        handler = copy.copy(self)
+        handler._prefix = f'{name}-'
+        handler.i = 0
+        return handler
+
+    def _chunk_path(self):
+        return self.path / '{prefix}{i}.{ext}'.format(
+            prefix=self._prefix, i=self.i, ext=self.extension)
+
+    def close(self):
+        """Called once all data has been written
+        """
+        pass
+
     @classmethod
     @abc.abstractmethod
     def write_in_path(cls, path, data, headers):
@@ -62,6 +87,49 @@ class FileIO(abc.ABC):
         pass
 
 
+def _rows_to_table(data, headers, schema):
+    """
+    Converts DB-API rows to a pyarrow.Table. If schema is None, types are
+    inferred from the data, otherwise, the rows are converted directly to
+    the schema's types (without transposing them in Python), which is much
+    faster
+    """
+    if schema is not None:
+        try:
+            array = pa.array(data, type=pa.struct(list(schema)))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # rows are not tuples (e.g., pyodbc.Row) or a value does not
+            # match the schema
+            pass
+        else:
+            return pa.Table.from_batches(
+                [pa.RecordBatch.from_struct_array(array)])
+
+    if not data:
+        table = _empty_table(headers)
+        return table if schema is None else schema.empty_table()
+
+    arrays = [pa.array(col) for col in map(list, zip(*data))]
+    table = pa.Table.from_arrays(arrays, names=headers)
+    return table if schema is None else table.cast(schema)
+
+
+def _empty_table(headers):
+    """
+    Returns a table with no rows, columns have the "null" type since there
+    are no values to infer them from
+    """
+    return pa.table({header: pa.array([], type=pa.null())
+                     for header in headers})
+
+
+def _as_table(data):
+    if isinstance(data, pa.RecordBatch):
+        return pa.Table.from_batches([data])
+
+    return data
+
+
 class ParquetIO(FileIO):
     """parquet handler
 
@@ -93,8 +161,8 @@ class ParquetIO(FileIO):
 
     def write(self, data, headers):
         if self.chunked:
-            path = self.path / '{i}.{ext}'.format(i=self.i, ext=self.extension)
-            schema = self.write_in_path(str(path), data, headers, self.schema)
+            schema = self.write_in_path(str(self._chunk_path()), data,
+                                        headers, self.schema)
             self.i = self.i + 1
 
             if self.i == 0:
@@ -112,10 +180,20 @@ class ParquetIO(FileIO):
         else:
             self.write_in_path(str(self.path), data, headers, schema=None)
 
+    def write_table(self, table):
+        """
+        Writes a pyarrow.Table (or RecordBatch), used when the database
+        driver returns data in Arrow format
+        """
+        if self.chunked:
+            pq.write_table(_as_table(table), str(self._chunk_path()))
+            self.i = self.i + 1
+        else:
+            pq.write_table(_as_table(table), str(self.path))
+
     @classmethod
     def write_in_path(cls, path, data, headers, schema):
-        arrays = [pa.array(col) for col in map(list, zip(*data))]
-        table = pa.Table.from_arrays(arrays, names=headers, schema=schema)
+        table = _rows_to_table(data, headers, schema)
         pq.write_table(table, str(path))
         return table.schema
 
@@ -124,6 +202,50 @@ class ParquetIO(FileIO):
         return 'parquet'
 
 
+class ParquetRowGroupIO(ParquetIO):
+    """
+    parquet handler that writes all chunks to a single file (one row group
+    per chunk) instead of a file per chunk
+
+    Notes
+    -----
+    Types are inferred from the first chunk and the rest of the chunks are
+    converted to them, hence, values must be of the same type across chunks
+    (this is the case unless the database has dynamic typing, like SQLite)
+    and columns should not be empty in the first chunk (they will be
+    detected as "null")
+
+    Only one chunk is kept in memory, and the file is valid once close()
+    is called
+    """
+    @requires(['pyarrow'], 'ParquetRowGroupIO')
+    def __init__(self, path, chunked):
+        # chunks go into the same file, no need to create a directory
+        FileIO.__init__(self, path, chunked=False)
+        self.schema = None
+        self._writer = None
+
+    def write(self, data, headers):
+        self.write_table(_rows_to_table(data, headers, self.schema))
+
+    def write_table(self, table):
+        table = _as_table(table)
+
+        if self._writer is None:
+            self.schema = table.schema
+            self._writer = pq.ParquetWriter(str(self.path), self.schema)
+
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is None:
+            # nothing was written (no rows), the file must exist anyway
+            self.write_table(_empty_table([]))
+
+        self._writer.close()
+        self._writer = None
+
+
 class CSVIO(FileIO):
     """csv file handler
     """
@@ -10,6 +10,7 @@ For debugging:
 >>> cm = PloomberContentsManager()
 """
 import sys
+import time
 import datetime
 import os
 import contextlib
@@ -17,17 +18,72 @@ from pathlib import Path
 from collections.abc import Mapping
 from collections import defaultdict
 
+import networkx as nx
+
 from ploomber.sources.notebooksource import (_cleanup_rendered_nb, inject_cell)
+from ploomber.spec.dagspec import _expand_upstream
 from ploomber.jupyter.dag import JupyterDAGManager
 from ploomber.util import loader, default
 from ploomber.exceptions import DAGSpecInvalidError
 from ploomber.tasks.notebook import NotebookMixin
 
 
+class FileWatcher:
+    """
+    Keeps the (inode, size, modification time) of files to determine if they
+    changed with a single stat() call, instead of reading them
+
+    Parameters
+    ----------
+    racy_window : float, default=2
+        Files modified less than racy_window seconds before being recorded
+        are not recorded, since they may change again without changing
+        their modification time (the timestamp resolution depends on the
+        file system), so changed() returns True and callers compare the
+        contents instead
+    """
+    def __init__(self, racy_window=2):
+        self.racy_window = racy_window
+        self._signatures = {}
+
+    @staticmethod
+    def _signature(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def changed(self, path):
+        """
+        Returns True if the file changed since it was recorded (or if it
+        was never recorded)
+        """
+        signature = self._signature(path)
+        return (signature is None
+                or self._signatures.get(str(path)) != signature)
+
+    def record(self, path):
+        """Records the current state of the file
+        """
+        signature = self._signature(path)
+
+        if (signature is None or
+                time.time() - signature[2] / 1e9 < self.racy_window):
+            self._signatures.pop(str(path), None)
+        else:
+            self._signatures[str(path)] = signature
+
+    def clear(self):
+        self._signatures = {}
+
+
 class DAGLoader:
     """
     Finds and loads the DAG for cell injection, caching it if it
-    hasn't changed
+    hasn't changed. Files are checked with stat() calls, and if the
+    upstream dependencies of a notebook change, only that task is updated
     """
     def __init__(self, root_dir, log):
         self._log = log
@@ -36,6 +92,7 @@ class DAGLoader:
         self._path = None
         self._text = None
         self._path_to_spec = None
+        self._watcher = FileWatcher()
 
         self.__dag = None
         self.__mapping = None
@@ -69,24 +126,106 @@ class DAGLoader:
 
         return self.__mapping
 
+    def reset(self):
+        """
+        Discards the loaded pipeline, the next call to load() reloads it
+        """
+        self._spec = None
+        self._dag = None
+        self._path = None
+        self._text = None
+        self._path_to_spec = None
+        self._watcher.clear()
+
     def _load(self, generator):
         self._log.info('[Ploomber] Loading pipeline')
+        # if loading fails, do not keep the previous pipeline
+        self.reset()
         (self._spec, self._dag, self._path,
          self._path_to_spec) = next(generator)
 
         if self._path_to_spec is not None:
             self._text = Path(self._path_to_spec).read_text()
+            self._watcher.record(self._path_to_spec)
 
             self._path_to_env = default.path_to_env_from_spec(
                 self._path_to_spec)
 
             if self._path_to_env:
                 self._text_env = Path(self._path_to_env).read_text()
+                self._watcher.record(self._path_to_env)
             else:
                 self._text_env = None
         else:
             self._text = None
 
+    def _file_changed(self, path, text):
+        """
+        Returns True if the contents of the file are not text, only reads
+        the file if its stat() changed
+        """
+        if not self._watcher.changed(path):
+            return False
+
+        if Path(path).read_text() != text:
+            return True
+
+        # touched but not modified
+        self._watcher.record(path)
+        return False
+
+    def _upstream_changed(self, task):
+        """
+        Returns the upstream dependencies declared in the task's source if
+        they are different from the ones in the DAG, None otherwise
+        """
+        path = task.source.loc
+
+        if not self._watcher.changed(path):
+            return None
+
+        upstream = _expand_upstream(task.source.extract_upstream(force=True),
+                                    list(self._dag)) or {}
+        self._watcher.record(path)
+
+        return None if set(upstream) == set(task.upstream) else upstream
+
+    def _update_upstream(self, task, upstream):
+        """
+        Replaces the upstream dependencies of a task and renders it again,
+        returns False if it wasn't possible (e.g., a dependency does not
+        exist) so the caller reloads the pipeline
+        """
+        if not set(upstream) <= set(self._dag):
+            return False
+
+        graph = self._dag._G
+        previous = [(name, task.name, graph.get_edge_data(name, task.name))
+                    for name in task.upstream]
+        graph.remove_edges_from([(name, task.name)
+                                 for name, _, _ in previous])
+
+        for name, group_name in upstream.items():
+            task.set_upstream(self._dag[name], group_name=group_name)
+
+        if nx.is_directed_acyclic_graph(graph):
+            # render() only sets "upstream" if the task has dependencies
+            if 'upstream' in task.params:
+                del task.params['upstream']
+
+            try:
+                with chdir(self._path):
+                    task.render(force=True)
+            except Exception:
+                pass
+            else:
+                return True
+
+        # leave the DAG as it was, the caller reloads it anyway
+        graph.remove_edges_from([(name, task.name) for name in upstream])
+        graph.add_edges_from(previous)
+        return False
+
     def load(self, starting_dir, reload, model):
         loaded = False
 
@@ -111,7 +250,7 @@ class DAGLoader:
 
         # determine if it has changed (loaded a new file or contents changed)
         elif (str(path_to_spec) != str(self._path_to_spec)
-              or self._text != Path(path_to_spec).read_text()):
+              or self._file_changed(path_to_spec, self._text)):
             self._log.info('[Ploomber] Spec changed. Reloading pipeline...')
             # if so, reload
             self._load(generator)
@@ -124,15 +263,17 @@ class DAGLoader:
             # if the current notebook is in the pipeline, we must check if
             # the upstream has changed
             if task:
-                upstream_in_dag = set(task.upstream)
-                upstream_in_source = set(
-                    task.source.extract_upstream(force=True) or set())
+                upstream = self._upstream_changed(task)
 
-                if upstream_in_dag != upstream_in_source:
+                if upstream is not None:
                     self._log.info(f'[Ploomber] Upstream for {path!r} '
-                                   'changed. Reloading pipeline...')
-                    self._load(generator)
-                    loaded = True
+                                   'changed. Updating task...')
+
+                    if not self._update_upstream(task, upstream):
+                        self._log.info('[Ploomber] Could not update task. '
+                                       'Reloading pipeline...')
+                        self._load(generator)
+                        loaded = True
 
         # the last possibility is that the env file changed
         if not loaded:
@@ -142,7 +283,7 @@ class DAGLoader:
 
             if path_to_env and (
                 (str(path_to_env) != str(self._path_to_env)
-                 or self._text_env != Path(path_to_env).read_text())):
+                 or self._file_changed(path_to_env, self._text_env))):
                 self._log.info('[Ploomber] Env changed. Reloading pipeline...')
                 # if so, reload
                 self._load(generator)
@@ -341,6 +482,9 @@ def derive_class(base_class):
                             except Exception:
                                 self.render_success = False
                                 self.reset_dag()
+                                # the DAG may be in an invalid state (e.g.,
+                                # a cycle), reload it next time
+                                self._dag_loader.reset()
                                 if log:
                                     msg = (
                                         "[Ploomber] An error ocurred when "
@@ -359,9 +503,12 @@ def derive_class(base_class):
 
                     dag_mapping = self._dag_loader._mapping
 
+                    # the mapping is the same object unless the pipeline
+                    # was reloaded
                     did_keys_change = (
                         self.dag_mapping is None
-                        or set(self.dag_mapping) != set(dag_mapping))
+                        or (self.dag_mapping is not dag_mapping
+                            and set(self.dag_mapping) != set(dag_mapping)))
 
                     if did_keys_change or self.path != path:
                         self.log.info('[Ploomber] Using dag defined '
@@ -0,0 +1,348 @@
+"""
+Content-addressed cache for File products. Tasks with the same (normalized)
+source code, params and upstream products' contents generate the same
+products, so instead of running them, we can copy their products from a
+previous run (possibly from another project, git branch or user)
+"""
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from collections.abc import Mapping
+
+from ploomber.products.file import File
+from ploomber.products.metaproduct import MetaProduct
+from ploomber.products._resources import process_resources
+from ploomber.products._digest import path_digest
+
+
+def _flatten_files(product):
+    """
+    Returns a list with the Files in a product or None if any of them is
+    not a File
+    """
+    products = list(product) if isinstance(product, MetaProduct) else [
+        product
+    ]
+
+    if all(isinstance(prod, File) for prod in products):
+        return products
+
+    return None
+
+
+def _flatten_upstream(upstream, prefix=''):
+    """Returns a list of (name, product) tuples from params['upstream']
+    """
+    out = []
+
+    for name, value in upstream.items():
+        if isinstance(value, Mapping):
+            out.extend(_flatten_upstream(value, prefix=f'{prefix}{name}.'))
+        else:
+            out.append((f'{prefix}{name}', value))
+
+    return out
+
+
+def _size(path):
+    path = Path(path)
+
+    if path.is_file():
+        return path.stat().st_size
+
+    return sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+
+
+def _copy(src, dst, link):
+    """Copies (or hard links) a file or directory
+    """
+    if Path(src).is_dir():
+        shutil.copytree(src,
+                        dst,
+                        copy_function=_link_or_copy if link else shutil.copy2)
+    elif link:
+        _link_or_copy(src, dst)
+    else:
+        shutil.copy2(src, dst)
+
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        # e.g., cache in another device
+        shutil.copy2(src, dst)
+
+
+class ProductCache:
+    """
+    Stores the products generated by tasks in a directory, keyed by a hash
+    of the task's source code (normalized with the DAG's CodeDiffer), params
+    (resources_ are replaced by their hash) and the contents of the upstream
+    products. When a task with the same key runs again, its products are
+    copied from the cache instead of executing it
+
+    Only tasks whose products and upstream products are Files (or
+    MetaProducts with Files) are cached, and all their params must be JSON
+    serializable
+
+    Parameters
+    ----------
+    path : str or pathlib.Path, default='.ploomber/cache'
+        Directory to store the cached products
+
+    client : AbstractStorageClient, default=None
+        If not None, cached products are also uploaded to remote storage,
+        and if a key is not in the local directory, it is downloaded from
+        remote storage (if it exists). The cache directory must be inside
+        the client's project root
+
+    max_size : int or float, default=None
+        Maximum size (in MB) of the local directory, the least recently used
+        entries are deleted when it's exceeded. If None, entries are never
+        deleted
+
+    link : bool, default=False
+        Hard link products from the cache instead of copying them (falls
+        back to copying if the cache is in a different device). Note that
+        if a task modifies a linked file in place, it also modifies the
+        cached copy
+
+    Notes
+    -----
+    ``hits`` and ``misses`` count cache lookups in the current process, the
+    build report includes a "Cache" column with the result for each task
+    """
+    def __init__(self, path=None, client=None, max_size=None, link=False):
+        self.path = Path(path or Path('.ploomber', 'cache')).resolve()
+        self.client = client
+        self.max_size = max_size
+        self.link = link
+        self.hits = 0
+        self.misses = 0
+        self._logger = logging.getLogger(__name__)
+        # (path, mtime, size) -> digest
+        self._digests = {}
+
+    def __repr__(self):
+        return f'{type(self).__name__}({str(self.path)!r})'
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_logger']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._logger = logging.getLogger(__name__)
+
+    def key(self, task):
+        """
+        Computes the cache key for a rendered task, returns None if the task
+        cannot be cached
+        """
+        files = _flatten_files(task.product)
+
+        if files is None:
+            return None
+
+        upstream = task.params.get('upstream')
+        upstream = _flatten_upstream(
+            upstream.to_dict()) if upstream is not None else []
+        upstream_digests = []
+
+        for name, product in sorted(upstream, key=lambda item: item[0]):
+            files_up = _flatten_files(product)
+
+            if files_up is None:
+                return None
+
+            upstream_digests.append(
+                (name, [self._digest(file_) for file_ in files_up]))
+
+        try:
+            params = json.dumps(process_resources(
+                task.params.to_json_serializable(params_only=True)),
+                                sort_keys=True)
+        except TypeError:
+            return None
+
+        extension = task.source.extension
+        differ = task.dag._params.differ
+
+        # products are stored by position, so the key must change if the
+        # task's products change
+        if isinstance(task.product, MetaProduct):
+            products = task.product.products.products
+            layout = (list(products) if isinstance(products, Mapping) else
+                      len(products))
+        else:
+            layout = None
+
+        data = json.dumps([
+            type(task).__name__,
+            extension,
+            differ.normalize(str(task.source), extension),
+            params,
+            upstream_digests,
+            layout,
+        ])
+
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def restore(self, key, product):
+        """
+        Copies the cached products for the key (if any) to their location,
+        returns True if there was a hit
+        """
+        entry = self.path / key
+
+        if not entry.is_dir() and not self._download(entry):
+            self.misses += 1
+            return False
+
+        files = _flatten_files(product)
+
+        for i, file_ in enumerate(files):
+            destination = file_._path_to_file
+            file_.delete()
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            _copy(entry / 'products' / str(i), destination, link=self.link)
+
+        # keep track of the last access to evict least recently used entries
+        (entry / 'entry.json').touch()
+        self.hits += 1
+        return True
+
+    def store(self, key, product):
+        """Stores the products for the key
+        """
+        entry = self.path / key
+
+        if entry.is_dir():
+            return
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        files = _flatten_files(product)
+
+        # copy to a temporary folder and rename it so tasks running in
+        # parallel never see incomplete entries
+        tmp = Path(tempfile.mkdtemp(dir=self.path, prefix='.tmp-'))
+
+        try:
+            (tmp / 'products').mkdir()
+
+            for i, file_ in enumerate(files):
+                _copy(file_._path_to_file, tmp / 'products' / str(i),
+                      link=False)
+
+            (tmp / 'entry.json').write_text(
+                json.dumps({
+                    'size': _size(tmp / 'products'),
+                    'products': [str(file_) for file_ in files],
+                }))
+
+            try:
+                tmp.rename(entry)
+            except OSError:
+                # another process stored the same key
+                return
+        finally:
+            if tmp.exists():
+                shutil.rmtree(tmp)
+
+        self._upload(entry)
+        self._evict(keep=key)
+
+    def _digest(self, file_):
+        path = file_._path_to_file
+
+        if not path.exists():
+            return None
+
+        stat = path.stat()
+        memo = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+        if memo in self._digests:
+            return self._digests[memo]
+
+        digest = path_digest(path)
+        self._digests[memo] = digest
+        return digest
+
+    def _download(self, entry):
+        if self.client is None:
+            return False
+
+        try:
+            if not self.client._remote_exists(entry):
+                return False
+
+            self.client.download(entry)
+        except Exception:
+            self._logger.exception('Error downloading cache entry %s', entry)
+
+            if entry.exists():
+                shutil.rmtree(entry)
+
+            return False
+
+        return entry.is_dir()
+
+    def _upload(self, entry):
+        if self.client is None:
+            return
+
+        try:
+            self.client.upload(entry)
+        except Exception:
+            self._logger.exception('Error uploading cache entry %s', entry)
+
+    def _evict(self, keep):
+        if self.max_size is None:
+            return
+
+        entries = []
+
+        for entry in self.path.iterdir():
+            metadata = entry / 'entry.json'
+
+            if entry.name == keep or not metadata.is_file():
+                continue
+
+            size = json.loads(metadata.read_text())['size']
+            entries.append((metadata.stat().st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        total += json.loads(
+            (self.path / keep / 'entry.json').read_text())['size']
+
+        # least recently used first
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_size * 1024**2:
+                break
+
+            self._logger.debug('Evicting cache entry %s', entry)
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+def _make_product_cache(value):
+    """
+    Converts the value passed in DAGConfiguration.product_cache (None, a path
+    to a directory, a dictionary with ProductCache arguments or a
+    ProductCache instance)
+    """
+    if value is None or isinstance(value, ProductCache):
+        return value
+    elif isinstance(value, (str, os.PathLike)):
+        return ProductCache(value)
+    elif isinstance(value, Mapping):
+        return ProductCache(**value)
+
+    raise TypeError('product_cache must be None, a path, a dictionary or '
+                    f'a ProductCache instance, got: {value!r}')
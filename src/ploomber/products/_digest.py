@@ -0,0 +1,132 @@
+"""
+Content digests for products. By default, a task is outdated if any of its
+upstream products has a more recent timestamp, which triggers unnecessary
+executions when an upstream task runs again but generates the same output.
+When DAGConfiguration.outdated_by_digest is True, products store a digest of
+their contents (and the digests of their upstream products) in their
+metadata, and a task is outdated only if the contents of any of its upstream
+products changed
+"""
+import mmap
+import hashlib
+from pathlib import Path
+from collections.abc import Mapping
+
+_CHUNK_SIZE = 1024 * 1024
+# files larger than this are memory-mapped instead of read in chunks
+_MMAP_THRESHOLD = 64 * 1024 * 1024
+
+
+def _update_with_file(hash_, path):
+    with open(path, 'rb') as f:
+        size = f.seek(0, 2)
+        f.seek(0)
+
+        if size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hash_.update(mapped)
+        else:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                hash_.update(chunk)
+
+
+def path_digest(path):
+    """
+    Returns the blake2b digest of a file or a directory (contents and
+    relative paths of all files in it), None if the path does not exist
+    """
+    path = Path(path)
+
+    if not path.exists():
+        return None
+
+    hash_ = hashlib.blake2b()
+
+    if path.is_dir():
+        for sub in sorted(p for p in path.rglob('*') if p.is_file()):
+            hash_.update(sub.relative_to(path).as_posix().encode('utf-8'))
+            _update_with_file(hash_, sub)
+    else:
+        _update_with_file(hash_, path)
+
+    return hash_.hexdigest()
+
+
+def rows_digest(rows):
+    """
+    Returns a digest for an iterable of rows that does not depend on their
+    order (the sum of the digests of each row), SQL relations are unordered
+    so the same table may return rows in a different order
+    """
+    total = 0
+
+    for row in rows:
+        digest = hashlib.blake2b(repr(tuple(row)).encode('utf-8'),
+                                 digest_size=16).digest()
+        total = (total + int.from_bytes(digest, 'big')) % 2**128
+
+    return format(total, '032x')
+
+
+def combine(digests):
+    """Combines several digests into one, None if any of them is None
+    """
+    digests = list(digests)
+
+    if any(digest is None for digest in digests):
+        return None
+
+    if len(digests) == 1:
+        return digests[0]
+
+    return hashlib.blake2b(','.join(digests).encode('utf-8')).hexdigest()
+
+
+def enabled(task):
+    """
+    Returns True if the task's DAG records digests (task might be None or a
+    task stub in a worker process)
+    """
+    params = getattr(getattr(task, 'dag', None), '_params', None)
+    return getattr(params, 'outdated_by_digest', False) is True
+
+
+def _upstream_products(upstream):
+    for value in upstream.values():
+        if isinstance(value, Mapping) and not hasattr(value, 'metadata'):
+            # grouped upstream (task.set_upstream(..., group_name=...))
+            yield from _upstream_products(value)
+        else:
+            yield value
+
+
+def upstream_digests(task):
+    """
+    Returns a dictionary with the digests of the task's upstream products,
+    keyed by task name. Uses params['upstream'] instead of task.upstream
+    since upstream tasks are not available in worker processes
+    """
+    upstream = task.params.get('upstream')
+
+    if upstream is None:
+        return {}
+
+    return {
+        product.task.name: product.metadata.digest
+        for product in _upstream_products(upstream.to_dict())
+    }
+
+
+def upstream_changed(metadata, name, digest):
+    """
+    Returns True if the digest for the upstream task (name) differs from the
+    one stored in metadata when the product was built, None if it cannot be
+    determined (e.g., the product was built with digests disabled), in which
+    case callers should compare timestamps
+    """
+    stored = (metadata.upstream_digests or {}).get(name)
+
+    if stored is None or digest is None:
+        return None
+
+    return stored != digest
@@ -0,0 +1,205 @@
+"""
+Project-level metadata storage for File products. By default, each File
+stores its metadata in a sidecar file (.{name}.metadata), this module
+implements an alternative that keeps the metadata for all files in a single
+SQLite database, which reduces the number of filesystem operations when
+rendering pipelines with many products
+"""
+import os
+import json
+import sqlite3
+from contextlib import contextmanager, ExitStack
+from pathlib import Path
+
+
+class SQLiteMetadataStore:
+    """
+    Stores File metadata in a SQLite database. Records are keyed by the
+    product's path (relative to the folder that contains the ``.ploomber/``
+    directory)
+
+    Parameters
+    ----------
+    path : str or pathlib.Path, default='.ploomber/metadata.db'
+        Path to the database, parent directories are created if needed
+
+    Notes
+    -----
+    Records are cached in memory after calling ``fetch_all()``, DAG.render()
+    calls it to load the metadata for all products with a single query. The
+    connection is opened lazily and it is not pickled, so the store can be
+    sent to other processes
+    """
+    def __init__(self, path=None):
+        self.path = Path(path or Path('.ploomber', 'metadata.db')).resolve()
+        # .ploomber/metadata.db -> project root
+        self._root = (self.path.parent.parent if self.path.parent.name
+                      == '.ploomber' else self.path.parent)
+        self._conn = None
+        self._pid = None
+        self._cache = None
+        self._pending = None
+
+    def __repr__(self):
+        return f'{type(self).__name__}({str(self.path)!r})'
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        state['_pid'] = None
+        state['_cache'] = None
+        state['_pending'] = None
+        return state
+
+    def key(self, path):
+        """Returns the key used to store the metadata for the given path
+        """
+        path = os.path.abspath(path)
+
+        try:
+            return Path(os.path.relpath(path, self._root)).as_posix()
+        except ValueError:
+            # windows: path and root are in different drives
+            return Path(path).as_posix()
+
+    def fetch_all(self):
+        """
+        Loads all records and caches them, returns a dictionary mapping keys
+        to metadata
+        """
+        rows = self._connection().execute('SELECT key, data FROM metadata')
+        self._cache = {key: json.loads(data) for key, data in rows}
+        return self._cache
+
+    def fetch(self, path):
+        """Returns the metadata for the given path or None if there isn't any
+        """
+        key = self.key(path)
+
+        if self._cache is not None and key in self._cache:
+            return self._cache[key]
+
+        row = self._connection().execute(
+            'SELECT data FROM metadata WHERE key = ?', (key, )).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def save(self, path, metadata):
+        """Saves metadata for the given path (replaces any existing record)
+        """
+        if self._pending is not None:
+            self._pending.append((path, metadata))
+            return
+
+        key = self.key(path)
+        conn = self._connection()
+
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO metadata (key, data) VALUES (?, ?)',
+                (key, json.dumps(metadata)))
+
+        if self._cache is not None:
+            self._cache[key] = metadata
+
+    def save_many(self, records):
+        """
+        Saves metadata for several paths in a single transaction, records
+        is an iterable of (path, metadata) tuples
+        """
+        records = [(self.key(path), metadata) for path, metadata in records]
+        conn = self._connection()
+
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO metadata (key, data) VALUES (?, ?)',
+                [(key, json.dumps(metadata)) for key, metadata in records])
+
+        if self._cache is not None:
+            self._cache.update(records)
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager to save all records passed to ``save()`` in a single
+        transaction when exiting
+        """
+        if self._pending is not None:
+            yield
+            return
+
+        self._pending = []
+
+        try:
+            yield
+        finally:
+            pending, self._pending = self._pending, None
+
+            if pending:
+                self.save_many(pending)
+
+    def delete(self, path):
+        """Deletes the metadata for the given path, if any
+        """
+        key = self.key(path)
+        conn = self._connection()
+
+        with conn:
+            conn.execute('DELETE FROM metadata WHERE key = ?', (key, ))
+
+        if self._cache is not None:
+            self._cache.pop(key, None)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connection(self):
+        # sqlite connections cannot be shared with forked processes
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # tasks running in parallel may write at the same time, wait
+            # for the lock instead of failing
+            self._conn = sqlite3.connect(str(self.path), timeout=60)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS metadata '
+                               '(key TEXT PRIMARY KEY, data TEXT NOT NULL)')
+            self._pid = os.getpid()
+            self._cache = None
+
+        return self._conn
+
+
+def _make_metadata_store(value):
+    """
+    Converts the value passed in DAGConfiguration.metadata_store (None,
+    'sqlite' or a SQLiteMetadataStore instance)
+    """
+    if value is None or isinstance(value, SQLiteMetadataStore):
+        return value
+    elif value == 'sqlite':
+        return SQLiteMetadataStore()
+
+    raise ValueError('metadata_store must be None, "sqlite" or a '
+                     f'SQLiteMetadataStore instance, got: {value!r}')
+
+
+@contextmanager
+def batch(products):
+    """
+    Batches metadata writes for all the products (that use a metadata store)
+    in the iterable
+    """
+    stores = {}
+
+    for product in products:
+        store = getattr(product, '_metadata_store', None)
+
+        if isinstance(store, SQLiteMetadataStore):
+            stores[id(store)] = store
+
+    with ExitStack() as stack:
+        for store in stores.values():
+            stack.enter_context(store.batch())
+
+        yield
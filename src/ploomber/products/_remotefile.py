@@ -2,6 +2,7 @@ import json
 
 from ploomber.constants import TaskStatus
 from ploomber.products.metadata import Metadata
+from ploomber.products import _digest
 
 
 class _RemoteFile:
@@ -124,7 +125,8 @@ class _RemoteFile:
             a_params=self.metadata.params,
             b_params=self._local_file.task.params.to_json_serializable(
                 params_only=True),
-            extension=self._local_file.task.source.extension)
+            extension=self._local_file.task.source.extension,
+            a_digest=self.metadata.normalized_digest)
 
         return outdated
 
@@ -157,17 +159,30 @@ class _RemoteFile:
                 or not with_respect_to_local):
             # TODO: delete ._remote will never be None
             if upstream.product._remote:
-                upstream_timestamp = (
-                    upstream.product._remote.metadata.timestamp)
+                upstream_metadata = upstream.product._remote.metadata
             else:
-                upstream_timestamp = None
+                upstream_metadata = None
         else:
-            upstream_timestamp = upstream.product.metadata.timestamp
+            upstream_metadata = upstream.product.metadata
+
+        upstream_timestamp = (None if upstream_metadata is None else
+                              upstream_metadata.timestamp)
 
         if (self.metadata.timestamp is None or upstream_timestamp is None):
             return True
         else:
-            more_recent_upstream = upstream_timestamp > self.metadata.timestamp
+            # remote metadata for MetaProducts only has the first product's
+            # digest, so we can only compare single products
+            changed = (_digest.upstream_changed(self.metadata, upstream.name,
+                                                upstream_metadata.digest)
+                       if _digest.enabled(self._local_file.task)
+                       and len(upstream.product) == 1 else None)
+
+            if changed is not None:
+                more_recent_upstream = changed
+            else:
+                more_recent_upstream = (upstream_timestamp
+                                        > self.metadata.timestamp)
 
             if with_respect_to_local:
                 outdated_upstream_prod = upstream.product._is_outdated()
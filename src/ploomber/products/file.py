@@ -14,6 +14,7 @@ from ploomber.constants import TaskStatus
 from ploomber.products._remotefile import (_RemoteFile,
                                            _fetch_metadata_from_file_product)
 from ploomber.products.mixins import ProductWithClientMixin
+from ploomber.products._digest import path_digest
 from ploomber.exceptions import MissingClientError
 
 
@@ -62,24 +63,68 @@ class File(ProductWithClientMixin, os.PathLike, Product):
     def _remote_path_to_metadata(self):
         return self._remote._path_to_metadata
 
+    @property
+    def _metadata_store(self):
+        """
+        Project-level metadata store (DAGConfiguration.metadata_store), if
+        None, metadata is stored in a sidecar file. Files with a client always
+        use the sidecar file, since it is uploaded along with the product
+        """
+        if self._task is None or self.client is not None:
+            return None
+
+        return getattr(self._task.dag._params, 'metadata_store', None)
+
     def fetch_metadata(self):
+        store = self._metadata_store
+
+        if store is not None:
+            if not self._path_to_file.exists():
+                return None
+
+            metadata = store.fetch(self._path_to_file)
+
+            if metadata is not None:
+                return metadata
+
         # migrate metadata file to keep compatibility with ploomber<0.10
         old_name = Path(str(self._path_to_file) + '.source')
         if old_name.is_file():
             shutil.move(old_name, self._path_to_metadata)
 
-        return _fetch_metadata_from_file_product(self, check_file_exists=True)
+        metadata = _fetch_metadata_from_file_product(self,
+                                                     check_file_exists=True)
+
+        # migrate sidecar file to the metadata store
+        if store is not None and metadata is not None:
+            store.save(self._path_to_file, metadata)
+            os.remove(str(self._path_to_metadata))
+
+        return metadata
 
     def save_metadata(self, metadata):
-        self._path_to_metadata.write_text(json.dumps(metadata))
+        store = self._metadata_store
+
+        if store is not None:
+            store.save(self._path_to_file, metadata)
+        else:
+            self._path_to_metadata.write_text(json.dumps(metadata))
 
     def _delete_metadata(self):
+        store = self._metadata_store
+
+        if store is not None:
+            store.delete(self._path_to_file)
+
         if self._path_to_metadata.exists():
             os.remove(str(self._path_to_metadata))
 
     def exists(self):
         return self._path_to_file.exists()
 
+    def _digest(self):
+        return path_digest(self._path_to_file)
+
     def delete(self, force=False):
         # force is not used for this product but it is left for API
         # compatibility
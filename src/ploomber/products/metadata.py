@@ -10,6 +10,7 @@ from copy import deepcopy
 
 from ploomber.util.util import callback_check
 from ploomber.products._resources import process_resources
+from ploomber.products import _metadatastore, _digest
 from ploomber.products.serializeparams import remove_non_serializable_top_keys
 
 
@@ -56,8 +57,35 @@ class AbstractMetadata(abc.ABC):
         """
         pass
 
+    @property
+    def elapsed(self):
+        """Seconds it took to build the product the last time it was built
+        (None if unknown)
+        """
+        return self._data.get('elapsed')
+
+    @property
+    def digest(self):
+        """Digest of the product's contents (None if not recorded)
+        """
+        return self._data.get('digest')
+
+    @property
+    def upstream_digests(self):
+        """
+        Digests of the upstream products when the product was built (None
+        if not recorded)
+        """
+        return self._data.get('upstream_digests')
+
+    @property
+    def normalized_digest(self):
+        """Digest of the normalized source code (None if not recorded)
+        """
+        return self._data.get('normalized_digest')
+
     @abc.abstractmethod
-    def update(self, source_code, params):
+    def update(self, source_code, params, elapsed=None):
         """
         """
         pass  # pragma: no cover
@@ -227,7 +255,7 @@ class Metadata(AbstractMetadata):
         self._did_fetch = True
         self._data = metadata
 
-    def update(self, source_code, params):
+    def update(self, source_code, params, elapsed=None):
         """
         Update metadata in the storage backend, this should be called by
         Task objects when running successfully to update metadata in the
@@ -241,6 +269,10 @@ class Metadata(AbstractMetadata):
 
         params : dict
             Task's params
+
+        elapsed : float, default=None
+            Seconds it took to build the product, executors use it to
+            prioritize tasks. If None, the stored value is kept
         """
         # remove any unserializable parameters
         params = remove_non_serializable_top_keys(params)
@@ -252,6 +284,32 @@ class Metadata(AbstractMetadata):
             # declared as resources
             params=process_resources(params))
 
+        # e.g., the task was skipped, keep the time it took the last time it
+        # ran
+        if elapsed is None:
+            elapsed = self.elapsed
+
+        if elapsed is not None:
+            new_data['elapsed'] = elapsed
+
+        task = self._product._task
+
+        # used to determine if the source code changed without normalizing
+        # the stored source code (see CodeDiffer.is_different). Only stored
+        # if the normalized code is cached (e.g., it was normalized when
+        # rendering because the code changed), normalizing it here would
+        # slow down every build
+        if task is not None:
+            digest = task.dag._params.differ.normalized_digest(
+                source_code, task.source.extension, compute=False)
+
+            if digest is not None:
+                new_data['normalized_digest'] = digest
+
+        if _digest.enabled(task):
+            new_data['digest'] = self._product._digest()
+            new_data['upstream_digests'] = _digest.upstream_digests(task)
+
         kwargs = callback_check(self._product.prepare_metadata,
                                 available={
                                     'metadata': new_data,
@@ -354,9 +412,15 @@ class MetadataCollection(AbstractMetadata):
     def params(self):
         return self._products.first.params
 
-    def update(self, source_code, params):
-        for p in self._products:
-            p.metadata.update(source_code, params)
+    @property
+    def digest(self):
+        return _digest.combine(p.metadata.digest for p in self._products)
+
+    def update(self, source_code, params, elapsed=None):
+        # products sharing a metadata store save in a single transaction
+        with _metadatastore.batch(self._products):
+            for p in self._products:
+                p.metadata.update(source_code, params, elapsed=elapsed)
 
     def update_locally(self, data):
         for p in self._products:
@@ -446,7 +510,7 @@ class MetadataAlwaysUpToDate(AbstractMetadata):
     def _get(self):
         pass  # pragma: no cover
 
-    def update(self, source_code, params):
+    def update(self, source_code, params, elapsed=None):
         pass  # pragma: no cover
 
     def update_locally(self, data):
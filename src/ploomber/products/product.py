@@ -10,6 +10,7 @@ import logging
 
 from ploomber.products.metadata import Metadata
 from ploomber.products._resources import process_resources
+from ploomber.products import _digest
 
 
 def _prepare_metadata(metadata):
@@ -162,11 +163,19 @@ class Product(abc.ABC):
     def _is_outdated_due_to_upstream(self, up_prod):
         """
         A task becomes data outdated if an upstream product has a higher
-        timestamp or if an upstream product is outdated
+        timestamp (or a different digest, if digests are enabled) or if an
+        upstream product is outdated
         """
         if (self.metadata.timestamp is None
                 or up_prod.metadata.timestamp is None):
             return True
+
+        changed = (_digest.upstream_changed(self.metadata, up_prod.task.name,
+                                            up_prod.metadata.digest)
+                   if _digest.enabled(self.task) else None)
+
+        if changed is not None:
+            return changed or up_prod._is_outdated()
         else:
             return (
                 (up_prod.metadata.timestamp > self.metadata.timestamp)
@@ -195,7 +204,8 @@ class Product(abc.ABC):
             # the path to the file
             b_params=process_resources(
                 self.task.params.to_json_serializable(params_only=True)),
-            extension=self.task.source.extension)
+            extension=self.task.source.extension,
+            a_digest=self.metadata.normalized_digest)
 
         self._outdated_code_dependency_status = outdated
 
@@ -283,6 +293,15 @@ class Product(abc.ABC):
             '_delete_metadata not implemented in {}'.format(
                 type(self).__name__))
 
+    def _digest(self):
+        """
+        Returns a digest of the product's contents, used when
+        DAGConfiguration.outdated_by_digest is True. Products that do not
+        implement it return None, and their downstream dependencies use
+        timestamps to determine outdated status
+        """
+        return None
+
     # download and upload are only relevant for File but we add them to keep
     # the API consistent
 
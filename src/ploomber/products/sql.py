@@ -11,6 +11,10 @@ from ploomber.products import Product
 from ploomber.products.mixins import SQLProductMixin, ProductWithClientMixin
 from ploomber.products.serializers import Base64Serializer
 from ploomber.placeholders.placeholder import SQLRelationPlaceholder
+from ploomber.products._digest import rows_digest
+
+# rows to fetch at a time when computing a table's digest in the client
+_DIGEST_BATCH_SIZE = 10000
 
 
 class SQLiteBackedProductMixin(ProductWithClientMixin, abc.ABC):
@@ -176,6 +180,20 @@ class SQLiteRelation(SQLProductMixin, SQLiteBackedProductMixin, Product):
             'Running "{query}" on the databse...'.format(query=query))
         self.client.execute(query)
 
+    def _digest(self):
+        # sqlite does not have hashing functions, hash the rows in batches
+        cur = self.client.connection.cursor()
+        cur.execute(f'SELECT * FROM {self}')
+
+        def rows():
+            for batch in iter(lambda: cur.fetchmany(_DIGEST_BATCH_SIZE), []):
+                yield from batch
+
+        try:
+            return rows_digest(rows())
+        finally:
+            cur.close()
+
     @property
     def name(self):
         return self._identifier.name
@@ -320,6 +338,18 @@ class PostgresRelation(SQLProductMixin, ProductWithClientMixin, Product):
         cur.close()
         self.client.connection.commit()
 
+    def _digest(self):
+        # compute the checksum in the database to avoid fetching the rows.
+        # sort the row hashes since the order of the rows is not guaranteed
+        query = ("SELECT md5(string_agg(md5(t::text), '' "
+                 "ORDER BY md5(t::text))) FROM {} AS t".format(self))
+        cur = self.client.connection.cursor()
+        cur.execute(query)
+        digest = cur.fetchone()[0]
+        cur.close()
+        # empty relations return NULL
+        return digest or rows_digest([])
+
     @property
     def name(self):
         return self._identifier.name
@@ -0,0 +1,212 @@
+"""
+Cache of the notebooks parsed by NotebookSource. Converting a script with
+jupytext (and adding the kernelspec metadata) is slow and it happens every
+time a source is initialized or reloaded, so parsed notebooks are kept in a
+process-wide in-memory cache, and optionally, in a SQLite database that is
+reused across processes and sessions
+
+Parsed notebooks are shared by all the sources with the same code, they
+must not be modified
+"""
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+import nbformat
+import jupytext
+
+# maximum number of notebooks kept in memory
+MAX_SIZE = 1000
+
+# key -> ParsedNotebook
+_memo = OrderedDict()
+_lock = threading.Lock()
+
+
+class ParsedNotebook:
+    """
+    A notebook object and its JSON representation. Values computed from the
+    notebook (e.g., the names used in its code) can be memoized here
+
+    Parameters
+    ----------
+    nb : NotebookNode
+        The notebook
+
+    nb_str : str
+        JSON representation of nb
+    """
+    __slots__ = ('nb', 'nb_str', '_derived')
+
+    def __init__(self, nb, nb_str):
+        self.nb = nb
+        self.nb_str = nb_str
+        self._derived = {}
+
+    def memoize(self, name, fn):
+        """Returns fn(self.nb), computing it only once per name
+        """
+        if name not in self._derived:
+            self._derived[name] = fn(self.nb)
+
+        return self._derived[name]
+
+
+class NotebookCache:
+    """
+    Stores parsed notebooks (as JSON) in a SQLite database
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Path to the database, parent directories are created if needed
+
+    max_size : int, default=1000
+        Maximum number of entries, the oldest ones are deleted when it's
+        exceeded
+
+    Notes
+    -----
+    The connection is opened lazily and it is not pickled, so the cache
+    can be sent to other processes
+    """
+    def __init__(self, path, max_size=MAX_SIZE):
+        self.path = Path(path).resolve()
+        self.max_size = max_size
+        self._conn = None
+        self._pid = None
+
+    def __repr__(self):
+        return f'{type(self).__name__}({str(self.path)!r})'
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        state['_pid'] = None
+        return state
+
+    def get(self, key):
+        """Returns the notebook (JSON string) for the key, None if missing
+        """
+        row = self._connection().execute(
+            'SELECT nb FROM notebooks WHERE key = ?', (key, )).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, key, nb_str):
+        """Stores a notebook and deletes the oldest entries if needed
+        """
+        conn = self._connection()
+
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO notebooks (key, nb) VALUES (?, ?)',
+                (key, nb_str))
+            conn.execute(
+                'DELETE FROM notebooks WHERE rowid <= '
+                '(SELECT MAX(rowid) FROM notebooks) - ?', (self.max_size, ))
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connection(self):
+        # sqlite connections cannot be shared with forked processes
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=60)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS notebooks '
+                               '(key TEXT PRIMARY KEY, nb TEXT NOT NULL)')
+            self._pid = os.getpid()
+
+        return self._conn
+
+
+def _make_notebook_cache(value):
+    """
+    Converts the value passed in DAGConfiguration.notebook_cache (None, a
+    path to a SQLite database or a NotebookCache instance)
+    """
+    if value is None or isinstance(value, NotebookCache):
+        return value
+    elif isinstance(value, (str, os.PathLike)):
+        return NotebookCache(value)
+
+    raise TypeError('notebook_cache must be None, a path or a NotebookCache '
+                    f'instance, got: {value!r}')
+
+
+def make_key(primitive, **options):
+    """
+    Returns the key for the source code and the options used to parse it,
+    the jupytext version is part of the key since it determines the output
+    """
+    return hashlib.sha256(
+        json.dumps([primitive, sorted(options.items()), jupytext.__version__],
+                   default=str).encode('utf-8')).hexdigest()
+
+
+def load(key, parse, check, cache=None):
+    """
+    Returns the ParsedNotebook for the key
+
+    Parameters
+    ----------
+    key : str
+        Key returned by make_key
+
+    parse : callable
+        Function to parse the notebook, called if it is not cached, it must
+        return a notebook object
+
+    check : callable
+        Function called with the notebook when it is loaded from the
+        database (e.g., to verify that the kernel is installed in the
+        current environment)
+
+    cache : NotebookCache, default=None
+        Database to look up notebooks that are not in memory
+    """
+    with _lock:
+        parsed = _memo.get(key)
+
+        if parsed is not None:
+            _memo.move_to_end(key)
+            return parsed
+
+    nb_str = None if cache is None else cache.get(key)
+
+    if nb_str is not None:
+        # notebooks are validated before being stored
+        nb = nbformat.v4.reads(nb_str)
+        check(nb)
+    else:
+        nb = parse()
+        nb_str = nbformat.writes(nb, version=nbformat.NO_CONVERT)
+
+        if cache is not None and nb.nbformat == 4:
+            cache.set(key, nb_str)
+
+    parsed = ParsedNotebook(nb, nb_str)
+
+    with _lock:
+        # another thread may have stored it, keep the first one
+        parsed = _memo.setdefault(key, parsed)
+        _memo.move_to_end(key)
+
+        if len(_memo) > MAX_SIZE:
+            _memo.popitem(last=False)
+
+    return parsed
+
+
+def clear():
+    """Clears the in-memory cache
+    """
+    with _lock:
+        _memo.clear()
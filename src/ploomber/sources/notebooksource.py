@@ -23,6 +23,7 @@ Given that there are many places where this information might be stored, we
 have a few rules to automatically determine language and kernel given a
 script/notebook.
 """
+import os
 from functools import wraps
 import ast
 from pathlib import Path
@@ -47,7 +48,7 @@ from ploomber.sources.abc import Source
 from ploomber.sources.nb_utils import find_cell_with_tag, find_cell_with_tags
 from ploomber.static_analysis.extractors import extractor_class_for_language
 from ploomber.static_analysis.pyflakes import check_notebook
-from ploomber.sources import docstring
+from ploomber.sources import docstring, _nbcache
 from ploomber.io import pretty_print
 
 
@@ -182,6 +183,10 @@ class NotebookSource(Source):
     check_if_kernel_installed : bool, optional
         Check if the kernel is installed during initization
 
+    notebook_cache : ploomber.sources._nbcache.NotebookCache, optional
+        Database to store parsed notebooks so they are reused across
+        processes. Parsed notebooks are always cached in memory
+
     Notes
     -----
     The render method prepares the notebook for execution: it adds the
@@ -198,7 +203,8 @@ class NotebookSource(Source):
                  ext_in=None,
                  kernelspec_name=None,
                  static_analysis='regular',
-                 check_if_kernel_installed=True):
+                 check_if_kernel_installed=True,
+                 notebook_cache=None):
         # any non-py file must first be converted using jupytext, we need
         # that representation for validation, if input is already a .py file
         # do not convert. If passed a string, try to guess format using
@@ -206,6 +212,9 @@ class NotebookSource(Source):
         # but do lazy loading in case we don't need both
         self._primitive = primitive
         self._check_if_kernel_installed = check_if_kernel_installed
+        self._notebook_cache = notebook_cache
+        # (mtime, size) of the file when it was last read
+        self._stat = None
 
         # this happens if using SourceLoader
         if isinstance(primitive, Placeholder):
@@ -229,7 +238,7 @@ class NotebookSource(Source):
                     'File does not exist.' +
                     _suggest_ploomber_scaffold_missing_file())
 
-            self._primitive = _read_primitive(primitive)
+            self._primitive = self._read_primitive()
         else:
             raise TypeError('Notebooks must be initialized from strings, '
                             'Placeholder or pathlib.Path, got {}'.format(
@@ -299,10 +308,19 @@ class NotebookSource(Source):
 
         self._post_init_validation(str(self._primitive))
 
+    def _read_primitive(self):
+        stat = os.stat(self._path)
+        self._stat = (stat.st_mtime_ns, stat.st_size)
+        return _read_primitive(self._path)
+
     @property
     def primitive(self):
         if self._hot_reload:
-            self._primitive = _read_primitive(self._path)
+            stat = os.stat(self._path)
+
+            # do not read the file if it did not change
+            if self._stat != (stat.st_mtime_ns, stat.st_size):
+                self._primitive = self._read_primitive()
 
         return self._primitive
 
@@ -325,27 +343,18 @@ class NotebookSource(Source):
                 f'Error processing {str(self._path)!r}: the last cell '
                 f'in the {kind} is the parameters cell. {cell_suggestion}')
 
-        # this is needed for parameterize_notebook to work
-        for cell in nb.cells:
-            if not hasattr(cell.metadata, 'tags'):
-                cell.metadata['tags'] = []
-        nb.metadata['papermill'] = dict()
-
         # NOTE: we use parameterize_notebook instead of execute_notebook
         # with the prepare_only option because the latter adds a "papermill"
         # section on each cell's metadata, which makes it too verbose when
         # using NotebookRunner.develop() when the source is script (each cell
         # will have an empty "papermill" metadata dictionary)
+        nb = _parameterize_notebook(nb, self._params)
 
-        # NOTE: in papermill 2.4.0, this method no longer creates a deepcopy
-        nb = parameterize_notebook(deepcopy(nb), self._params)
-
-        # delete empty tags to prevent cluttering the notebooks
-        for cell in nb.cells:
-            if not len(cell.metadata['tags']):
-                cell.metadata.pop('tags')
-
-        self._nb_str_rendered = nbformat.writes(nb)
+        # the notebook (v4, after parameterize_notebook) was validated when
+        # parsed and the injected cell is valid, skip validation
+        self._nb_str_rendered = nbformat.v4.writes(nb)
+        # parsed again from the string when needed
+        self._nb_obj_rendered = None
         self._post_render_validation()
 
     def _read_nb_str_unrendered(self, force=False):
@@ -365,28 +374,47 @@ class NotebookSource(Source):
             else:
                 primitive = self.primitive
 
-            # this is the notebook node representation
-            nb = _to_nb_obj(
-                primitive,
+            options = dict(
                 ext=self._ext_in,
                 # passing the underscored version
                 # because that's the only one available
                 # when this is initialized
                 language=self._language,
                 kernelspec_name=self._kernelspec_name,
-                check_if_kernel_installed=self._check_if_kernel_installed,
-                path=self._path)
-
-            # if the user injected cells manually (with ploomber nb --inject)
-            # the source will contain the injected cell, remove it because
-            # it should not be considered part of the source code
-            self._nb_obj_unrendered = _cleanup_rendered_nb(nb, print_=False)
+                check_if_kernel_installed=self._check_if_kernel_installed)
+
+            def parse():
+                # this is the notebook node representation
+                nb = _to_nb_obj(primitive, path=self._path, **options)
+
+                # if the user injected cells manually (with ploomber nb
+                # --inject) the source will contain the injected cell, remove
+                # it because it should not be considered part of the source
+                # code
+                return _cleanup_rendered_nb(nb, print_=False)
+
+            def check(nb):
+                check_nb_kernelspec_info(
+                    nb,
+                    self._kernelspec_name,
+                    self._ext_in,
+                    self._language,
+                    check_if_installed=self._check_if_kernel_installed)
+
+            # parsing is slow, the notebook object is shared by all sources
+            # with the same code, so it must not be modified
+            self._parsed = _nbcache.load(_nbcache.make_key(
+                primitive, **options),
+                                         parse=parse,
+                                         check=check,
+                                         cache=self._notebook_cache)
+
+            self._nb_obj_unrendered = self._parsed.nb
 
             # get the str representation. always write from nb_obj, even if
             # this was initialized with a ipynb file, nb_obj contains
             # kernelspec info
-            self._nb_str_unrendered = nbformat.writes(
-                self._nb_obj_unrendered, version=nbformat.NO_CONVERT)
+            self._nb_str_unrendered = self._parsed.nb_str
 
         return self._nb_str_unrendered, self._nb_obj_unrendered
 
@@ -434,7 +462,9 @@ class NotebookSource(Source):
             self._check_notebook(raise_=True, check_signature=True)
         else:
             # otherwise, only warn on unused parameters
-            _warn_on_unused_params(self._nb_obj_unrendered, self._params)
+            _warn_on_unused_params(
+                self._parsed.memoize('used_names', _used_names),
+                self._params)
 
     def _check_notebook(self, raise_, check_signature):
         if self.static_analysis and self.language == 'python':
@@ -588,7 +618,7 @@ class NotebookSource(Source):
         """
         Delete injected cell, overwrite the source file (and any paired files)
         """
-        nb_clean = _cleanup_rendered_nb(self._nb_obj_unrendered)
+        nb_clean = _cleanup_rendered_nb(deepcopy(self._nb_obj_unrendered))
 
         # remove metadata
         recursive_update(
@@ -616,7 +646,7 @@ class NotebookSource(Source):
         str
             The path if the extension changed, None otherwise
         """
-        nb_clean = _cleanup_rendered_nb(self._nb_obj_unrendered)
+        nb_clean = _cleanup_rendered_nb(deepcopy(self._nb_obj_unrendered))
 
         ext_file = self._path.suffix
         ext_format = long_form_one_format(fmt)['extension']
@@ -847,6 +877,57 @@ def determine_kernel_name(nb, kernelspec_name, ext, language):
         return None
 
 
+def _parameterize_notebook(nb, params):
+    """
+    Returns a copy of the notebook with the injected parameters cell. Unlike
+    deepcopy(nb), the copy shares the cells with the original notebook (they
+    are not modified)
+    """
+    # papermill upgrades (modifies) notebooks in older formats
+    if (nb.nbformat, nb.nbformat_minor) != (nbformat.current_nbformat,
+                                            nbformat.current_nbformat_minor):
+        nb = deepcopy(nb)
+
+    # parameterize_notebook requires "tags" in all cells, use a copy of the
+    # cells (and their metadata) that do not have them
+    originals = {}
+    cells = []
+
+    for cell in nb.cells:
+        if not cell.metadata.get('tags'):
+            tagged = nbformat.NotebookNode(cell)
+            tagged.metadata = nbformat.NotebookNode(cell.metadata, tags=[])
+            originals[id(tagged)] = cell
+            cell = tagged
+
+        cells.append(cell)
+
+    copy = nbformat.NotebookNode(nb)
+    copy.cells = cells
+    copy.metadata = nbformat.NotebookNode(nb.metadata, papermill={})
+
+    # NOTE: in papermill 2.4.0, this method no longer creates a deepcopy
+    copy = parameterize_notebook(copy, params)
+
+    # delete empty tags to prevent cluttering the notebooks
+    copy.cells = [
+        _without_empty_tags(originals[id(cell)]) if id(cell) in originals
+        else cell for cell in copy.cells
+    ]
+
+    return copy
+
+
+def _without_empty_tags(cell):
+    if 'tags' not in cell.metadata:
+        return cell
+
+    cell = nbformat.NotebookNode(cell)
+    cell.metadata = nbformat.NotebookNode(cell.metadata)
+    del cell.metadata['tags']
+    return cell
+
+
 def inject_cell(model, params):
     """Inject params (by adding a new cell) to a model
 
@@ -1015,25 +1096,30 @@ def iter_paired_notebooks(nb, fmt_, name):
         yield path, fmt_current
 
 
-def _nb2codestr(nb):
-    return '\n'.join([c.source for c in nb.cells if c.cell_type == 'code'])
-
-
-def _warn_on_unused_params(nb, params):
-    nb = deepcopy(nb)
+def _used_names(nb):
+    """
+    Returns the names used in the notebook's code (excluding the parameters
+    cell), None if it does not have a parameters cell
+    """
     _, idx = find_cell_with_tag(nb, 'parameters')
 
     # the notebooks might not have a parameters cell
     if idx is None:
-        return
-
-    del nb.cells[idx]
+        return None
 
-    code = _nb2codestr(nb)
+    code = '\n'.join([
+        c.source for i, c in enumerate(nb.cells)
+        if c.cell_type == 'code' and i != idx
+    ])
 
     # NOTE: if there a syntax error we cannot accurately check this
     m = parso.parse(code)
-    names = set(m.get_used_names())
+    return set(m.get_used_names())
+
+
+def _warn_on_unused_params(names, params):
+    if names is None:
+        return
 
     # remove product since it may not be required
     # FIXME: maybe only remove it if it's a dictionary with >2 keys
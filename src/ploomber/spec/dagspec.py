@@ -103,6 +103,7 @@ from ploomber.spec.taskspec import TaskSpec, suffix2taskclass
 from ploomber.util import validate
 from ploomber.util import default
 from ploomber.dag.dagconfiguration import DAGConfiguration
+from ploomber.products._metadatastore import SQLiteMetadataStore
 from ploomber.exceptions import (DAGSpecInitializationError,
                                  MissingKeysValidationError)
 from ploomber.env.envdict import EnvDict
@@ -512,7 +513,15 @@ class DAGSpec(MutableMapping):
         dag = DAG(name=self._name)
 
         if 'config' in self:
-            dag._params = DAGConfiguration.from_dict(self['config'])
+            config = dict(self['config'])
+
+            # store metadata next to the pipeline.yaml file
+            if (config.get('metadata_store') == 'sqlite'
+                    and self._parent_path is not None):
+                config['metadata_store'] = SQLiteMetadataStore(
+                    Path(self._parent_path, '.ploomber', 'metadata.db'))
+
+            dag._params = DAGConfiguration.from_dict(config)
 
         if 'executor' in self:
             executor = self['executor']
@@ -332,6 +332,7 @@ class TaskSpec(MutableMapping):
                                                     lazy_load=self.lazy_import)
 
             params = data.pop('params', None)
+            resources = data.pop('resources', None)
 
             # if the name argument is a placeholder, pass it in the namer
             # argument to the placeholders are replaced by their values
@@ -340,18 +341,24 @@ class TaskSpec(MutableMapping):
             else:
                 name_arg = dict(name=name)
 
-            return TaskGroup.from_grid(task_class=task_class,
-                                       product_class=product_class,
-                                       product_primitive=product,
-                                       task_kwargs=data,
-                                       dag=dag,
-                                       grid=grid,
-                                       resolve_relative_to=self.project_root,
-                                       on_render=on_render,
-                                       on_finish=on_finish,
-                                       on_failure=on_failure,
-                                       params=params,
-                                       **name_arg), upstream
+            group = TaskGroup.from_grid(task_class=task_class,
+                                        product_class=product_class,
+                                        product_primitive=product,
+                                        task_kwargs=data,
+                                        dag=dag,
+                                        grid=grid,
+                                        resolve_relative_to=self.project_root,
+                                        on_render=on_render,
+                                        on_finish=on_finish,
+                                        on_failure=on_failure,
+                                        params=params,
+                                        **name_arg)
+
+            if resources is not None:
+                for task in group:
+                    task.resources = resources
+
+            return group, upstream
         else:
             return _init_task(data=data,
                               meta=self.meta,
@@ -400,6 +407,7 @@ def _init_task(data, meta, project_root, lazy_import, dag):
     on_finish = task_dict.pop('on_finish', None)
     on_render = task_dict.pop('on_render', None)
     on_failure = task_dict.pop('on_failure', None)
+    resources = task_dict.pop('resources', None)
 
     if 'serializer' in task_dict:
         task_dict['serializer'] = dotted_path.DottedPath(
@@ -448,6 +456,9 @@ def _init_task(data, meta, project_root, lazy_import, dag):
         task.on_failure = dotted_path.DottedPath(on_failure,
                                                  lazy_load=lazy_import)
 
+    if resources is not None:
+        task.resources = resources
+
     return task
 
 
@@ -165,12 +165,18 @@ class TaskReport(Row):
     EXCLUDE_WRAP = ['Ran?', 'Elapsed (s)']
 
     @classmethod
-    def with_data(cls, name, ran, elapsed):
-        return cls({'name': name, 'Ran?': ran, 'Elapsed (s)': elapsed})
+    def with_data(cls, name, ran, elapsed, cache=None):
+        data = {'name': name, 'Ran?': ran, 'Elapsed (s)': elapsed}
+
+        # only included when the product cache is enabled
+        if cache is not None:
+            data['Cache'] = cache
+
+        return cls(data)
 
     @classmethod
-    def empty_with_name(cls, name):
-        return cls.with_data(name, False, 0)
+    def empty_with_name(cls, name, cache=None):
+        return cls.with_data(name, False, 0, cache=cache)
 
 
 class BuildReport(Table):
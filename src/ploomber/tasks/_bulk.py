@@ -0,0 +1,475 @@
+"""
+Bulk loading of rows into SQL databases. Rows are moved in batches (lists of
+tuples, as returned by cursor.fetchmany) so memory usage does not depend on
+the number of rows, and are inserted with COPY (PostgreSQL), executemany or
+multi-row INSERT ... VALUES statements
+"""
+import datetime
+import importlib
+from itertools import chain
+from pathlib import Path
+from io import TextIOBase
+from decimal import Decimal
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+METHODS = ('copy', 'executemany', 'values')
+
+# default number of rows to read from files at a time
+BATCH_SIZE = 50000
+
+# maximum number of parameters in a single INSERT ... VALUES statement
+# (SQLite versions before 3.32 allow up to 999)
+_MAX_PARAMS = 999
+
+_TYPES = {
+    'sqlite': {
+        bool: 'INTEGER',
+        int: 'INTEGER',
+        float: 'REAL',
+        Decimal: 'NUMERIC',
+        str: 'TEXT',
+        bytes: 'BLOB',
+        datetime.datetime: 'TIMESTAMP',
+        datetime.date: 'DATE',
+        datetime.time: 'TIME',
+    },
+    'postgresql': {
+        bool: 'BOOLEAN',
+        int: 'BIGINT',
+        float: 'DOUBLE PRECISION',
+        Decimal: 'NUMERIC',
+        str: 'TEXT',
+        bytes: 'BYTEA',
+        datetime.datetime: 'TIMESTAMP',
+        datetime.date: 'DATE',
+        datetime.time: 'TIME',
+    },
+}
+
+_TYPES['default'] = {**_TYPES['postgresql'], bytes: 'BLOB'}
+
+# postgres type OIDs (cursor.description[i][1] in psycopg2)
+_POSTGRES_OIDS = {
+    16: bool,
+    20: int,
+    21: int,
+    23: int,
+    700: float,
+    701: float,
+    1700: Decimal,
+    25: str,
+    1042: str,
+    1043: str,
+    17: bytes,
+    1114: datetime.datetime,
+    1184: datetime.datetime,
+    1082: datetime.date,
+    1083: datetime.time,
+}
+
+_PLACEHOLDERS = {
+    'qmark': lambda i: '?',
+    'format': lambda i: '%s',
+    'pyformat': lambda i: '%s',
+    'numeric': lambda i: f':{i + 1}',
+    'named': lambda i: f':c{i}',
+}
+
+# backslash must be the first one
+_COPY_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\t': '\\t',
+    '\n': '\\n',
+    '\r': '\\r',
+})
+
+
+def flavor(client):
+    """
+    Returns 'postgresql', 'sqlite' or the driver name for a SQLAlchemyClient
+    or a DBAPIClient
+    """
+    name = getattr(client, 'flavor', None)
+
+    if name is None:
+        # DBAPIClient: use the driver's module (e.g., sqlite3, psycopg2)
+        name = type(client.connection).__module__.split('.')[0]
+
+    if name.startswith(('postgres', 'psycopg')):
+        return 'postgresql'
+    elif name.startswith('sqlite'):
+        return 'sqlite'
+
+    return name
+
+
+def paramstyle(client):
+    """Returns the DB-API paramstyle for the client's driver
+    """
+    engine = getattr(client, 'engine', None)
+
+    if engine is not None:
+        return engine.dialect.paramstyle
+
+    module = type(client.connection).__module__.split('.')[0]
+    return getattr(importlib.import_module(module), 'paramstyle', 'qmark')
+
+
+def _python_type(value):
+    for type_ in (bool, int, float, Decimal, str, bytes, datetime.datetime,
+                  datetime.date, datetime.time):
+        if isinstance(value, type_):
+            return type_
+
+    return str
+
+
+def column_types(cursor, rows):
+    """
+    Returns the Python type for each column in the cursor's result. Uses the
+    type codes in cursor.description when they are known (psycopg2), and
+    the first non-null value in rows (the first batch) otherwise (e.g.,
+    sqlite3 does not report types). Columns with no values are str
+    """
+    from_description = type(cursor).__module__.startswith('psycopg')
+    out = []
+
+    for i, column in enumerate(cursor.description):
+        type_ = _POSTGRES_OIDS.get(column[1]) if from_description else None
+
+        if type_ is None:
+            value = next((row[i] for row in rows if row[i] is not None),
+                         None)
+            type_ = _python_type(value)
+
+        out.append(type_)
+
+    return out
+
+
+def arrow_types(schema):
+    """Returns the Python type for each field in a pyarrow.Schema
+    """
+    checks = [
+        (pa.types.is_boolean, bool),
+        (pa.types.is_integer, int),
+        (pa.types.is_floating, float),
+        (pa.types.is_decimal, Decimal),
+        (pa.types.is_timestamp, datetime.datetime),
+        (pa.types.is_date, datetime.date),
+        (pa.types.is_time, datetime.time),
+        (lambda t: pa.types.is_binary(t) or pa.types.is_large_binary(t),
+         bytes),
+    ]
+
+    return [
+        next((type_ for check, type_ in checks if check(field.type)), str)
+        for field in schema
+    ]
+
+
+def sql_types(types, flavor):
+    """Maps Python types to SQL types
+    """
+    mapping = _TYPES.get(flavor, _TYPES['default'])
+    return [mapping[type_] for type_ in types]
+
+
+def read_parquet(path, batch_size, columns=None):
+    """
+    Returns the column names, types and an iterator with batches of rows
+    from a parquet file (or a directory with parquet files). Row groups are
+    read one at a time, so only one is loaded in memory at any given time
+    (batches are at most batch_size rows)
+    """
+    path = Path(path)
+    files = sorted(path.rglob('*.parquet')) if path.is_dir() else [path]
+
+    if not files:
+        raise ValueError(f'Directory {str(path)!r} has no parquet files')
+
+    schema = pq.read_schema(files[0])
+
+    if columns is not None:
+        schema = pa.schema([schema.field(name) for name in columns])
+
+    def batches():
+        for file_ in files:
+            parquet_file = pq.ParquetFile(file_)
+
+            for i in range(parquet_file.num_row_groups):
+                table = parquet_file.read_row_group(i, columns=schema.names)
+
+                # split large row groups so python objects for at most
+                # batch_size rows exist at any given time
+                for batch in table.to_batches(max_chunksize=batch_size):
+                    if batch.num_rows:
+                        yield list(
+                            zip(*(column.to_pylist()
+                                  for column in batch.columns)))
+
+    return schema.names, arrow_types(schema), batches()
+
+
+def read_csv(path, batch_size):
+    """
+    Returns the column names, types and an iterator with batches of rows
+    from a csv file, types are inferred from the first batch
+    """
+    import pandas as pd
+    from pandas.api import types as pd_types
+
+    reader = pd.read_csv(str(path), chunksize=batch_size)
+    first = next(reader, None)
+
+    if first is None:
+        return [], [], iter([])
+
+    checks = [
+        (pd_types.is_bool_dtype, bool),
+        (pd_types.is_integer_dtype, int),
+        (pd_types.is_float_dtype, float),
+    ]
+
+    names = [str(name) for name in first.columns]
+    types = [
+        next((type_ for check, type_ in checks if check(dtype)), str)
+        for dtype in first.dtypes
+    ]
+
+    def batches():
+        for df in chain([first], reader):
+            # columns with missing values in this batch are float
+            for name, type_ in zip(df.columns, types):
+                if (type_ is int
+                        and not pd_types.is_integer_dtype(df[name].dtype)):
+                    df[name] = df[name].astype('Int64')
+
+            # NaN -> None
+            df = df.astype(object).where(df.notna(), None)
+            yield list(df.itertuples(index=False, name=None))
+
+    return names, types, batches()
+
+
+def quote(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def qualified_name(relation):
+    """
+    Returns the quoted and qualified name of a SQL relation product (names
+    are case sensitive, like in pandas.DataFrame.to_sql)
+    """
+    parts = [relation.schema, relation.name]
+    return '.'.join(quote(part) for part in parts if part is not None)
+
+
+def create_table(cursor, relation, names, types, if_exists='replace'):
+    """
+    Creates a table, if_exists determines what happens if it exists:
+    'replace' (drop it first), 'append' (keep it) or 'fail'
+    """
+    columns = ', '.join(f'{quote(name)} {type_}'
+                        for name, type_ in zip(names, types))
+
+    if if_exists == 'replace':
+        cursor.execute(f'DROP TABLE IF EXISTS {relation}')
+
+    if_not_exists = 'IF NOT EXISTS ' if if_exists == 'append' else ''
+    cursor.execute(f'CREATE TABLE {if_not_exists}{relation} ({columns})')
+
+
+def copy_text(rows):
+    """
+    Encodes rows in PostgreSQL's COPY text format (tab-separated, \\N for
+    null values)
+    """
+    lines = []
+
+    for row in rows:
+        lines.append('\t'.join(
+            '\\N' if value is None else _copy_value(value) for value in row))
+
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def _copy_value(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = '\\x' + bytes(value).hex()
+
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def _placeholders(paramstyle, n, offset=0):
+    return '({})'.format(', '.join(_PLACEHOLDERS[paramstyle](offset + i)
+                                   for i in range(n)))
+
+
+def _params(paramstyle, values):
+    if paramstyle == 'named':
+        return {f'c{i}': value for i, value in enumerate(values)}
+
+    return values
+
+
+def insert(cursor, relation, names, batches, paramstyle):
+    """Inserts batches of rows with executemany
+    """
+    columns = ', '.join(quote(name) for name in names)
+    query = (f'INSERT INTO {relation} ({columns}) '
+             f'VALUES {_placeholders(paramstyle, len(names))}')
+
+    for batch in batches:
+        cursor.executemany(query,
+                           [_params(paramstyle, row) for row in batch]
+                           if paramstyle == 'named' else batch)
+
+
+def insert_values(cursor, relation, names, batches, paramstyle):
+    """
+    Inserts batches of rows with multi-row INSERT ... VALUES statements
+    (for drivers whose executemany runs one statement per row)
+    """
+    columns = ', '.join(quote(name) for name in names)
+    n = len(names)
+    per_statement = max(1, _MAX_PARAMS // max(n, 1))
+    queries = {}
+
+    for batch in batches:
+        for start in range(0, len(batch), per_statement):
+            rows = batch[start:start + per_statement]
+
+            if len(rows) not in queries:
+                values = ', '.join(
+                    _placeholders(paramstyle, n, offset=i * n)
+                    for i in range(len(rows)))
+                queries[len(rows)] = (f'INSERT INTO {relation} ({columns}) '
+                                      f'VALUES {values}')
+
+            cursor.execute(
+                queries[len(rows)],
+                _params(paramstyle, [value for row in rows
+                                     for value in row]))
+
+
+class CopyStream(TextIOBase):
+    """
+    A read-only file-like object with batches of rows encoded in COPY text
+    format, batches are encoded when read, so only one is kept in memory.
+    Used as the file argument in psycopg2's cursor.copy_expert
+    """
+    def __init__(self, batches):
+        self._batches = iter(batches)
+        self._data = ''
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            chunks = [self._data[self._position:]]
+            chunks.extend(copy_text(batch) for batch in self._batches)
+            self._data, self._position = '', 0
+            return ''.join(chunks)
+
+        while self._position >= len(self._data):
+            batch = next(self._batches, None)
+
+            if batch is None:
+                return ''
+
+            self._data, self._position = copy_text(batch), 0
+
+        chunk = self._data[self._position:self._position + size]
+        self._position += len(chunk)
+        return chunk
+
+
+def copy(cursor, relation, names, batches):
+    """Inserts batches of rows with a single COPY (psycopg2 cursors)
+    """
+    columns = ', '.join(quote(name) for name in names)
+    query = f'COPY {relation} ({columns}) FROM STDIN'
+    cursor.copy_expert(query, CopyStream(batches))
+
+
+def default_method(client):
+    """
+    Returns the fastest method to load data with the client: COPY for
+    PostgreSQL and multi-row INSERT ... VALUES otherwise (in SQLite, this is
+    faster than executemany since each statement inserts hundreds of rows)
+    """
+    return 'copy' if flavor(client) == 'postgresql' else 'values'
+
+
+def load(client,
+         relation,
+         names,
+         types,
+         batches,
+         logger,
+         method=None,
+         if_exists='replace'):
+    """
+    Creates a table for relation (a SQL relation product) with the given
+    columns (names and Python types) and inserts the batches of rows in a
+    single transaction, returns the number of rows
+    """
+    method = method or default_method(client)
+    name = qualified_name(relation)
+    connection = client.connection
+    cursor = connection.cursor()
+    counter = _Counter(batches)
+
+    if method == 'copy' and not hasattr(cursor, 'copy_expert'):
+        cursor.close()
+        raise ValueError('method="copy" requires a psycopg2 connection, '
+                         f'got cursor: {type(cursor).__name__}')
+
+    try:
+        create_table(cursor,
+                     name,
+                     names,
+                     sql_types(types, flavor(client)),
+                     if_exists=if_exists)
+
+        logger.info('Loading data into %s with %s...', name, method)
+
+        if method == 'copy':
+            copy(cursor, name, names, counter)
+        elif method == 'executemany':
+            insert(cursor, name, names, counter, paramstyle(client))
+        else:
+            insert_values(cursor, name, names, counter, paramstyle(client))
+    except BaseException:
+        connection.rollback()
+        raise
+    else:
+        connection.commit()
+    finally:
+        cursor.close()
+
+    logger.info('Loaded %i rows into %s', counter.rows, name)
+    return counter.rows
+
+
+class _Counter:
+    """Iterates over batches and counts the rows
+    """
+    def __init__(self, batches):
+        self._batches = batches
+        self.rows = 0
+
+    def __iter__(self):
+        for batch in self._batches:
+            self.rows += len(batch)
+            yield batch
@@ -0,0 +1,121 @@
+"""
+Steps that tasks run after they finish, outside the critical path (e.g.,
+NotebookRunner converting the output notebook to HTML). Executors build
+tasks with defer_steps=True and submit the deferred steps to a thread pool
+in the main process when each task finishes, so downstream tasks do not
+wait for them
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ploomber.constants import TaskStatus
+from ploomber.messagecollector import BuildExceptionsCollector
+
+# notebook conversion is mostly CPU-bound, more threads do not help much
+MAX_WORKERS = 4
+
+_logger = logging.getLogger(__name__)
+
+
+def ran(status, report):
+    """
+    Returns True if the task executed its code (i.e., it wasn't downloaded,
+    restored from the product cache or skipped because its upstream
+    products did not change)
+
+    Parameters
+    ----------
+    status : TaskStatus
+        Status of the task before building it
+
+    report : TaskReport
+        Report returned by Task._build
+    """
+    hit = 'Cache' in report.columns and report['Cache'] == 'hit'
+    return (status == TaskStatus.WaitingExecution and report['Ran?']
+            and not hit)
+
+
+class DeferredSteps:
+    """
+    Runs the deferred steps of tasks built in the current DAG.build() call
+
+    Parameters
+    ----------
+    max_workers : int, default=4
+        Maximum number of steps running at the same time
+    """
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.max_workers = max_workers
+        self._pool = None
+        self._pending = []
+        # executors may call submit from a callback thread
+        self._lock = threading.Lock()
+
+    def submit(self, task, status, report):
+        """
+        Submits the deferred step of a task that finished successfully (if
+        any), executors must call this in the main process
+
+        Parameters
+        ----------
+        task : Task
+            The task (the copy in the main process)
+
+        status : TaskStatus
+            Status of the task before building it
+
+        report : TaskReport
+            Report returned by Task._build
+        """
+        if not ran(status, report):
+            return
+
+        step = task._deferred_step()
+
+        if step is None:
+            return
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='ploomber-deferred')
+
+            self._pending.append((task, self._pool.submit(step)))
+
+    def wait(self):
+        """
+        Waits for all submitted steps to finish. The metadata of tasks whose
+        step failed is deleted, so they run again in the next build
+
+        Returns
+        -------
+        BuildExceptionsCollector
+            The errors raised by the steps
+        """
+        # avoid a circular import (executors import this module)
+        from ploomber.executors import _format
+
+        with self._lock:
+            pending, self._pending = self._pending, []
+            pool, self._pool = self._pool, None
+
+        exceptions = BuildExceptionsCollector()
+
+        for task, future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                _logger.exception('Error running deferred step for task %r',
+                                  task.name)
+                task.product.metadata.delete()
+                exceptions.append(task=task,
+                                  message=_format.exception(e),
+                                  obj=e)
+
+        if pool is not None:
+            pool.shutdown()
+
+        return exceptions
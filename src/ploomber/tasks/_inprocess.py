@@ -0,0 +1,188 @@
+"""
+Execute the cells of a rendered notebook in the current process (used by
+NotebookRunner and ScriptRunner when executor='inprocess'), this skips the
+Jupyter kernel (or the subprocess) and the messages to communicate with it
+"""
+import ast
+import linecache
+import traceback
+from io import StringIO
+from contextlib import redirect_stdout, redirect_stderr
+
+import nbformat
+
+from ploomber.util.util import add_to_sys_path
+
+
+class CellExecutionError(Exception):
+    """Raised when a cell raises an exception
+
+    Parameters
+    ----------
+    index : int
+        Index of the cell (in the list of code cells)
+
+    traceback : str
+        Formatted traceback
+
+    outputs : list of list of dict
+        Outputs of the cells executed so far (if captured)
+    """
+    def __init__(self, index, traceback, outputs):
+        self.index = index
+        self.traceback = traceback
+        self.outputs = outputs
+        # same numbering as the execution count in the output notebook
+        super().__init__(f'Exception encountered at "In [{index + 1}]":\n'
+                         f'{traceback}')
+
+
+def _filename(name, index):
+    return f'<{name} cell {index}>'
+
+
+def _compile(source, filename, display_last):
+    """
+    Compiles a cell, if display_last, the last expression (if any) is
+    compiled separately to display its value, like Jupyter does
+    """
+    tree = ast.parse(source, filename=filename, mode='exec')
+    last = None
+
+    if display_last and tree.body and isinstance(tree.body[-1], ast.Expr):
+        last = ast.Expression(tree.body.pop().value)
+        last = compile(last, filename, 'eval')
+
+    return compile(tree, filename, 'exec'), last
+
+
+def _format_traceback(e):
+    # skip the frames from this module, they are not useful to the user
+    tb = e.__traceback__
+
+    while tb is not None and tb.tb_frame.f_globals.get('__name__') == __name__:
+        tb = tb.tb_next
+
+    return ''.join(traceback.format_exception(type(e), e, tb))
+
+
+def _display_data(value):
+    data = {'text/plain': repr(value)}
+    repr_html = getattr(value, '_repr_html_', None)
+
+    if callable(repr_html):
+        html = repr_html()
+
+        if html is not None:
+            data['text/html'] = html
+
+    return data
+
+
+def _is_error(e):
+    # sys.exit(), sys.exit(0) and sys.exit(None) finish successfully, just
+    # like they do when running a script
+    return e.code not in (None, 0)
+
+
+def run_cells(sources, name, cwd=None, capture=False):
+    """
+    Executes code cells in a new namespace
+
+    Parameters
+    ----------
+    sources : list of str
+        Source code of each cell
+
+    name : str
+        Used in the tracebacks to identify the cells
+
+    cwd : str, default=None
+        If not None, executes the cells in this directory, which is also
+        added to sys.path
+
+    capture : bool, default=False
+        If True, returns the outputs of each cell (stdout, stderr and the
+        value of the last expression) in nbformat's format
+
+    Returns
+    -------
+    list of list of dict
+        The outputs of each cell, an empty list if capture=False
+
+    Raises
+    ------
+    CellExecutionError
+        If any cell raises an exception. The outputs captured so far are
+        stored in the ``outputs`` attribute, the failing cell includes an
+        error output
+    """
+    namespace = {'__name__': '__main__', '__builtins__': __builtins__}
+    outputs = []
+
+    with add_to_sys_path(cwd, chdir=True):
+        for index, source in enumerate(sources):
+            filename = _filename(name, index)
+            # so tracebacks display the code
+            linecache.cache[filename] = (len(source), None,
+                                         source.splitlines(True), filename)
+
+            try:
+                if capture:
+                    cell_outputs = []
+                    outputs.append(cell_outputs)
+                    _run_and_capture(source, filename, namespace,
+                                     cell_outputs, index + 1)
+                else:
+                    code, _ = _compile(source, filename, display_last=False)
+                    exec(code, namespace)
+            except SystemExit as e:
+                if _is_error(e):
+                    raise CellExecutionError(index, _format_traceback(e),
+                                             outputs) from e
+
+                break
+            except Exception as e:
+                formatted = _format_traceback(e)
+
+                if capture:
+                    outputs[-1].append(
+                        nbformat.v4.new_output(
+                            'error',
+                            ename=type(e).__name__,
+                            evalue=str(e),
+                            traceback=formatted.splitlines()))
+
+                if isinstance(e, SyntaxError):
+                    formatted += ('(Note: IPython magics are not supported '
+                                  'when executor=\'inprocess\')')
+
+                raise CellExecutionError(index, formatted, outputs) from e
+
+    return outputs
+
+
+def _run_and_capture(source, filename, namespace, cell_outputs,
+                     execution_count):
+    stdout, stderr = StringIO(), StringIO()
+
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code, last = _compile(source, filename, display_last=True)
+            exec(code, namespace)
+            value = None if last is None else eval(last, namespace)
+    finally:
+        for stream_name, stream in (('stdout', stdout), ('stderr', stderr)):
+            text = stream.getvalue()
+
+            if text:
+                cell_outputs.append(
+                    nbformat.v4.new_output('stream',
+                                           name=stream_name,
+                                           text=text))
+
+    if value is not None:
+        cell_outputs.append(
+            nbformat.v4.new_output('execute_result',
+                                   data=_display_data(value),
+                                   execution_count=execution_count))
@@ -0,0 +1,438 @@
+"""
+A papermill engine that executes notebooks in pre-started kernels. Kernels
+are kept per process (tasks executed by Parallel run in worker processes),
+and per kernelspec, so they are reused by all the notebooks that run in the
+same process
+
+Usage:
+
+    NotebookRunner(..., papermill_params={'engine_name': 'kernel_pool'})
+"""
+import os
+import sys
+import logging
+import threading
+from time import monotonic
+from multiprocessing.util import Finalize
+
+from jupyter_client import AsyncKernelManager, BlockingKernelClient
+from jupyter_core.utils import run_sync
+from papermill.engines import NBClientEngine, papermill_engines
+
+ENGINE_NAME = 'kernel_pool'
+
+_RESET_MODES = ('namespace', 'restart')
+
+# options that can be passed in papermill_params
+OPTIONS = ('pool_size', 'preload', 'max_tasks_per_kernel',
+           'max_memory_per_kernel', 'reset')
+
+# ru_maxrss is in bytes on macOS and in kilobytes on Linux, not available
+# on windows (returns None)
+_PEAK_MEMORY = ("(lambda r: r.getrusage(r.RUSAGE_SELF).ru_maxrss / "
+                f"{1024**2 if sys.platform == 'darwin' else 1024})"
+                "(__import__('resource')) "
+                "if __import__('sys').platform != 'win32' else None")
+
+_logger = logging.getLogger(__name__)
+
+# (kernel name, preload) -> (pid, KernelPool)
+_pools = {}
+_lock = threading.Lock()
+# pid of the process that registered close_pools to run on exit
+_finalizer_pid = None
+
+
+def validate_options(pool_size=1,
+                     preload=None,
+                     max_tasks_per_kernel=None,
+                     max_memory_per_kernel=None,
+                     reset='namespace'):
+    """
+    Validates the kernel pool options (passed in papermill_params), raises
+    a ValueError if any of them is invalid
+    """
+    if (not isinstance(pool_size, int) or isinstance(pool_size, bool)
+            or pool_size < 1):
+        raise ValueError('pool_size must be a positive integer, '
+                         f'got: {pool_size!r}')
+
+    if preload is not None and (isinstance(preload, str) or not all(
+            isinstance(name, str) for name in preload)):
+        raise ValueError('preload must be a list of module names, '
+                         f'got: {preload!r}')
+
+    if max_tasks_per_kernel is not None and (
+            not isinstance(max_tasks_per_kernel, int)
+            or isinstance(max_tasks_per_kernel, bool)
+            or max_tasks_per_kernel < 1):
+        raise ValueError('max_tasks_per_kernel must be a positive integer '
+                         f'or None, got: {max_tasks_per_kernel!r}')
+
+    if max_memory_per_kernel is not None and (
+            not isinstance(max_memory_per_kernel, (int, float))
+            or isinstance(max_memory_per_kernel, bool)
+            or max_memory_per_kernel <= 0):
+        raise ValueError('max_memory_per_kernel must be a positive number '
+                         f'or None, got: {max_memory_per_kernel!r}')
+
+    if reset not in _RESET_MODES:
+        raise ValueError(f'reset must be one of {_RESET_MODES!r}, '
+                         f'got: {reset!r}')
+
+
+class _PoolKernelManager(AsyncKernelManager):
+    """
+    Keeps track of the clients created by nbclient, since it does not stop
+    them when the kernel manager is not its own
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._clients = []
+
+    def client(self, **kwargs):
+        kc = super().client(**kwargs)
+        self._clients.append(kc)
+        return kc
+
+    def stop_clients(self):
+        for kc in self._clients:
+            kc.stop_channels()
+
+        self._clients = []
+
+
+class PooledKernel:
+    """
+    A kernel that runs several notebooks. Code sent by the pool is executed
+    with a client connected to the shell channel only, messages are queued
+    by the kernel, so the pool does not have to wait for the kernel to start
+    (or to finish importing the preloaded modules) until the kernel is
+    needed
+
+    Parameters
+    ----------
+    kernel_name : str
+        Kernelspec name
+
+    preload : list of str
+        Modules to import when the kernel starts
+    """
+    def __init__(self, kernel_name, preload):
+        self.km = _PoolKernelManager(kernel_name=kernel_name)
+        run_sync(self.km.start_kernel)()
+
+        self.kc = BlockingKernelClient()
+        self.kc.load_connection_info(self.km.get_connection_info())
+        self.kc.start_channels(shell=True,
+                               iopub=False,
+                               stdin=False,
+                               hb=False,
+                               control=False)
+        self.n_tasks = 0
+        # the reply to this message tells us the kernel is ready (shell
+        # messages are delivered even if the kernel has not started yet)
+        self._pending = self.execute(
+            'import ' + ', '.join(preload) if preload else '')
+
+    @property
+    def pid(self):
+        return getattr(self.km.provisioner, 'pid', None)
+
+    def execute(self, code, user_expressions=None):
+        return self.kc.execute(code,
+                               silent=True,
+                               store_history=False,
+                               user_expressions=user_expressions)
+
+    def wait(self, msg_id, timeout):
+        """Waits for the reply to a message sent with execute()
+        """
+        deadline = monotonic() + timeout
+
+        while True:
+            msg = self.kc.get_shell_msg(timeout=max(deadline - monotonic(),
+                                                    0))
+
+            if msg['parent_header'].get('msg_id') == msg_id:
+                return msg['content']
+
+    def wait_until_ready(self, timeout):
+        """
+        Waits until the kernel starts and imports the preloaded modules
+        """
+        if self._pending is None:
+            return
+
+        content = self.wait(self._pending, timeout)
+        self._pending = None
+
+        if content['status'] != 'ok':
+            _logger.warning(
+                'Error importing preloaded modules in kernel: %s: %s',
+                content.get('ename'), content.get('evalue'))
+
+    def reset(self, timeout=60):
+        """
+        Deletes the variables defined by the last notebook (imported modules
+        remain loaded) and returns the peak memory usage (in MB) of the
+        kernel, None if it cannot be measured
+        """
+        msg_id = self.execute('%reset -f',
+                              user_expressions={'memory': _PEAK_MEMORY})
+        content = self.wait(msg_id, timeout)
+
+        if content['status'] != 'ok':
+            raise RuntimeError('Error resetting kernel: '
+                               f'{content.get("ename")}: '
+                               f'{content.get("evalue")}')
+
+        memory = content.get('user_expressions', {}).get('memory', {})
+
+        try:
+            return float(memory['data']['text/plain'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def is_alive(self):
+        return run_sync(self.km.is_alive)()
+
+    def shutdown(self):
+        self.km.stop_clients()
+        self.kc.stop_channels()
+
+        try:
+            run_sync(self.km.shutdown_kernel)(now=True)
+        except Exception:
+            _logger.exception('Error shutting down kernel')
+
+
+class KernelPool:
+    """
+    Keeps up to pool_size started kernels of the same kernelspec, each
+    notebook gets one of them and returns it once it finishes executing.
+    Kernels are reset after each notebook and replaced by a new one when
+    they reach max_tasks_per_kernel or max_memory_per_kernel
+
+    Parameters
+    ----------
+    kernel_name : str
+        Kernelspec name
+
+    preload : list of str
+        Modules to import when each kernel starts
+    """
+    def __init__(self, kernel_name, preload):
+        self.kernel_name = kernel_name
+        self.preload = list(preload)
+        self.pool_size = 1
+        self.max_tasks_per_kernel = None
+        self.max_memory_per_kernel = None
+        self.reset = 'namespace'
+        self._idle = []
+        self._n_kernels = 0
+        self._lock = threading.RLock()
+        self._closed = False
+
+    def configure(self, pool_size, max_tasks_per_kernel,
+                  max_memory_per_kernel, reset):
+        self.pool_size = pool_size
+        self.max_tasks_per_kernel = max_tasks_per_kernel
+        self.max_memory_per_kernel = max_memory_per_kernel
+        self.reset = reset
+
+    def _start(self):
+        kernel = PooledKernel(self.kernel_name, self.preload)
+        _logger.debug('Started kernel %r (pid: %s)', self.kernel_name,
+                      kernel.pid)
+        return kernel
+
+    def acquire(self, timeout=60):
+        """
+        Returns an idle kernel, starts pool_size kernels if there are none
+        """
+        with self._lock:
+            kernel = None
+
+            while self._idle and kernel is None:
+                kernel = self._idle.pop(0)
+
+                # the kernel might have died while idle
+                if not kernel.is_alive():
+                    self._discard(kernel)
+                    kernel = None
+
+            if kernel is None:
+                kernel = self._start()
+                # start the rest in the background, they will be ready by
+                # the time the next notebook runs
+                self._idle.extend(
+                    self._start()
+                    for _ in range(self.pool_size - self._n_kernels - 1))
+                self._n_kernels = max(self.pool_size, self._n_kernels + 1)
+
+        try:
+            kernel.wait_until_ready(timeout)
+        except BaseException:
+            self._discard(kernel)
+            raise
+
+        return kernel
+
+    def release(self, kernel, failed=False):
+        """
+        Returns a kernel to the pool. Resets it or replaces it with a new
+        one (depending on the reset mode, the number of notebooks it has run
+        and its memory usage). If failed, the kernel is replaced since it
+        might still be running code
+        """
+        kernel.n_tasks += 1
+        recycle = failed or self._closed or self.reset == 'restart'
+
+        if not recycle and (self.max_tasks_per_kernel is not None and
+                            kernel.n_tasks >= self.max_tasks_per_kernel):
+            _logger.debug('Kernel %s reached the task limit', kernel.pid)
+            recycle = True
+
+        if not recycle:
+            try:
+                memory = kernel.reset()
+            except Exception:
+                _logger.exception('Error resetting kernel %s', kernel.pid)
+                recycle = True
+            else:
+                if (self.max_memory_per_kernel is not None
+                        and memory is not None
+                        and memory > self.max_memory_per_kernel):
+                    _logger.debug(
+                        'Kernel %s exceeded the memory limit (%.1f MB)',
+                        kernel.pid, memory)
+                    recycle = True
+
+        # the notebook's client is no longer needed
+        kernel.km.stop_clients()
+
+        if recycle:
+            self._discard(kernel)
+
+            with self._lock:
+                # replace it now, so the next notebook does not have to wait
+                # for the new kernel to start
+                if not self._closed and self._n_kernels < self.pool_size:
+                    self._idle.append(self._start())
+                    self._n_kernels += 1
+        else:
+            with self._lock:
+                if self._closed or len(self._idle) >= self.pool_size:
+                    keep = False
+                else:
+                    self._idle.append(kernel)
+                    keep = True
+
+            if not keep:
+                self._discard(kernel)
+
+    def _discard(self, kernel):
+        with self._lock:
+            self._n_kernels -= 1
+
+        kernel.shutdown()
+
+    def close(self):
+        """Shuts down idle kernels, kernels in use are shut down when released
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+        for kernel in idle:
+            self._discard(kernel)
+
+
+def get_pool(kernel_name, preload):
+    """
+    Returns the pool for the kernelspec and preloaded modules in the current
+    process (creates it if needed)
+    """
+    global _finalizer_pid
+    key = (kernel_name, tuple(preload))
+    pid = os.getpid()
+
+    with _lock:
+        pid_pool = _pools.get(key)
+
+        if pid_pool is None or pid_pool[0] != pid or pid_pool[1]._closed:
+            pid_pool = (pid, KernelPool(kernel_name, preload))
+            _pools[key] = pid_pool
+
+            if _finalizer_pid != pid:
+                # unlike atexit, this also runs when a worker process
+                # (started by fork) exits
+                Finalize(None, close_pools, exitpriority=10)
+                _finalizer_pid = pid
+
+        return pid_pool[1]
+
+
+def close_pools():
+    """Shuts down the kernels started by the current process
+    """
+    with _lock:
+        pid_pools = list(_pools.values())
+        _pools.clear()
+
+    for pid, pool in pid_pools:
+        if pid == os.getpid():
+            pool.close()
+
+
+class KernelPoolEngine(NBClientEngine):
+    """
+    Papermill engine that executes notebooks in kernels from a KernelPool.
+    Takes the following options (passed to papermill.execute_notebook):
+    pool_size, preload, max_tasks_per_kernel, max_memory_per_kernel and
+    reset
+    """
+    @classmethod
+    def execute_managed_notebook(cls,
+                                 nb_man,
+                                 kernel_name,
+                                 pool_size=1,
+                                 preload=None,
+                                 max_tasks_per_kernel=None,
+                                 max_memory_per_kernel=None,
+                                 reset='namespace',
+                                 **kwargs):
+        validate_options(pool_size=pool_size,
+                         preload=preload,
+                         max_tasks_per_kernel=max_tasks_per_kernel,
+                         max_memory_per_kernel=max_memory_per_kernel,
+                         reset=reset)
+
+        pool = get_pool(kernel_name, preload or [])
+        pool.configure(pool_size=pool_size,
+                       max_tasks_per_kernel=max_tasks_per_kernel,
+                       max_memory_per_kernel=max_memory_per_kernel,
+                       reset=reset)
+
+        kernel = pool.acquire(timeout=kwargs.get('start_timeout', 60))
+        failed = True
+
+        try:
+            # kernels start in the directory where the pool started them,
+            # papermill changes the current directory if "cwd" is passed
+            kernel.wait(
+                kernel.execute(f'__import__("os").chdir({os.getcwd()!r})'),
+                timeout=60)
+            output = super().execute_managed_notebook(nb_man,
+                                                      kernel_name,
+                                                      km=kernel.km,
+                                                      **kwargs)
+            failed = False
+        finally:
+            pool.release(kernel, failed=failed)
+
+        return output
+
+
+papermill_engines.register(ENGINE_NAME, KernelPoolEngine)
@@ -53,9 +53,11 @@ import abc
 import logging
 from datetime import datetime
 from collections import defaultdict
+from collections.abc import Mapping
 from pathlib import Path
 
 from ploomber.products import Product, MetaProduct, EmptyProduct, File
+from ploomber.products import _digest
 from ploomber.exceptions import (TaskBuildError, DAGBuildEarlyStop,
                                  CallbackCheckAborted)
 from ploomber.tasks.taskgroup import TaskGroup
@@ -119,6 +121,9 @@ class Task(abc.ABC):
     consistent, optional parameters after "params" are ok
     """
     PRODUCT_CLASSES_ALLOWED = None
+    # tasks that spend most of their time waiting (e.g., on a database or
+    # the network), the Concurrent executor runs them in a thread pool
+    IO_BOUND = False
 
     @abc.abstractmethod
     def run(self):
@@ -201,6 +206,11 @@ class Task(abc.ABC):
         self._on_finish = None
         self._on_failure = None
         self._on_render = None
+        self._resources = {}
+        # set when rendering, see _upstream_unchanged
+        self._check_upstream_digests = False
+        # set when building, see _deferred_step
+        self._defer_steps = False
 
     @property
     def _available_callback_kwargs(self):
@@ -307,6 +317,20 @@ class Task(abc.ABC):
             lineage = up + [task for lineage in lineage_up for task in lineage]
             return set(lineage)
 
+    @property
+    def resources(self):
+        """
+        Resources this task uses while running (e.g., ``{'db': 1,
+        'memory_gb': 16}``). The Parallel executor only runs the task if
+        the resources have capacity left (see ``Parallel(resources=...)``)
+        """
+        return self._resources
+
+    @resources.setter
+    def resources(self, value):
+        self._resources = _validate_resources(value,
+                                              name=f'task {self.name!r}')
+
     @property
     def on_finish(self):
         """
@@ -334,10 +358,11 @@ class Task(abc.ABC):
                                     self._available_callback_kwargs)
             self.on_finish(**kwargs)
 
-    def _post_run_actions(self):
+    def _post_run_actions(self, elapsed=None):
         """
         Call on_finish hook, save metadata, verify products exist and upload
-        product
+        product. ``elapsed`` is the time it took to run the task, it's stored
+        in the metadata
         """
         # run on finish first, if this fails, we don't want to save metadata
         try:
@@ -356,7 +381,8 @@ class Task(abc.ABC):
         else:
             self.product.metadata.update(
                 source_code=str(self.source),
-                params=self.params.to_json_serializable(params_only=True))
+                params=self.params.to_json_serializable(params_only=True),
+                elapsed=elapsed)
 
         # For most Products, it's ok to do this check before
         # saving metadata, but not for GenericProduct, since the way
@@ -524,7 +550,7 @@ class Task(abc.ABC):
         self.product.metadata.clear()
         return res
 
-    def _build(self, catch_exceptions):
+    def _build(self, catch_exceptions, defer_steps=False):
         """
         Private API for building DAGs. This is what executors should call.
         Unlike the public method, this one does not call render, as it
@@ -538,10 +564,17 @@ class Task(abc.ABC):
             exception at the end: [original exception] then
             [exception with context info]. Set it to False when debugging
             tasks to drop-in a debugging session at the failing line.
+
+        defer_steps : bool, default=False
+            If True, the task may skip steps that downstream tasks do not
+            need (see _deferred_step), the executor must run them after the
+            task finishes
         """
+        self._defer_steps = defer_steps
+
         if not catch_exceptions:
             res = self._run()
-            self._post_run_actions()
+            self._post_run_actions(elapsed=_elapsed(res))
             return res, self.product.metadata.to_dict()
         else:
             try:
@@ -580,7 +613,7 @@ class Task(abc.ABC):
 
             if build_success:
                 try:
-                    self._post_run_actions()
+                    self._post_run_actions(elapsed=_elapsed(res))
                 except Exception as e:
                     self.exec_status = TaskStatus.Errored
                     msg = ('Exception when running on_finish '
@@ -649,6 +682,8 @@ class Task(abc.ABC):
         _ensure_parents_exist(self.product)
 
         if self.exec_status == TaskStatus.WaitingDownload:
+            cache = None if self.dag._params.product_cache is None else ''
+
             try:
                 self.product.download()
             except Exception as e:
@@ -657,10 +692,21 @@ class Task(abc.ABC):
                     f'from task {self!r}. Check the full traceback above for '
                     'details') from e
 
+        elif self._upstream_unchanged():
+            self._logger.info(
+                'Upstream products of %s did not change, skipping '
+                'execution', self.name)
+            cache = None if self.dag._params.product_cache is None else ''
+
+            return TaskReport.with_data(name=self.name,
+                                        ran=False,
+                                        elapsed=0,
+                                        cache=cache)
+
         # NOTE: should we validate status here?
         # (i.e., check it's WaitingExecution)
         else:
-            self.run()
+            cache = self._run_with_cache()
 
         now = datetime.now()
 
@@ -673,7 +719,75 @@ class Task(abc.ABC):
         # exist, timestamp must be recent equal to the datetime.now()
         # used. maybe run fetch metadata again and validate?
 
-        return TaskReport.with_data(name=self.name, ran=True, elapsed=elapsed)
+        return TaskReport.with_data(name=self.name,
+                                    ran=True,
+                                    elapsed=elapsed,
+                                    cache=cache)
+
+    def _upstream_unchanged(self):
+        """
+        When outdated_by_digest is enabled, tasks whose only reason to run
+        is that an upstream task needs to run are still marked for execution
+        when rendering (we don't know the new upstream contents yet). Once
+        the upstream tasks finish, we compare their digests with the ones
+        stored in the product's metadata, returns True if none of them
+        changed (hence, the task does not have to run)
+        """
+        if not self._check_upstream_digests or not self.product.exists():
+            return False
+
+        stored = self.product.metadata.upstream_digests or {}
+        current = _digest.upstream_digests(self)
+
+        if not current or set(stored) != set(current):
+            return False
+
+        return all(
+            _digest.upstream_changed(self.product.metadata, name, digest) is
+            False for name, digest in current.items())
+
+    def _deferred_step(self):
+        """
+        Returns a function that runs the steps this task skipped when built
+        with defer_steps=True, or None if there aren't any. Executors call
+        it in the main process (in a background thread) after the task
+        finishes
+        """
+        return None
+
+    def _run_with_cache(self):
+        """
+        Calls run() or copies the products from the product cache (if
+        enabled). Returns the cache result: 'hit', 'miss', '' (task cannot
+        be cached) or None (cache disabled)
+        """
+        cache = self.dag._params.product_cache
+
+        if cache is None:
+            self.run()
+            return None
+
+        key = cache.key(self)
+
+        if key is None:
+            self.run()
+            return ''
+
+        if cache.restore(key, self.product):
+            self._logger.info('Restored products for %s from cache',
+                              self.name)
+            return 'hit'
+
+        self.run()
+
+        try:
+            cache.store(key, self.product)
+        except Exception:
+            # missing products are reported in _post_run_actions
+            self._logger.exception('Error storing products from %s in cache',
+                                   self.name)
+
+        return 'miss'
 
     def render(self, force=False, outdated_by_code=True, remote=False):
         """
@@ -785,6 +899,15 @@ class Task(abc.ABC):
                 else:
                     self._exec_status = TaskStatus.Skipped
 
+        # the task may be outdated only because of its upstream dependencies,
+        # if so, check their digests before running it
+        self._check_upstream_digests = (
+            _digest.enabled(self) and not force and bool(self.upstream)
+            and self._exec_status
+            in {TaskStatus.WaitingExecution, TaskStatus.WaitingUpstream}
+            and not (outdated_by_code
+                     and self.product._outdated_code_dependency()))
+
         self._run_on_render()
 
     def set_upstream(self, other, group_name=None):
@@ -996,6 +1119,28 @@ class Task(abc.ABC):
             type(self).__name__))
 
 
+def _validate_resources(resources, name):
+    """
+    Validates a mapping of resource names to amounts (e.g., the resources a
+    task uses or the resources available to an executor), returns a copy
+    """
+    if resources is None:
+        return {}
+
+    if not isinstance(resources, Mapping):
+        raise TypeError(f'resources for {name} must be a dictionary, '
+                        f'got: {resources!r}')
+
+    for key, amount in resources.items():
+        if (not isinstance(key, str) or isinstance(amount, bool)
+                or not isinstance(amount, (int, float)) or amount < 0):
+            raise ValueError(f'Invalid resources for {name}: keys must be '
+                             'strings and values non-negative numbers, '
+                             f'got: {key!r}: {amount!r}')
+
+    return dict(resources)
+
+
 def _doc_short(doc):
     if doc is not None:
         return doc.split('\n')[0]
@@ -1026,6 +1171,16 @@ class ProductEvaluator:
         return self._is_outdated
 
 
+def _elapsed(report):
+    """
+    Returns the time to store in the product's metadata, None if the task
+    did not run its code (skipped because its upstream products did not
+    change or restored from the product cache), so the stored one is kept
+    """
+    hit = 'Cache' in report.columns and report['Cache'] == 'hit'
+    return report['Elapsed (s)'] if report['Ran?'] and not hit else None
+
+
 def _ensure_parents_exist(product):
     if isinstance(product, MetaProduct):
         for prod in product:
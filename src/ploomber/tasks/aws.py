@@ -22,6 +22,8 @@ class UploadToS3(Task):
     bucket: str
         Bucked to upload
     """
+    IO_BOUND = True
+
     def __init__(self,
                  source,
                  product,
@@ -8,6 +8,7 @@ from subprocess import PIPE
 from pathlib import Path, PurePosixPath
 from importlib.util import find_spec
 import warnings
+from copy import deepcopy
 
 import jupytext
 import nbformat
@@ -37,10 +38,14 @@ from ploomber.sources import NotebookSource
 from ploomber.sources.notebooksource import _cleanup_rendered_nb
 from ploomber.products import File, MetaProduct
 from ploomber.tasks.abc import Task
+from ploomber.tasks import _inprocess
 from ploomber.util import chdir_code
 from ploomber.io import FileLoaderMixin, pretty_print, _validate
 from ploomber.util._sys import _python_bin
 
+# name of the engine in ploomber.tasks._kernel_pool (imported when used)
+_KERNEL_POOL = 'kernel_pool'
+
 
 # TODO: ensure that all places where we call this function are unit tested
 def _write_text_utf_8(path, text):
@@ -458,7 +463,10 @@ class NotebookRunner(NotebookMixin, Task):
         to the papermill.execute_notebook function, by default, "product"
         and "upstream" are included
     papermill_params : dict, optional
-        Other parameters passed to papermill.execute_notebook, defaults to None
+        Other parameters passed to papermill.execute_notebook, defaults to
+        None. Pass ``engine_name: kernel_pool`` to execute the notebook in a
+        kernel that is kept running and reused by other notebooks (see the
+        example below)
     kernelspec_name: str, optional
         Kernelspec name to use, if the file extension provides with enough
         information to choose a kernel or the notebook already includes
@@ -504,6 +512,23 @@ class NotebookRunner(NotebookMixin, Task):
         If 'now', runs notebook in debug mode, this will start debugger if an
         error is thrown. If 'later', it will serialize the traceback for later
         debugging. (Added in 0.20)
+    executor : 'papermill' or 'inprocess', default='papermill'
+        If 'inprocess', the notebook cells are executed in the current
+        process (a worker process if using the ``Parallel`` executor)
+        instead of a Jupyter kernel. Only Python notebooks are supported,
+        IPython magics are not. The output notebook includes the cells'
+        stdout, stderr and the value of the last expression (but not other
+        outputs, such as plots). ``papermill_params`` are ignored.
+        (Added in 0.21.8)
+    defer_conversion : bool, default=False
+        If True, converting the output notebook to other formats (e.g.,
+        HTML) happens in a background thread after the task finishes, so
+        downstream tasks start as soon as the notebook is executed. The
+        ``Serial``, ``Parallel`` and ``Concurrent`` executors support it
+        (otherwise, the notebook is converted when the task runs). If the
+        conversion fails, the build fails and the task runs again in the
+        next build. Ignored if ``product_cache`` is enabled.
+        (Added in 0.21.8)
 
     Examples
     --------
@@ -560,6 +585,53 @@ class NotebookRunner(NotebookMixin, Task):
                 # must be generated by nb.ipynb
                 data: data.csv
 
+    Spec API (reuse kernels, added in ``0.21.8``):
+
+    (starting a kernel and importing heavy libraries can take longer than
+    running a short notebook, the ``kernel_pool`` engine keeps the kernels
+    running and executes the next notebooks in them, it works with the
+    ``Serial`` and ``Parallel`` executors, where each worker process keeps
+    its own kernels)
+
+    .. code-block:: yaml
+        :class: text-editor
+        :name: pipeline-yaml
+
+        tasks:
+          - source: nb.ipynb
+            product: report.html
+            papermill_params:
+              engine_name: kernel_pool
+              # number of kernels to keep running (per kernelspec)
+              pool_size: 1
+              # modules to import when each kernel starts
+              preload: [pandas, sklearn]
+              # after each notebook, delete its variables ('namespace', the
+              # imported modules remain loaded) or restart the kernel
+              # ('restart')
+              reset: namespace
+              # replace the kernel after running 50 notebooks or when its
+              # peak memory usage exceeds 2000 MB
+              max_tasks_per_kernel: 50
+              max_memory_per_kernel: 2000
+
+    Spec API (convert to HTML after the task finishes, added in ``0.21.8``):
+
+    (downstream tasks only wait for ``data.csv`` and ``nb.ipynb``)
+
+    .. code-block:: yaml
+        :class: text-editor
+        :name: pipeline-yaml
+
+        tasks:
+          - source: script.py
+            nb_product_key: [nb_ipynb, nb_html]
+            defer_conversion: true
+            product:
+                nb_ipynb: nb.ipynb
+                nb_html: report.html
+                data: data.csv
+
     Python API:
 
     >>> from pathlib import Path
@@ -671,7 +743,9 @@ class NotebookRunner(NotebookMixin, Task):
                  nbconvert_export_kwargs=None,
                  local_execution=False,
                  check_if_kernel_installed=True,
-                 debug_mode=None):
+                 debug_mode=None,
+                 executor='papermill',
+                 defer_conversion=False):
         self.papermill_params = papermill_params or {}
         self.nbconvert_export_kwargs = nbconvert_export_kwargs or {}
         self.kernelspec_name = kernelspec_name
@@ -681,6 +755,13 @@ class NotebookRunner(NotebookMixin, Task):
         self.local_execution = local_execution
         self.check_if_kernel_installed = check_if_kernel_installed
         self.debug_mode = debug_mode
+        self.executor = _validate.is_in(executor, {'papermill', 'inprocess'},
+                                        'executor')
+        self.defer_conversion = defer_conversion
+
+        if executor == 'inprocess' and debug_mode:
+            raise ValueError('"debug_mode" is not supported when '
+                             'executor=\'inprocess\'')
 
         if 'cwd' in self.papermill_params and self.local_execution:
             raise KeyError('If local_execution is set to True, "cwd" should '
@@ -691,7 +772,25 @@ class NotebookRunner(NotebookMixin, Task):
             raise ValueError('Engine should not appear in "papermill_params" '
                              'when "debug_mode" is enabled')
 
-        kwargs = dict(hot_reload=dag._params.hot_reload)
+        engine_name = self.papermill_params.get('engine_name')
+
+        if engine_name == _KERNEL_POOL:
+            # imported here since it is optional and it requires recent
+            # versions of jupyter_client and jupyter_core
+            from ploomber.tasks import _kernel_pool
+
+            if debug_mode:
+                raise ValueError(f'Cannot use {_kernel_pool.ENGINE_NAME!r} '
+                                 'engine when "debug_mode" is enabled')
+
+            _kernel_pool.validate_options(**{
+                key: value
+                for key, value in self.papermill_params.items()
+                if key in _kernel_pool.OPTIONS
+            })
+
+        kwargs = dict(hot_reload=dag._params.hot_reload,
+                      notebook_cache=dag._params.notebook_cache)
         self._source = NotebookRunner._init_source(source, kwargs, ext_in,
                                                    kernelspec_name,
                                                    static_analysis,
@@ -809,29 +908,41 @@ class NotebookRunner(NotebookMixin, Task):
         path_to_out = Path(str(nb_product))
         path_to_out_ipynb = path_to_out.with_suffix('.ipynb')
 
-        fd, tmp = tempfile.mkstemp('.ipynb')
-        os.close(fd)
-
-        tmp = Path(tmp)
-        _write_text_utf_8(tmp, self.source.nb_str_rendered)
-
-        if self.local_execution:
-            self.papermill_params['cwd'] = str(self.source.loc.parent)
-
-        # use our custom engine
-        if self.debug_mode == 'now':
-            self.papermill_params['engine_name'] = 'debug'
-        elif self.debug_mode == 'later':
-            self.papermill_params['engine_name'] = 'debuglater'
-            self.papermill_params['path_to_dump'] = f'{self.name}.dump'
-
         # create parent folders if they don't exist
         Path(path_to_out_ipynb).parent.mkdir(parents=True, exist_ok=True)
 
+        if self.executor == 'inprocess':
+            tmp = None
+        else:
+            fd, tmp = tempfile.mkstemp('.ipynb')
+            os.close(fd)
+
+            tmp = Path(tmp)
+            _write_text_utf_8(tmp, self.source.nb_str_rendered)
+
+            if self.local_execution:
+                self.papermill_params['cwd'] = str(self.source.loc.parent)
+
+            # use our custom engine
+            if self.debug_mode == 'now':
+                self.papermill_params['engine_name'] = 'debug'
+            elif self.debug_mode == 'later':
+                self.papermill_params['engine_name'] = 'debuglater'
+                self.papermill_params['path_to_dump'] = f'{self.name}.dump'
+            elif self.papermill_params.get('engine_name') == _KERNEL_POOL:
+                # importing the module registers the engine (this may run
+                # in a worker process)
+                from ploomber.tasks import _kernel_pool  # noqa
+
         try:
-            # no need to pass parameters, they are already there
-            pm.execute_notebook(str(tmp), str(path_to_out_ipynb),
-                                **self.papermill_params)
+            if tmp is None:
+                _run_notebook_in_process(self.source, self.name,
+                                         path_to_out_ipynb,
+                                         self.local_execution)
+            else:
+                # no need to pass parameters, they are already there
+                pm.execute_notebook(str(tmp), str(path_to_out_ipynb),
+                                    **self.papermill_params)
         except Exception as e:
             # upload partially executed notebook if there's a clint
             if nb_product.client:
@@ -851,7 +962,8 @@ class NotebookRunner(NotebookMixin, Task):
                     ' executed notebook '
                     f'available at {str(path_to_out_ipynb)}', self) from e
         finally:
-            tmp.unlink()
+            if tmp is not None:
+                tmp.unlink()
 
         # on windows, Path.rename will throw an error if the file exists
         if path_to_out_ipynb != path_to_out and path_to_out.is_file():
@@ -863,11 +975,49 @@ class NotebookRunner(NotebookMixin, Task):
 
         path_to_out_ipynb.rename(path_to_out)
 
+        # the executor converts the notebook after the task finishes
+        if not (self._defer_steps and self._defers_conversion()):
+            self._convert()
+
+    def _converters(self):
         if isinstance(self._converter, list):
-            for _converter in self._converter:
-                _converter.convert()
+            return self._converter
         else:
-            self._converter.convert()
+            return [self._converter]
+
+    def _convert(self):
+        for _converter in self._converters():
+            _converter.convert()
+
+    def _defers_conversion(self):
+        # products are stored in the cache right after the task runs
+        return (self.defer_conversion
+                and self.dag._params.product_cache is None
+                and any(c._exporter is not None for c in self._converters()))
+
+    def _deferred_step(self):
+        if self._defers_conversion():
+            return self._convert_deferred
+
+    def _convert_deferred(self):
+        try:
+            self._convert()
+        except Exception as e:
+            raise TaskBuildError('Error converting the output notebook of '
+                                 f'task {self.name!r}') from e
+
+        # products were uploaded before converting them, upload the
+        # converted ones again
+        converted = {
+            Path(c._path_to_output).resolve()
+            for c in self._converters() if c._exporter is not None
+        }
+        products = (self.product if isinstance(self.product, MetaProduct)
+                    else [self.product])
+
+        for product in products:
+            if Path(str(product)).resolve() in converted:
+                product.upload()
 
 
 class ScriptRunner(NotebookMixin, Task):
@@ -877,6 +1027,15 @@ class ScriptRunner(NotebookMixin, Task):
     it also works by injecting a cell into the source code. Source can be
     a ``.py`` script or an ``.ipynb`` notebook. **Does not support magics.**
 
+    Parameters
+    ----------
+    executor : 'subprocess' or 'inprocess', default='subprocess'
+        If 'subprocess', the code runs in a new process (Python or R). If
+        'inprocess', Python code runs in the current process (a worker
+        process if using the ``Parallel`` executor), which avoids starting
+        an interpreter (and importing the same modules) on each run.
+        (Added in 0.21.8)
+
     Examples
     --------
 
@@ -915,11 +1074,16 @@ class ScriptRunner(NotebookMixin, Task):
         ext_in=None,
         static_analysis='regular',
         local_execution=False,
+        executor='subprocess',
     ):
         self.ext_in = ext_in
         self.local_execution = local_execution
+        self.executor = _validate.is_in(executor,
+                                        {'subprocess', 'inprocess'},
+                                        'executor')
 
-        kwargs = dict(hot_reload=dag._params.hot_reload)
+        kwargs = dict(hot_reload=dag._params.hot_reload,
+                      notebook_cache=dag._params.notebook_cache)
         self._source = ScriptRunner._init_source(source, kwargs, ext_in,
                                                  static_analysis, False, False)
         super().__init__(product, dag, name, params)
@@ -953,13 +1117,26 @@ class ScriptRunner(NotebookMixin, Task):
         else:
             cwd = None
 
+        sources = [
+            c['source'] for c in self.source.nb_obj_rendered.cells
+            if c['cell_type'] == 'code'
+        ]
+
+        if self.executor == 'inprocess':
+            _check_python(self.source, 'ScriptRunner')
+
+            try:
+                _inprocess.run_cells(sources, name=self.name, cwd=cwd)
+            except _inprocess.CellExecutionError as e:
+                raise TaskBuildError('Error when executing task'
+                                     f' {self.name!r}.') from e
+
+            return
+
         fd, tmp = tempfile.mkstemp('.py')
         os.close(fd)
 
-        code = '\n\n'.join([
-            c['source'] for c in self.source.nb_obj_rendered.cells
-            if c['cell_type'] == 'code'
-        ])
+        code = '\n\n'.join(sources)
 
         tmp = Path(tmp)
         tmp.write_text(code)
@@ -981,6 +1158,41 @@ class ScriptRunner(NotebookMixin, Task):
             tmp.unlink()
 
 
+def _check_python(source, task_class):
+    if source.language != 'python':
+        raise ValueError(f"{task_class} with executor='inprocess' only "
+                         "works with Python code")
+
+
+def _run_notebook_in_process(source, name, path_to_out, local_execution):
+    """
+    Executes the rendered notebook in the current process and stores it
+    (with the cells' outputs) in path_to_out, the notebook is stored even
+    if any cell fails
+    """
+    _check_python(source, 'NotebookRunner')
+
+    nb = deepcopy(source.nb_obj_rendered)
+    cells = [c for c in nb.cells if c['cell_type'] == 'code']
+    cwd = str(source.loc.parent) if local_execution else None
+    outputs = []
+
+    try:
+        outputs = _inprocess.run_cells([c['source'] for c in cells],
+                                       name=name,
+                                       cwd=cwd,
+                                       capture=True)
+    except _inprocess.CellExecutionError as e:
+        outputs = e.outputs
+        raise
+    finally:
+        for index, cell_outputs in enumerate(outputs):
+            cells[index]['outputs'] = cell_outputs
+            cells[index]['execution_count'] = index + 1
+
+        _write_text_utf_8(path_to_out, nbformat.writes(nb))
+
+
 def _run_script_in_subprocess(interpreter, path, cwd):
     res = subprocess.run([interpreter, str(path)], cwd=cwd, stderr=PIPE)
 
@@ -1,14 +1,20 @@
 from pathlib import Path
-from io import StringIO
+from numbers import Number
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from collections.abc import Mapping
 
 from jinja2 import Template
 
 from ploomber.tasks.abc import Task
 from ploomber.tasks.mixins import ClientMixin
+from ploomber.tasks import _bulk
 from ploomber.sources import (SQLScriptSource, SQLQuerySource, FileSource)
 from ploomber.products import (File, PostgresRelation, SQLiteRelation,
                                GenericSQLRelation, GenericProduct, SQLRelation)
 from ploomber import io
+from ploomber.io._background import BackgroundWriter
+from ploomber.io.file import _empty_table
 from ploomber.util import requires
 from ploomber.placeholders.placeholder import _add_globals
 from ploomber.exceptions import SQLTaskBuildError
@@ -94,6 +100,7 @@ class SQLScript(ClientMixin, Task):
     """
     PRODUCT_CLASSES_ALLOWED = (PostgresRelation, SQLiteRelation,
                                GenericSQLRelation, SQLRelation)
+    IO_BOUND = True
 
     def __init__(self,
                  source,
@@ -121,10 +128,15 @@ class SQLScript(ClientMixin, Task):
         source_code = str(self.source)
 
         try:
-            return self.client.execute(source_code)
+            timings = self.client.execute(source_code)
         except Exception as e:
             raise SQLTaskBuildError(type(self), source_code, e) from e
 
+        # SQLAlchemyClient and DBAPIClient return the time it took to run
+        # each statement (or batch)
+        if isinstance(timings, list):
+            _log_timings(self._logger, self.name, timings)
+
     def load(self, limit=10):
         """Load this task's product in a pandas.DataFrame
 
@@ -173,7 +185,22 @@ class SQLDump(io.FileLoaderMixin, ClientMixin, Task):
         io handler to use (which controls the output format), currently
         only csv and parquet are supported. If None, it tries to infer the
         handler from the product's extension if that doesn't work, it uses
-        io.CSVIO
+        io.CSVIO. Use ploomber.io.ParquetRowGroupIO to write all chunks to
+        a single parquet file
+    write_queue_size: int, optional
+        If not None (and chunksize is not None), chunks are written to disk
+        in a background thread while the next ones are fetched from the
+        database. This is the maximum number of chunks waiting to be written
+        (fetching blocks until the writer catches up)
+    partitions: list or dict, optional
+        Splits the query in partitions that are dumped at the same time, each
+        one over its own connection. Either a list of SQL predicates or a
+        dictionary with a numeric column and the number of partitions (e.g.,
+        ``{'column': 'id', 'n': 4}``), in which case the column's range is
+        split in n equal ranges (null values go to the last one). The query
+        must have a ``{{partition}}`` placeholder where the predicate goes
+        (e.g., ``SELECT * FROM table WHERE {{partition}}``). The product is
+        a directory with files named {partition}-{chunk}.{extension}
 
     Examples
     --------
@@ -227,12 +254,21 @@ class SQLDump(io.FileLoaderMixin, ClientMixin, Task):
     network trip, but this is driver-dependent, not all drivers implement
     this (cx_Oracle does it)
 
+    To open a connection per partition, the client must be a DBAPIClient or
+    a SQLAlchemyClient. Using a database file (e.g., SQLite) does not speed
+    up the dump since there is a single reader
+
+    When dumping to parquet, if the cursor returns data in Arrow format
+    (it has a fetch_record_batch method, like DuckDB and ADBC drivers),
+    batches are written directly, without converting them to Python objects
+
     See Also
     --------
     ploomber.clients.SQLScript :
         A task to execute a SQL script and create a table/view as product
     """
     PRODUCT_CLASSES_ALLOWED = (File, GenericProduct)
+    IO_BOUND = True
 
     def __init__(self,
                  source,
@@ -242,15 +278,31 @@ class SQLDump(io.FileLoaderMixin, ClientMixin, Task):
                  client=None,
                  params=None,
                  chunksize=10000,
-                 io_handler=None):
+                 io_handler=None,
+                 write_queue_size=None,
+                 partitions=None):
         params = params or {}
 
+        if partitions is not None:
+            _validate_partitions(partitions)
+
+            if 'partition' in params:
+                raise ValueError('"partition" is a reserved parameter name '
+                                 'when passing partitions to SQLDump')
+
+            # keep the placeholder until runtime, where it's replaced by
+            # each partition's predicate (rendering fails if the source does
+            # not use it)
+            params = {**params, 'partition': '[[partition]]'}
+
         kwargs = dict(hot_reload=dag._params.hot_reload)
         self._source = type(self)._init_source(source, kwargs)
         super().__init__(product, dag, name, params)
 
         self._client = client
         self.chunksize = chunksize
+        self.write_queue_size = write_queue_size
+        self.partitions = partitions
 
         if io_handler is None:
             if self.product._identifier._raw.endswith('.parquet'):
@@ -271,20 +323,100 @@ class SQLDump(io.FileLoaderMixin, ClientMixin, Task):
                             variable_start_string='[[',
                             variable_end_string=']]')
         _add_globals(template.environment)
-        source_code = template.render(upstream=self.params.get('upstream'))
-
         path = Path(str(self.params['product']))
+
+        if self.partitions is not None:
+            self._dump_partitions(template, path)
+            return
+
+        source_code = template.render(upstream=self.params.get('upstream'))
         handler = self.io_handler(path, chunked=bool(self.chunksize))
+        self._dump(self.client.connection, source_code, handler)
 
+    def _dump(self, connection, source_code, handler):
         self._logger.debug('Code: %s', source_code)
 
-        cursor = self.client.connection.cursor()
+        cursor = connection.cursor()
 
         try:
             cursor.execute(source_code)
         except Exception as e:
             raise SQLTaskBuildError(type(self), source_code, e) from e
 
+        arrow = (hasattr(handler, 'write_table')
+                 and hasattr(cursor, 'fetch_record_batch'))
+
+        if self.chunksize and self.write_queue_size:
+            # write chunks while fetching the next ones
+            handler = BackgroundWriter(handler, self.write_queue_size)
+
+        try:
+            if arrow:
+                self._dump_arrow(cursor, handler)
+            else:
+                self._dump_rows(cursor, handler)
+        finally:
+            # custom handlers may not implement close
+            if hasattr(handler, 'close'):
+                handler.close()
+
+        cursor.close()
+
+    def _dump_partitions(self, template, path):
+        upstream = self.params.get('upstream')
+
+        def render(partition):
+            return template.render(upstream=upstream, partition=partition)
+
+        if isinstance(self.partitions, Mapping):
+            predicates = self._range_predicates(render('1 = 1'))
+        else:
+            predicates = list(self.partitions)
+
+        handler = self.io_handler(path, chunked=True)
+
+        if not hasattr(handler, 'partition'):
+            raise TypeError(f'{type(handler).__name__} does not support '
+                            'partitions, it must implement a partition '
+                            'method')
+
+        # one thread per partition, each one opens its own connection (some
+        # drivers do not allow sharing connections across threads)
+        with ThreadPoolExecutor(max_workers=len(predicates)) as executor:
+            futures = [
+                executor.submit(self._dump_partition, render(predicate),
+                                handler.partition(i))
+                for i, predicate in enumerate(predicates)
+            ]
+
+            for future in futures:
+                future.result()
+
+    def _dump_partition(self, source_code, handler):
+        connection = _open_connection(self.client)
+
+        try:
+            self._dump(connection, source_code, handler)
+        finally:
+            connection.close()
+
+    def _range_predicates(self, source_code):
+        column, n = self.partitions['column'], self.partitions['n']
+        query = source_code.strip().rstrip(';')
+        cursor = self.client.connection.cursor()
+
+        try:
+            cursor.execute(f'SELECT MIN({column}), MAX({column}) '
+                           f'FROM ({query}) AS partitions')
+            low, high = cursor.fetchone()
+        except Exception as e:
+            raise SQLTaskBuildError(type(self), query, e) from e
+        finally:
+            cursor.close()
+
+        return _range_predicates(column, low, high, n)
+
+    def _dump_rows(self, cursor, handler):
         if self.chunksize:
             i = 1
             headers = None
@@ -304,20 +436,138 @@ class SQLDump(io.FileLoaderMixin, ClientMixin, Task):
                 handler.write(data, headers)
 
                 i = i + 1
+
+            # no rows, parquet files are written even if there is no data
+            # (same as when fetching in Arrow format)
+            if i == 1 and hasattr(handler, 'write_table'):
+                handler.write_table(_empty_table(headers))
         else:
             data = cursor.fetchall()
             headers = [c[0] for c in cursor.description]
             handler.write(data, headers)
 
-        cursor.close()
+    def _dump_arrow(self, cursor, handler):
+        """
+        Fetches data in Arrow format (e.g., DuckDB and ADBC cursors), this
+        skips the conversion from Python objects
+        """
+        if self.chunksize:
+            try:
+                reader = cursor.fetch_record_batch(self.chunksize)
+            except TypeError:
+                # ADBC cursors do not take the batch size
+                reader = cursor.fetch_record_batch()
+
+            empty = True
+
+            for i, batch in enumerate(reader, start=1):
+                self._logger.info('Fetched chunk {}'.format(i))
+                handler.write_table(batch)
+                empty = False
+
+            if empty:
+                handler.write_table(reader.schema.empty_table())
+        else:
+            handler.write_table(cursor.fetch_arrow_table())
+
+
+def _log_timings(logger, name, timings, n=3):
+    """Logs the time it took to run each statement and the n slowest ones
+    """
+    for timing in timings:
+        logger.debug('Statement %i in %s took %.3f seconds: %s', timing.index,
+                     name, timing.elapsed, timing.statement)
+
+    if len(timings) > 1:
+        slowest = sorted(timings, key=lambda t: t.elapsed, reverse=True)[:n]
+        summary = '\n'.join(
+            f'{timing.elapsed:.3f}s (statement {timing.index}): '
+            f'{_first_line(timing.statement)}' for timing in slowest)
+        logger.info('Slowest statements in %s:\n%s', name, summary)
+
+
+def _first_line(statement, max_length=80):
+    line = statement.strip().splitlines()[0] if statement.strip() else ''
+    return line if len(line) <= max_length else line[:max_length - 3] + '...'
+
+
+def _validate_partitions(partitions):
+    if isinstance(partitions, Mapping):
+        if set(partitions) != {'column', 'n'}:
+            raise ValueError('partitions must have keys "column" and "n", '
+                             f'got: {partitions!r}')
+
+        n = partitions['n']
+
+        if not isinstance(n, int) or isinstance(n, bool) or n < 1:
+            raise ValueError('partitions["n"] must be an integer greater '
+                             f'than zero, got: {n!r}')
+    elif isinstance(partitions, (list, tuple)):
+        if not partitions or not all(
+                isinstance(predicate, str) for predicate in partitions):
+            raise ValueError('partitions must be a non-empty list of '
+                             f'str (SQL predicates), got: {partitions!r}')
+    else:
+        raise TypeError('partitions must be a list of SQL predicates or a '
+                        'dictionary with keys "column" and "n", got: '
+                        f'{partitions!r}')
+
+
+def _range_predicates(column, low, high, n):
+    """
+    Splits the [low, high] range of column in n ranges, returns a list of
+    SQL predicates (the last one also matches null values)
+    """
+    if low is None or high is None:
+        # no rows or all values are null
+        return ['1 = 1']
+
+    for value in (low, high):
+        if not isinstance(value, Number) or isinstance(value, bool):
+            raise TypeError('The partitions column must be numeric, got '
+                            f'value {value!r} for column {column!r}. Pass '
+                            'a list of predicates instead')
+
+    if isinstance(low, int) and isinstance(high, int):
+        edges = [low + (high - low) * i // n for i in range(n + 1)]
+    else:
+        edges = [low + (high - low) * i / n for i in range(n + 1)]
+
+    predicates = []
+
+    for i in range(n):
+        last = i == n - 1
+        upper = '<=' if last else '<'
+        predicate = (f'{column} >= {edges[i]} AND '
+                     f'{column} {upper} {edges[i + 1]}')
+
+        if last:
+            predicate = f'({predicate}) OR {column} IS NULL'
+
+        predicates.append(f'({predicate})')
+
+    return predicates
+
+
+def _open_connection(client):
+    """
+    Opens a new connection (instead of using client.connection) so each
+    partition in SQLDump has its own
+    """
+    if hasattr(client, 'connect_fn'):
+        return client.connect_fn(**client.connect_kwargs)
+    elif hasattr(client, 'engine'):
+        return client.engine.raw_connection()
+
+    raise TypeError('Dumping partitions requires a DBAPIClient or a '
+                    f'SQLAlchemyClient, got: {type(client).__name__}')
 
 
-# FIXME: this can be a lot faster for clients that transfer chunksize
-# rows over the network
 class SQLTransfer(ClientMixin, Task):
     """
-    Transfers data from a SQL database to another (Note: this relies on
-    pandas, only use it for small to medium size datasets)
+    Transfers data from a SQL database to another. Rows are streamed in
+    batches from the source cursor to the destination, so memory usage does
+    not depend on the size of the table
 
     Parameters
     ----------
@@ -332,7 +582,7 @@ class SQLTransfer(ClientMixin, Task):
         A DAG to add this task to
     name: str
         A str to indentify this task. Should not already exist in the dag
-    client: ploomber.clients.SQLAlchemyClient, optional
+    client: ploomber.clients.{SQLAlchemyClient, DBAPIClient}, optional
         The client used to connect to the database. Only required
         if no dag-level client has been declared using dag.clients[class]
     params: dict, optional
@@ -347,14 +597,18 @@ class SQLTransfer(ClientMixin, Task):
 
     Notes
     ----
-    This task is *not* intended to move large datasets, but a
-    convenience way of transfering small to medium size datasets. It relies
-    on pandas to read and write, which introduces a considerable overhead.
+    The destination table is replaced. Column types are taken from the
+    source cursor's description when the driver reports them (psycopg2) or
+    inferred from the first chunk otherwise (e.g., sqlite3)
+
+    Rows are inserted in a single transaction, using COPY if the destination
+    is PostgreSQL (psycopg2), and multi-row INSERT ... VALUES statements
+    otherwise
     """
     PRODUCT_CLASSES_ALLOWED = (PostgresRelation, SQLiteRelation,
                                GenericSQLRelation)
+    IO_BOUND = True
 
-    @requires(['pandas'], 'SQLTransfer')
     def __init__(self,
                  source,
                  product,
@@ -376,34 +630,37 @@ class SQLTransfer(ClientMixin, Task):
         return SQLQuerySource(source, **kwargs)
 
     def run(self):
-        import pandas as pd
-
         source_code = str(self.source)
         product = self.params['product']
 
         # read from source_code, use connection from the Task
         self._logger.info('Fetching data...')
-        dfs = pd.read_sql_query(source_code,
-                                self.client.engine,
-                                chunksize=self.chunksize)
-        self._logger.info('Done fetching data...')
+        cursor = self.client.connection.cursor()
+
+        try:
+            cursor.execute(source_code)
+        except Exception as e:
+            raise SQLTaskBuildError(type(self), source_code, e) from e
+
+        try:
+            cursor.arraysize = self.chunksize
+            batches = iter(lambda: cursor.fetchmany(self.chunksize), [])
+            first = next(batches, [])
+
+            names = [column[0] for column in cursor.description]
+            types = _bulk.column_types(cursor, first)
 
-        for i, df in enumerate(dfs):
-            self._logger.info('Storing chunk {i}...'.format(i=i))
-            df.to_sql(name=product.name,
-                      con=product.client.engine,
-                      schema=product.schema,
-                      if_exists='replace' if i == 0 else 'append',
-                      index=False)
+            _bulk.load(product.client, product, names, types,
+                       chain([first], batches), self._logger)
+        finally:
+            cursor.close()
 
 
 class SQLUpload(ClientMixin, Task):
     """
-    Upload data to a SQL database from a parquet or a csv file. Note: this
-    task relies uses pandas.to_sql which introduces some overhead. Only use it
-    for small to medium size datasets. Each database usually come with a tool
-    to upload data efficiently. If you are using PostgreSQL, check out the
-    PostgresCopyFrom task.
+    Upload data to a SQL database from a parquet or a csv file. The file is
+    read in chunks and uploaded in a single transaction with COPY
+    (PostgreSQL) or multi-row INSERT ... VALUES statements (other databases)
 
     Parameters
     ----------
@@ -435,26 +692,37 @@ class SQLUpload(ClientMixin, Task):
         refer to jinja2 documentation for details
 
     chunksize : int, optional
-        Number of rows to transfer on every chunk
+        Number of rows to read and upload on every chunk, defaults to 50000
 
     io_handler : callable, optional
-        A Python callable to read the source file,
-        if None, it will tried to be inferred from the source file extension
+        A Python callable to read the source file (it must return a
+        pandas.DataFrame), if None, it will tried to be inferred from the
+        source file extension. Passing a function implies method="pandas"
 
     to_sql_kwargs : dict, optional
         Keyword arguments passed to the pandas.DataFrame.to_sql function,
         one useful parameter is "if_exists", which determines if the
         task should fail ("fail"), the relation should be replaced
-        ("replace") or rows appended ("append").
+        ("replace") or rows appended ("append"). Bulk loading methods only
+        support "if_exists" and index=False, passing other arguments
+        implies method="pandas"
+
+    method : str, optional
+        How to upload the data: "copy" (PostgreSQL with psycopg2),
+        "executemany", "values" (multi-row INSERT ... VALUES statements)
+        or "pandas" (read the whole file and call pandas.DataFrame.to_sql).
+        If None, it is selected based on the database
 
     Notes
     -----
-    This task is *not* intended to move large datasets, but a
-    convenience way of transfering small to medium size datasets. It relies
-    on pandas to read and write, which introduces a considerable overhead.
+    The selected method is logged when running the task. Bulk loading
+    methods create the table using the types in the parquet file, or the
+    ones inferred from the first chunk for csv files, and they do not
+    upload the pandas index
     """
     PRODUCT_CLASSES_ALLOWED = (PostgresRelation, SQLiteRelation,
                                GenericSQLRelation)
+    IO_BOUND = True
 
     @requires(['pandas'], 'SQLUpload')
     def __init__(self,
@@ -466,8 +734,14 @@ class SQLUpload(ClientMixin, Task):
                  params=None,
                  chunksize=None,
                  io_handler=None,
-                 to_sql_kwargs=None):
+                 to_sql_kwargs=None,
+                 method=None):
         params = params or {}
+
+        if method not in (None, 'pandas') + _bulk.METHODS:
+            raise ValueError('method must be one of: "copy", "executemany", '
+                             f'"values", "pandas" or None, got: {method!r}')
+
         kwargs = dict(hot_reload=dag._params.hot_reload)
         self._source = type(self)._init_source(source, kwargs)
         super().__init__(product, dag, name, params)
@@ -476,16 +750,66 @@ class SQLUpload(ClientMixin, Task):
         self.io_handler = io_handler
         self.to_sql_kwargs = to_sql_kwargs or {}
 
+        if method not in (None, 'pandas') and self._needs_pandas():
+            raise ValueError(
+                f'method={method!r} does not support io_handler or '
+                'to_sql_kwargs other than "if_exists" and index=False, '
+                'use method="pandas"')
+
+        self.method = method
+
     @staticmethod
     def _init_source(source, kwargs):
         return FileSource(str(source), **kwargs)
 
-    def run(self):
-        import pandas as pd
+    def _needs_pandas(self):
+        kwargs = {
+            key: value
+            for key, value in self.to_sql_kwargs.items()
+            if key != 'if_exists' and (key, value) != ('index', False)
+        }
+        return self.io_handler is not None or bool(kwargs)
 
+    def run(self):
         product = self.params['product']
         path = str(self.source)
 
+        if self.method == 'pandas' or (self.method is None
+                                       and self._needs_pandas()):
+            self._run_pandas(product, path)
+            return
+
+        mapping = {
+            '.csv': _bulk.read_csv,
+            '.parquet': _bulk.read_parquet,
+        }
+
+        extension = Path(path).suffix
+        read_fn = mapping.get(extension)
+
+        if not read_fn:
+            raise ValueError(
+                'Could not infer reading function for '
+                'file with extension: {}'.format(extension),
+                'pass the function directly in the '
+                'io_handler argument')
+
+        self._logger.info('Reading data...')
+        names, types, batches = read_fn(path, self.chunksize
+                                        or _bulk.BATCH_SIZE)
+
+        _bulk.load(self.client,
+                   product,
+                   names,
+                   types,
+                   batches,
+                   self._logger,
+                   method=self.method,
+                   if_exists=self.to_sql_kwargs.get('if_exists', 'fail'))
+
+    def _run_pandas(self, product, path):
+        import pandas as pd
+
         mapping = {
             '.csv': pd.read_csv,
             '.parquet': pd.read_parquet,
@@ -508,6 +832,7 @@ class SQLUpload(ClientMixin, Task):
         df = read_fn(path)
         self._logger.info('Done reading data...')
 
+        self._logger.info('Loading data into %s with pandas...', product)
         df.to_sql(name=product.name,
                   con=self.client.engine,
                   schema=product.schema,
@@ -530,16 +855,25 @@ class PostgresCopyFrom(ClientMixin, Task):
         uploaded. Only required
         if no dag-level client has been declared using dag.clients[class]
 
+    columns: list, optional
+        Columns to upload, if None, it uploads all of them
+
+    chunksize: int, optional
+        Maximum number of rows to read and encode at a time, defaults
+        to 50000
+
 
     Notes
     -----
-    Although this task does not depend on pandas for data i/o, it still
-    needs it to dynamically create the table, after the table is created
-    the COPY statement is used to upload the data
+    The file is read one row group at a time and encoded in COPY text
+    format as it's sent to the database, so memory usage does not depend
+    on the size of the file. The table is created with the types in the
+    parquet file's schema
     """
     PRODUCT_CLASSES_ALLOWED = (PostgresRelation, )
+    IO_BOUND = True
 
-    @requires(['pandas', 'psycopg2'], 'PostgresCopyFrom')
+    @requires(['pyarrow', 'psycopg2'], 'PostgresCopyFrom')
     def __init__(self,
                  source,
                  product,
@@ -547,43 +881,33 @@ class PostgresCopyFrom(ClientMixin, Task):
                  name=None,
                  client=None,
                  params=None,
-                 columns=None):
+                 columns=None,
+                 chunksize=None):
         params = params or {}
         kwargs = dict(hot_reload=dag._params.hot_reload)
         self._source = type(self)._init_source(source, kwargs)
         super().__init__(product, dag, name, params)
         self._client = client
         self.columns = columns
+        self.chunksize = chunksize
 
     @staticmethod
     def _init_source(source, kwargs):
         return FileSource(str(source), **kwargs)
 
     def run(self):
-        import pandas as pd
-
         product = self.params['product']
-        df = pd.read_parquet(str(self.source))
-
-        # create the table
-        self._logger.info('Creating table...')
-        df.head(0).to_sql(name=product.name,
-                          con=self.client.engine,
-                          schema=product.schema,
-                          if_exists='replace',
-                          index=False)
-        self._logger.info('Done creating table.')
-
-        # create file-like object
-        f = StringIO()
-        df.to_csv(f, sep='\t', na_rep='\\N', header=False, index=False)
-        f.seek(0)
-
-        # upload using copy
-        cur = self.client.connection.cursor()
-
-        self._logger.info('Copying data...')
-        cur.copy_expert(f'COPY {product} FROM STDIN', f)
-
-        f.close()
-        cur.close()
+
+        names, types, batches = _bulk.read_parquet(
+            str(self.source),
+            self.chunksize or _bulk.BATCH_SIZE,
+            columns=self.columns)
+
+        _bulk.load(self.client,
+                   product,
+                   names,
+                   types,
+                   batches,
+                   self._logger,
+                   method='copy',
+                   if_exists='replace')
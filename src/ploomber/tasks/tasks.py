@@ -460,6 +460,8 @@ class ShellScript(ClientMixin, Task):
 
     """
 
+    IO_BOUND = True
+
     def __init__(self,
                  source,
                  product,
@@ -511,6 +513,8 @@ class DownloadFromURL(Task):
         A str to indentify this task. Should not already exist in the dag
     """
 
+    IO_BOUND = True
+
     def __init__(self, source, product, dag, name=None, params=None):
         params = params or {}
         kwargs = dict(hot_reload=dag._params.hot_reload)
@@ -636,7 +640,7 @@ class Input(Task):
     def _init_source(kwargs):
         return EmptySource(None, **kwargs)
 
-    def _null_update_metadata(self, source_code, params):
+    def _null_update_metadata(self, source_code, params, elapsed=None):
         # this should be __null_update_metadata but we can't due to
         # https://bugs.python.org/issue33007
         pass
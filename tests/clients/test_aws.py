@@ -1,4 +1,5 @@
 import pickle
+from unittest.mock import Mock
 import shutil
 from itertools import chain
 from glob import iglob
@@ -173,6 +174,42 @@ def test_is_dir(s3, tmp_directory):
     assert client._is_dir('my-folder/dir/')
 
 
+@pytest.mark.parametrize('parent', ['', 'my-folder'])
+def test_list(s3, tmp_directory, parent):
+    Path('file').touch()
+
+    for key in ['dir/a', 'dir/subdir/b', 'dir-other/c']:
+        s3.upload_file('file', 'some-bucket', str(PurePosixPath(parent, key)))
+
+    client = S3Client('some-bucket', parent=parent, path_to_project_root='.')
+
+    assert sorted(client._list(str(PurePosixPath(parent, 'dir')))) == [
+        str(PurePosixPath(parent, 'dir/a')),
+        str(PurePosixPath(parent, 'dir/subdir/b')),
+    ]
+    assert len(client._list(parent)) == 3
+
+
+def test_listing_avoids_calls_per_file(s3, tmp_directory, monkeypatch):
+    Path('dir').mkdir()
+    Path('dir', 'a').touch()
+    s3.upload_file('dir/a', 'some-bucket', 'my-folder/dir/a')
+
+    client = S3Client('some-bucket',
+                      parent='my-folder',
+                      path_to_project_root='.')
+    monkeypatch.setattr(client, '_is_file', Mock())
+    monkeypatch.setattr(client, '_is_dir', Mock())
+
+    with client._listing(['dir/a', 'dir/b', 'dir']):
+        assert client._remote_exists('dir/a')
+        assert not client._remote_exists('dir/b')
+        assert client._remote_exists('dir')
+
+    client._is_file.assert_not_called()
+    client._is_dir.assert_not_called()
+
+
 def test_pickle():
     c = S3Client('some-bucket', parent='my-folder', path_to_project_root='.')
     pickle.loads(pickle.dumps(c))
@@ -2,6 +2,7 @@ import subprocess
 import sqlite3
 import pickle
 import copy
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, Mock
 
@@ -16,7 +17,7 @@ from ploomber.tasks import ShellScript
 from ploomber.products import File
 from ploomber.clients import (ShellClient, SQLAlchemyClient, DBAPIClient,
                               RemoteShellClient)
-from ploomber.clients import db, shell
+from ploomber.clients import db, shell, _pool, _script
 
 _SQLALCHEMY_ARGS = [
     sqlalchemy.engine.url.URL.create(drivername='sqlite', database='my_db.db'),
@@ -36,6 +37,154 @@ def test_pickle_dbapiclient(tmp_directory):
     assert pickle.dumps(client)
 
 
+def test_pooled_dbapiclient_reuses_connection_across_copies(tmp_directory):
+    client = DBAPIClient(sqlite3.connect,
+                         dict(database='my_db.db', check_same_thread=False),
+                         pool_size=2)
+    connection = client.connection
+
+    client.release()
+    other = pickle.loads(pickle.dumps(client))
+
+    assert other.connection is connection
+    assert client.connection is not connection
+
+    client.close()
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, code):
+        if self.connection.closed or self.connection.broken:
+            raise RuntimeError('connection is not usable')
+
+    def fetchall(self):
+        return [(1, )]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.is_valid = True
+        self.closed = False
+        self.broken = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_connection_pool_discards_invalid_connections():
+    pool = _pool.ConnectionPool(FakeConnection, max_size=1)
+    connection = pool.acquire()
+    connection.is_valid = False
+    pool.release(connection)
+
+    assert pool.acquire() is not connection
+    assert connection.closed
+
+
+def test_connection_pool_discards_closed_connections():
+    pool = _pool.ConnectionPool(FakeConnection, max_size=1)
+    connection = pool.acquire()
+    connection.close()
+    pool.release(connection)
+
+    assert pool.acquire() is not connection
+
+
+def test_connection_pool_pings_idle_connections_when_acquiring():
+    pool = _pool.ConnectionPool(FakeConnection, max_size=1)
+    connection = pool.acquire()
+    pool.release(connection)
+
+    # e.g., the server closed it while it was idle
+    connection.broken = True
+
+    assert pool.acquire() is not connection
+    assert connection.closed
+
+
+def test_connection_pool_rolls_back_when_releasing():
+    pool = _pool.ConnectionPool(FakeConnection, max_size=1)
+    connection = pool.acquire()
+    pool.release(connection)
+
+    assert connection.rollbacks == 1
+    assert pool.acquire() is connection
+
+
+def test_pooled_dbapiclient_discards_connection_closed_by_task(
+        tmp_directory):
+    client = DBAPIClient(sqlite3.connect,
+                         dict(database='my_db.db', check_same_thread=False),
+                         pool_size=1)
+
+    # first task closes the connection
+    client.connection.close()
+    client.release()
+
+    # next task in the same process
+    client.execute('SELECT 1')
+    client.release()
+    client.execute('SELECT 1')
+
+    client.close()
+
+
+def test_connection_pool_blocks_when_full():
+    pool = _pool.ConnectionPool(FakeConnection, max_size=1)
+    connection = pool.acquire()
+    acquired = []
+
+    thread = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    thread.start()
+    thread.join(timeout=0.2)
+
+    assert thread.is_alive()
+
+    pool.release(connection)
+    thread.join(timeout=5)
+
+    assert acquired == [connection]
+
+
+def test_connection_pool_close():
+    pool = _pool.ConnectionPool(FakeConnection, max_size=2)
+    idle, in_use = pool.acquire(), pool.acquire()
+    pool.release(idle)
+
+    pool.close()
+
+    assert idle.closed
+    assert not in_use.closed
+
+    pool.release(in_use)
+
+    assert in_use.closed
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(pool_size=0),
+    dict(max_concurrency='1'),
+])
+def test_validates_pool_arguments(kwargs):
+    with pytest.raises(ValueError) as excinfo:
+        SQLAlchemyClient('sqlite://', **kwargs)
+
+    assert 'must be a positive integer or None' in str(excinfo.value)
+
+
 def test_dbapiclient_split_source(tmp_directory):
     client = DBAPIClient(sqlite3.connect,
                          dict(database='my_db.db'),
@@ -122,6 +271,78 @@ def test_send_more_than_one_command_in_sqlite(code, split_source,
     client.execute(code)
 
 
+def _tables(path):
+    with sqlite3.connect(path) as conn:
+        return {
+            name
+            for name, in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+
+
+@pytest.mark.parametrize('batch_size', [None, 2])
+def test_execute_returns_timings(tmp_directory, batch_size):
+    client = SQLAlchemyClient('sqlite:///my_db.db', batch_size=batch_size)
+
+    timings = client.execute('CREATE TABLE a (x INT); CREATE TABLE b (x INT);'
+                             'CREATE TABLE c (x INT)')
+
+    # sqlite3 does not support several statements per call
+    assert [t.index for t in timings] == [0, 1, 2]
+    assert timings[1].statement.strip() == 'CREATE TABLE b (x INT)'
+    assert all(t.elapsed >= 0 for t in timings)
+    assert _tables('my_db.db') == {'a', 'b', 'c'}
+
+
+def test_batch_size_rolls_back_on_error(tmp_directory):
+    client = DBAPIClient(sqlite3.connect,
+                         dict(database='my_db.db'),
+                         split_source=';',
+                         batch_size=10)
+
+    with pytest.raises(sqlite3.OperationalError):
+        client.execute('CREATE TABLE a (x INT); CREATE TABLE b (x INT);'
+                       'SELECT * FROM missing')
+
+    assert not client.connection.in_transaction
+    assert _tables('my_db.db') == set()
+
+    client.close()
+
+
+def test_batches_statements_if_driver_supports_it():
+    connection = Mock(in_transaction=False)
+    cursor = connection.cursor.return_value
+
+    timings = _script.execute_script(connection, ['a', 'b', 'c -- comment'],
+                                     batch_size=2)
+
+    assert [c.args[0] for c in cursor.execute.call_args_list
+            ] == ['BEGIN', 'a\n;\nb', 'c -- comment']
+    assert [t.index for t in timings] == [0, 2]
+    connection.commit.assert_called_once_with()
+    cursor.close.assert_called_once_with()
+
+
+def test_execute_script_rolls_back_on_error():
+    connection = Mock(in_transaction=True)
+    connection.cursor.return_value.execute.side_effect = ValueError
+
+    with pytest.raises(ValueError):
+        _script.execute_script(connection, ['a'], batch_size=2)
+
+    connection.rollback.assert_called_once_with()
+    connection.commit.assert_not_called()
+
+
+@pytest.mark.parametrize('batch_size', [0, 1.5, True])
+def test_validates_batch_size(batch_size):
+    with pytest.raises(ValueError) as excinfo:
+        SQLAlchemyClient('sqlite://', batch_size=batch_size)
+
+    assert 'batch_size must be a positive integer' in str(excinfo.value)
+
+
 @pytest.mark.parametrize('arg', [
     sqlalchemy.engine.url.URL.create(drivername='postgresql',
                                      database='db',
@@ -1,4 +1,5 @@
 from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
 
@@ -182,3 +183,26 @@ def test_parent(tmp_directory):
     Path('pipeline.yaml').touch()
     c = LocalStorageClient('remote')
     assert c.parent == 'remote'
+
+
+def test_listing(tmp_directory, monkeypatch):
+    Path('backup', 'dir', 'subdir').mkdir(parents=True)
+    Path('backup', 'dir', 'a').touch()
+    Path('backup', 'dir', 'subdir', 'b').touch()
+    Path('backup', 'another').mkdir()
+    client = LocalStorageClient('backup', path_to_project_root='.')
+    monkeypatch.setattr(client, '_list', Mock(wraps=client._list))
+    monkeypatch.setattr(client, '_is_file', Mock(wraps=client._is_file))
+
+    with client._listing(['dir/a', 'dir/subdir/b', 'dir/subdir/c']):
+        assert client._remote_exists('dir/a')
+        assert client._remote_exists('dir/subdir')
+        assert not client._remote_exists('dir/subdir/c')
+        client._is_file.assert_not_called()
+
+        # not listed
+        assert client._remote_exists('another')
+
+    # dir/subdir is inside dir, so only one call is needed
+    client._list.assert_called_once_with('backup/dir')
+    assert client._index is None
@@ -160,3 +160,38 @@ def test_dag_with_files_and_metaproducts(monkeypatch, tmp_directory):
     mock.assert_called_once_with(dag)
     assert mock_remote.call_count == 3
     assert not glob('*.metadata.remote')
+
+
+def test_lists_remote_files_once(tmp_directory, monkeypatch):
+    dag = DAG(executor=Serial(build_in_subprocess=False))
+    client = LocalStorageClient('remote', path_to_project_root='.')
+    dag.clients[File] = client
+    t1 = PythonCallable(touch_root_metaproduct, {
+        'one': File('one'),
+        'two': File('two')
+    },
+                        dag=dag)
+    t2 = PythonCallable(touch, File('three'), dag=dag)
+    t1 >> t2
+    dag.build()
+
+    dag = DAG(executor=Serial(build_in_subprocess=False))
+    dag.clients[File] = client
+    t1 = PythonCallable(touch_root_metaproduct, {
+        'one': File('one'),
+        'two': File('two')
+    },
+                        dag=dag)
+    t2 = PythonCallable(touch, File('three'), dag=dag)
+    t1 >> t2
+
+    monkeypatch.setattr(client, '_list', Mock(wraps=client._list))
+    monkeypatch.setattr(client, '_is_file', Mock(wraps=client._is_file))
+    monkeypatch.setattr(client, '_is_dir', Mock(wraps=client._is_dir))
+
+    dag.render()
+
+    client._list.assert_called_once()
+    client._is_dir.assert_not_called()
+    client._is_file.assert_not_called()
+    assert {t.exec_status.name for t in dag.values()} == {'Skipped'}
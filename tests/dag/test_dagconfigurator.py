@@ -9,6 +9,7 @@ from ploomber.dag.dagconfigurator import DAGConfigurator
 from ploomber.tasks import PythonCallable
 from ploomber.products import File
 from ploomber.executors import Serial, Parallel
+from ploomber.sources._nbcache import NotebookCache
 
 WINDOWS_OR_MAC = sys.platform in {'win32', 'darwin'}
 
@@ -120,3 +121,20 @@ def test_error_if_non_existing_parameter():
 
     with pytest.raises(AttributeError):
         configurator.params.non_existing_param = True
+
+
+def test_notebook_cache_from_path(tmp_directory):
+    configurator = DAGConfigurator({'notebook_cache': 'nbs.db'})
+    cache = configurator.params.notebook_cache
+
+    assert isinstance(cache, NotebookCache)
+    assert cache.path == Path('nbs.db').resolve()
+
+
+def test_error_on_invalid_notebook_cache():
+    configurator = DAGConfigurator()
+
+    with pytest.raises(TypeError) as excinfo:
+        configurator.params.notebook_cache = 1
+
+    assert 'notebook_cache must be None, a path' in str(excinfo.value)
@@ -1,3 +1,4 @@
+import os
 import shutil
 import warnings
 from pathlib import Path
@@ -417,3 +418,107 @@ def test_render_remote_with_non_file_products(tmp_directory):
 
     # should match the local status
     assert {t.exec_status for t in dag.values()} == {TaskStatus.Skipped}
+
+
+@pytest.fixture
+def dag_incremental(tmp_directory):
+    Path('a.sh').write_text('echo a > {{product}}')
+    Path('b.sh').write_text('cat {{upstream["a"]}} > {{product}}')
+    Path('c.sh').write_text('cat {{upstream["b"]}} > {{product}}')
+
+    dag = DAG()
+    dag._params.incremental_render = True
+
+    a = ShellScript(Path('a.sh'), File('a.txt'), dag, 'a')
+    b = ShellScript(Path('b.sh'), File('b.txt'), dag, 'b')
+    c = ShellScript(Path('c.sh'), File('c.txt'), dag, 'c')
+    a >> b >> c
+
+    return dag
+
+
+def _rendered(dag, monkeypatch):
+    rendered = []
+    render = ShellScript.render
+
+    def spy(self, *args, **kwargs):
+        rendered.append(self.name)
+        return render(self, *args, **kwargs)
+
+    monkeypatch.setattr(ShellScript, 'render', spy)
+    return rendered
+
+
+def test_incremental_render_skips_clean_tasks(dag_incremental, monkeypatch):
+    dag_incremental.render()
+    rendered = _rendered(dag_incremental, monkeypatch)
+
+    dag_incremental.render()
+
+    assert rendered == []
+    assert dag_incremental['a'].exec_status == TaskStatus.WaitingExecution
+    assert dag_incremental['b'].exec_status == TaskStatus.WaitingUpstream
+    assert dag_incremental['c'].exec_status == TaskStatus.WaitingUpstream
+
+
+def test_incremental_render_renders_dirty_and_downstream(
+        dag_incremental, monkeypatch):
+    dag_incremental.build()
+    dag_incremental.render()
+    rendered = _rendered(dag_incremental, monkeypatch)
+
+    path = Path('b.sh')
+    path.write_text('cat {{upstream["a"]}} >> {{product}}')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    dag_incremental.render()
+
+    assert rendered == ['b', 'c']
+    assert {t.exec_status
+            for t in dag_incremental.values()} == {TaskStatus.Skipped}
+
+
+def test_incremental_render_after_build(dag_incremental, monkeypatch):
+    dag_incremental.render()
+    dag_incremental.build()
+    rendered = _rendered(dag_incremental, monkeypatch)
+
+    dag_incremental.render()
+    dag_incremental.render()
+
+    # executed tasks are rendered again once, then they are clean
+    assert rendered == ['a', 'b', 'c']
+    assert {t.exec_status
+            for t in dag_incremental.values()} == {TaskStatus.Skipped}
+
+
+def test_incremental_render_matches_full_render(dag_incremental):
+    dag_incremental.build()
+    Path('a.txt').unlink()
+    dag_incremental['a'].product.metadata.clear()
+
+    dag_incremental.render()
+    incremental = {t.name: t.exec_status for t in dag_incremental.values()}
+
+    dag_incremental._params.incremental_render = False
+    dag_incremental.render()
+    full = {t.name: t.exec_status for t in dag_incremental.values()}
+
+    assert incremental == full
+    assert full['a'] == TaskStatus.WaitingExecution
+
+
+def test_incremental_render_detects_deleted_product(dag_incremental):
+    dag_incremental.build()
+    dag_incremental.render()
+
+    assert {t.exec_status
+            for t in dag_incremental.values()} == {TaskStatus.Skipped}
+
+    # deleted outside ploomber, the cached status is no longer valid
+    Path('a.txt').unlink()
+    dag_incremental.render()
+
+    assert dag_incremental['a'].exec_status == TaskStatus.WaitingExecution
+    assert dag_incremental['b'].exec_status == TaskStatus.WaitingUpstream
+    assert dag_incremental['c'].exec_status == TaskStatus.WaitingUpstream
@@ -0,0 +1,76 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from ploomber import DAG
+from ploomber.executors._payload import TaskPayload, DAGStub, TaskStub
+from ploomber.products import File
+from ploomber.tasks import PythonCallable
+
+
+def touch_root(product):
+    Path(str(product)).touch()
+
+
+def touch(upstream, product):
+    Path(str(product)).touch()
+
+
+def make_dag(n_tasks):
+    """
+    Makes a DAG with n_tasks - 1 root tasks and one task downstream of
+    the first one, returns the DAG and the downstream task
+    """
+    dag = DAG()
+
+    for i in range(n_tasks - 1):
+        PythonCallable(touch_root, File(f'{i}.txt'), dag, name=str(i))
+
+    task = PythonCallable(touch, File('final.txt'), dag, name='final')
+    dag['0'] >> task
+
+    dag.render()
+    return dag, task
+
+
+def test_payload_restores_task(tmp_directory):
+    dag, task = make_dag(3)
+
+    restored = pickle.loads(pickle.dumps(TaskPayload(task))).task
+
+    assert restored.name == task.name
+    assert str(restored.product) == str(task.product)
+    assert isinstance(restored.dag, DAGStub)
+    assert restored.dag.name == dag.name
+    assert restored.dag.values() == []
+    up = restored.params['upstream']['0']
+    assert str(up) == '0.txt'
+    assert isinstance(up.task, TaskStub)
+
+
+def test_payload_build(tmp_directory):
+    _, task = make_dag(3)
+
+    restored = pickle.loads(pickle.dumps(TaskPayload(task))).task
+    report, meta = restored._build(catch_exceptions=True)
+
+    assert report['Ran?']
+    assert Path('final.txt').exists()
+
+
+@pytest.mark.parametrize('n_tasks', [10, 100, 1000])
+def test_payload_size_does_not_depend_on_dag_size(tmp_directory, n_tasks):
+    # benchmark: the size of the full task grows with the number of tasks
+    # but the payload stays the same
+    _, small = make_dag(2)
+    _, large = make_dag(n_tasks)
+
+    size_small = len(pickle.dumps(TaskPayload(small)))
+    size_large = len(pickle.dumps(TaskPayload(large)))
+    size_full = len(pickle.dumps(large))
+
+    assert size_large == size_small
+    # a few KB regardless of the DAG (~2.6KB when this test was written)
+    assert size_large < 4096
+    assert size_full > size_large * n_tasks / 10
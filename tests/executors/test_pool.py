@@ -0,0 +1,182 @@
+import os
+import sys
+import time
+import threading
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from ploomber import DAG
+from ploomber.executors import Serial, Parallel
+from ploomber.executors._pool import WorkerPool
+from ploomber.products import File
+from ploomber.tasks import PythonCallable
+
+
+def get_pid():
+    return os.getpid()
+
+
+def is_imported(name):
+    return name in sys.modules
+
+
+def touch_pid(product):
+    Path(str(product)).write_text(str(os.getpid()))
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+
+
+def sleep_and_touch_pid(product):
+    time.sleep(0.2)
+    touch_pid(product)
+
+
+def make_dag(executor):
+    dag = DAG(executor=executor)
+    PythonCallable(touch_pid, File('a.txt'), dag, name='a')
+    PythonCallable(touch_pid, File('b.txt'), dag, name='b')
+    return dag
+
+
+def test_worker_pool_reuses_processes():
+    pool = WorkerPool(processes=1)
+
+    try:
+        first = pool.submit(get_pid).result()
+        second = pool.submit(get_pid).result()
+    finally:
+        pool.close()
+
+    assert first == second
+    assert first != os.getpid()
+
+
+def test_worker_pool_preload():
+    pool = WorkerPool(processes=1, preload=['json'])
+
+    try:
+        assert pool.submit(is_imported, name='json').result()
+    finally:
+        pool.close()
+
+
+def test_worker_pool_recycles_after_max_tasks():
+    pool = WorkerPool(processes=1, max_tasks_per_worker=1)
+
+    try:
+        first = pool.submit(get_pid).result()
+        second = pool.submit(get_pid).result()
+    finally:
+        pool.close()
+
+    assert first != second
+
+
+def test_worker_pool_is_not_available_until_drained():
+    pool = WorkerPool(processes=1, max_tasks_per_worker=1)
+
+    try:
+        assert pool.available()
+        future = pool.submit(sleep, seconds=0.2)
+        assert not pool.available()
+        future.result()
+        # the pool has to be replaced and it has no running tasks
+        assert pool.available()
+    finally:
+        pool.close()
+
+
+def test_parallel_recycling_does_not_exceed_processes(tmp_directory):
+    dag = DAG(executor=Parallel(processes=2, max_tasks_per_worker=1))
+
+    for i in range(6):
+        PythonCallable(sleep_and_touch_pid,
+                       File(f'{i}.txt'),
+                       dag,
+                       name=f'task-{i}')
+
+    alive = []
+    done = threading.Event()
+
+    def sample():
+        while not done.is_set():
+            alive.append(len(multiprocessing.active_children()))
+            time.sleep(0.01)
+
+    thread = threading.Thread(target=sample)
+    thread.start()
+
+    try:
+        dag.build()
+    finally:
+        done.set()
+        thread.join()
+
+    pids = {Path(f'{i}.txt').read_text() for i in range(6)}
+
+    # each worker ran a single task
+    assert len(pids) == 6
+    assert max(alive) <= 2
+
+
+@pytest.mark.skipif(sys.platform == 'win32',
+                    reason='memory usage is not available on windows')
+def test_worker_pool_recycles_after_max_memory():
+    # any process uses more than 1 MB
+    pool = WorkerPool(processes=1, max_memory_per_worker=1)
+
+    try:
+        first = pool.submit(get_pid).result()
+        second = pool.submit(get_pid).result()
+    finally:
+        pool.close()
+
+    assert first != second
+
+
+def test_worker_pool_error_if_preload_missing():
+    with pytest.raises(ValueError) as excinfo:
+        WorkerPool(processes=1, preload=['not_a_module'])
+
+    assert 'not_a_module' in str(excinfo.value)
+
+
+def test_worker_pool_forwards_exceptions():
+    pool = WorkerPool(processes=1)
+
+    try:
+        with pytest.raises(TypeError):
+            pool.submit(get_pid, unexpected=1).result()
+    finally:
+        pool.close()
+
+
+@pytest.mark.parametrize('executor', [
+    Serial(reuse_workers=True),
+    Parallel(processes=1, reuse_workers=True),
+],
+                         ids=['serial', 'parallel'])
+def test_executor_reuses_workers_across_builds(tmp_directory, executor):
+    try:
+        make_dag(executor).build()
+        pids = {Path('a.txt').read_text(), Path('b.txt').read_text()}
+
+        make_dag(executor).build(force=True)
+        pids_second = {Path('a.txt').read_text(), Path('b.txt').read_text()}
+    finally:
+        executor.close()
+
+    assert len(pids) == 1
+    assert pids == pids_second
+    assert str(os.getpid()) not in pids
+
+
+def test_serial_pool_options_require_reuse_workers():
+    with pytest.raises(ValueError) as excinfo:
+        Serial(preload=['json'])
+
+    assert 'reuse_workers=True' in str(excinfo.value)
@@ -0,0 +1,49 @@
+import pytest
+
+from ploomber.io._background import BackgroundWriter
+
+
+class ListIO:
+    def __init__(self):
+        self.chunks = []
+        self.closed = False
+
+    def write(self, data, headers):
+        self.chunks.append(data)
+
+    def close(self):
+        self.closed = True
+
+
+def test_writes_in_order_and_closes_handler():
+    handler = ListIO()
+    writer = BackgroundWriter(handler, queue_size=1)
+
+    for i in range(100):
+        writer.write([i], headers=['a'])
+
+    writer.close()
+
+    assert handler.chunks == [[i] for i in range(100)]
+    assert handler.closed
+
+
+def test_raises_error_from_writer():
+    class FailingIO(ListIO):
+        def write(self, data, headers):
+            raise ValueError('cannot write')
+
+    writer = BackgroundWriter(FailingIO(), queue_size=1)
+    writer.write([1], headers=['a'])
+
+    with pytest.raises(RuntimeError) as excinfo:
+        writer.close()
+
+    assert isinstance(excinfo.value.__cause__, ValueError)
+
+
+def test_validates_queue_size():
+    with pytest.raises(ValueError) as excinfo:
+        BackgroundWriter(ListIO(), queue_size=0)
+
+    assert 'queue_size must be at least 1' in str(excinfo.value)
@@ -33,3 +33,77 @@ def test_parquet_write_chunks(tmp_directory):
 
     assert Path('files/0.parquet').is_file()
     assert Path('files/1.parquet').is_file()
+
+
+def test_parquet_row_group_write_chunks(tmp_directory):
+    import pyarrow.parquet as pq
+
+    parquet = io.ParquetRowGroupIO('file.parquet', chunked=True)
+    parquet.write([[0, 1, 2]], headers=['a', 'b', 'c'])
+    parquet.write([[3, 4, 5], [6, 7, 8]], headers=['a', 'b', 'c'])
+    parquet.close()
+
+    file_ = pq.ParquetFile('file.parquet')
+
+    assert Path('file.parquet').is_file()
+    assert file_.num_row_groups == 2
+    assert file_.read().to_pydict() == {
+        'a': [0, 3, 6],
+        'b': [1, 4, 7],
+        'c': [2, 5, 8],
+    }
+
+
+def test_parquet_row_group_write_table(tmp_directory):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet = io.ParquetRowGroupIO('file.parquet', chunked=True)
+    batch = pa.RecordBatch.from_pydict({'a': [0, 1]})
+    parquet.write_table(batch)
+    parquet.write_table(batch)
+    parquet.close()
+
+    assert pq.read_table('file.parquet').to_pydict() == {'a': [0, 1, 0, 1]}
+
+
+def test_parquet_row_group_close_without_writing(tmp_directory):
+    import pyarrow.parquet as pq
+
+    parquet = io.ParquetRowGroupIO('file.parquet', chunked=True)
+    parquet.close()
+
+    assert pq.read_table('file.parquet').num_rows == 0
+
+
+def test_parquet_write_empty(tmp_directory):
+    import pyarrow.parquet as pq
+
+    parquet = io.ParquetIO('file.parquet', chunked=False)
+    parquet.write([], headers=['a', 'b'])
+
+    assert pq.read_table('file.parquet').column_names == ['a', 'b']
+
+
+def test_parquet_write_table_chunks(tmp_directory):
+    import pyarrow as pa
+
+    parquet = io.ParquetIO('files', chunked=True)
+    parquet.write_table(pa.table({'a': [0, 1]}))
+    parquet.write_table(pa.table({'a': [2, 3]}))
+
+    assert Path('files/0.parquet').is_file()
+    assert Path('files/1.parquet').is_file()
+
+
+def test_partition_prefixes_chunk_names(tmp_directory):
+    handler = io.CSVIO('dir', chunked=True)
+    first, second = handler.partition(0), handler.partition(1)
+
+    first.write([[1]], ['a'])
+    second.write([[2]], ['a'])
+    first.write([[3]], ['a'])
+
+    assert {p.name for p in Path('dir').iterdir()} == {
+        '0-0.csv', '0-1.csv', '1-0.csv'
+    }
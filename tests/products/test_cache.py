@@ -0,0 +1,195 @@
+from pathlib import Path
+
+import pytest
+
+from ploomber import DAG
+from ploomber.executors import Serial, Parallel
+from ploomber.products import File
+from ploomber.products._cache import ProductCache
+from ploomber.tasks import PythonCallable
+from ploomber.clients import LocalStorageClient
+
+
+def _root(product, value):
+    Path(str(product)).write_text(str(value))
+
+    with open('calls', 'a') as f:
+        f.write('root\n')
+
+
+def _many(product):
+    Path(str(product['a'])).write_text('a')
+    Path(str(product['b'])).mkdir(exist_ok=True)
+    Path(str(product['b']), 'file').write_text('b')
+
+
+def _final(product, upstream):
+    Path(str(product)).write_text(Path(str(upstream['root'])).read_text() +
+                                  '!')
+
+    with open('calls', 'a') as f:
+        f.write('final\n')
+
+
+def _make_dag(cache, value=1, executor=None):
+    dag = DAG(executor=executor or Serial(build_in_subprocess=False))
+    dag._params.product_cache = cache
+
+    root = PythonCallable(_root,
+                          File('root.txt'),
+                          dag,
+                          name='root',
+                          params=dict(value=value))
+    final = PythonCallable(_final, File('final.txt'), dag, name='final')
+    root >> final
+
+    return dag
+
+
+def _calls():
+    return Path('calls').read_text().splitlines()
+
+
+def _clean():
+    for path in ['root.txt', 'final.txt', '.root.txt.metadata',
+                 '.final.txt.metadata', 'calls']:
+        Path(path).unlink()
+
+
+@pytest.mark.parametrize('executor', [
+    Serial(build_in_subprocess=False),
+    Serial(build_in_subprocess=True),
+    Parallel(processes=2),
+])
+def test_restores_products_from_cache(tmp_directory, executor):
+    report = _make_dag('cache', executor=executor).build()
+
+    assert list(report['Cache']) == ['miss', 'miss']
+
+    _clean()
+    Path('calls').touch()
+    report = _make_dag('cache', executor=executor).build()
+
+    assert list(report['Cache']) == ['hit', 'hit']
+    assert _calls() == []
+    assert Path('root.txt').read_text() == '1'
+    assert Path('final.txt').read_text() == '1!'
+
+
+def test_shared_across_projects(tmp_directory):
+    cache = str(Path('cache').resolve())
+    Path('one').mkdir()
+    Path('two').mkdir()
+
+    with pytest.MonkeyPatch.context() as m:
+        m.chdir('one')
+        _make_dag(cache).build()
+
+    with pytest.MonkeyPatch.context() as m:
+        m.chdir('two')
+        report = _make_dag(cache).build()
+
+        assert not Path('calls').exists()
+        assert list(report['Cache']) == ['hit', 'hit']
+
+
+def test_miss_if_params_change(tmp_directory):
+    _make_dag('cache').build()
+    _clean()
+
+    report = _make_dag('cache', value=2).build()
+
+    assert list(report['Cache']) == ['miss', 'miss']
+    assert _calls() == ['root', 'final']
+
+
+def test_hit_if_upstream_output_does_not_change(tmp_directory):
+    dag = _make_dag('cache')
+    dag.build()
+
+    # force root to run again with the same output
+    cache = dag._params.product_cache
+    dag._params.product_cache = None
+    dag['root'].build(force=True)
+    dag._params.product_cache = cache
+
+    report = _make_dag('cache').build()
+
+    assert dict(zip(report['name'], report['Cache'])) == {
+        'root': '',
+        'final': 'hit'
+    }
+    assert _calls() == ['root', 'final', 'root']
+
+
+def test_skipped_tasks_in_report(tmp_directory):
+    _make_dag('cache').build()
+    report = _make_dag('cache').build()
+
+    assert list(report['Ran?']) == [False, False]
+    assert list(report['Cache']) == ['', '']
+
+
+def test_not_cached_if_params_are_not_serializable(tmp_directory):
+    report = _make_dag('cache', value=object()).build()
+
+    assert list(report['Cache']) == ['', 'miss']
+
+
+def test_metaproduct_with_directory(tmp_directory):
+    def make():
+        dag = DAG(executor=Serial(build_in_subprocess=False))
+        dag._params.product_cache = 'cache'
+        PythonCallable(_many, {
+            'a': File('a.txt'),
+            'b': File('b')
+        },
+                       dag,
+                       name='many')
+        return dag
+
+    make().build()
+    Path('a.txt').unlink()
+    Path('b', 'file').unlink()
+    Path('.a.txt.metadata').unlink()
+
+    report = make().build()
+
+    assert list(report['Cache']) == ['hit']
+    assert Path('a.txt').read_text() == 'a'
+    assert Path('b', 'file').read_text() == 'b'
+
+
+def test_evicts_least_recently_used(tmp_directory):
+    cache = ProductCache('cache', max_size=0)
+
+    _make_dag(cache).build()
+
+    # only the last stored entry is kept
+    assert len([p for p in Path('cache').iterdir()]) == 1
+
+
+def test_downloads_from_remote(tmp_directory):
+    client = LocalStorageClient('remote', path_to_project_root='.')
+    _make_dag(dict(path='cache', client=client)).build()
+
+    _clean()
+    Path('calls').touch()
+    for entry in Path('cache').iterdir():
+        for path in sorted(entry.rglob('*'), reverse=True):
+            path.unlink() if path.is_file() else path.rmdir()
+        entry.rmdir()
+
+    report = _make_dag(dict(path='cache', client=client)).build()
+
+    assert list(report['Cache']) == ['hit', 'hit']
+    assert _calls() == []
+
+
+def test_invalid_value():
+    dag = DAG()
+
+    with pytest.raises(TypeError) as excinfo:
+        dag._params.product_cache = 1
+
+    assert 'product_cache must be None' in str(excinfo.value)
@@ -0,0 +1,151 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from ploomber import DAG
+from ploomber.clients import SQLAlchemyClient
+from ploomber.executors import Serial, Parallel
+from ploomber.products import File, SQLiteRelation
+from ploomber.products import _digest
+from ploomber.tasks import PythonCallable
+from ploomber.dag.dagconfiguration import DAGConfiguration
+
+
+def _root(product, value, content):
+    Path(str(product)).write_text(str(value) if content is None else content)
+
+
+def _final(product, upstream):
+    Path(str(product)).write_text(Path(str(upstream['root'])).read_text() +
+                                  '!')
+
+
+def _make_dag(value, content=None, digest=True, executor=None):
+    dag = DAG(executor=executor or Serial(build_in_subprocess=False))
+    dag._params.outdated_by_digest = digest
+
+    root = PythonCallable(_root,
+                          File('root.txt'),
+                          dag,
+                          name='root',
+                          params=dict(value=value, content=content))
+    final = PythonCallable(_final, File('final.txt'), dag, name='final')
+    root >> final
+
+    return dag
+
+
+def _ran(report):
+    return {
+        name
+        for name, ran in zip(report['name'], report['Ran?']) if ran
+    }
+
+
+@pytest.mark.parametrize('executor', [
+    Serial(build_in_subprocess=False),
+    Parallel(processes=2),
+])
+def test_skips_downstream_if_upstream_content_is_the_same(
+        tmp_directory, executor):
+    _make_dag(value=1, content='same', executor=executor).build()
+
+    # root is outdated (params changed) but it generates the same file
+    report = _make_dag(value=2, content='same', executor=executor).build()
+
+    assert _ran(report) == {'root'}
+
+
+def test_skipped_task_keeps_elapsed(tmp_directory):
+    dag = _make_dag(value=1, content='same')
+    dag.build()
+    elapsed = dag['final'].product.metadata.elapsed
+
+    dag = _make_dag(value=2, content='same')
+    report = dag.build()
+
+    assert _ran(report) == {'root'}
+    assert elapsed is not None
+    assert dag['final'].product.metadata.elapsed == elapsed
+
+
+def test_runs_downstream_if_upstream_content_changes(tmp_directory):
+    _make_dag(value=1).build()
+
+    report = _make_dag(value=2).build()
+
+    assert _ran(report) == {'root', 'final'}
+    assert Path('final.txt').read_text() == '2!'
+
+
+def test_uses_timestamps_if_disabled(tmp_directory):
+    _make_dag(value=1, content='same', digest=False).build()
+
+    report = _make_dag(value=2, content='same', digest=False).build()
+
+    assert _ran(report) == {'root', 'final'}
+
+
+def test_uses_timestamps_if_built_without_digests(tmp_directory):
+    _make_dag(value=1, content='same', digest=False).build()
+
+    report = _make_dag(value=2, content='same').build()
+
+    assert _ran(report) == {'root', 'final'}
+
+
+def test_stores_digests_in_metadata(tmp_directory):
+    dag = _make_dag(value=1)
+    dag.build()
+
+    root = dag['root'].product.metadata
+    final = dag['final'].product.metadata
+
+    assert root.digest == _digest.path_digest('root.txt')
+    assert root.upstream_digests == {}
+    assert final.digest == _digest.path_digest('final.txt')
+    assert final.upstream_digests == {'root': root.digest}
+
+
+def test_path_digest(tmp_directory, monkeypatch):
+    Path('file').write_text('some content')
+    Path('dir').mkdir()
+    Path('dir', 'file').write_text('some content')
+
+    digest = _digest.path_digest('file')
+
+    monkeypatch.setattr(_digest, '_MMAP_THRESHOLD', 0)
+
+    assert _digest.path_digest('file') == digest
+    assert _digest.path_digest('dir') != digest
+    assert _digest.path_digest('missing') is None
+
+
+def test_sqlite_relation_digest_does_not_depend_on_row_order(tmp_directory):
+    conn = sqlite3.connect('database.db')
+    conn.execute('CREATE TABLE a (x INTEGER, y TEXT)')
+    conn.execute('CREATE TABLE b (x INTEGER, y TEXT)')
+    conn.executemany('INSERT INTO a VALUES (?, ?)', [(1, 'a'), (2, 'b')])
+    conn.executemany('INSERT INTO b VALUES (?, ?)', [(2, 'b'), (1, 'a')])
+    conn.commit()
+
+    client = SQLAlchemyClient('sqlite:///database.db')
+    a = SQLiteRelation(('a', 'table'), client=client)
+    b = SQLiteRelation(('b', 'table'), client=client)
+
+    assert a._digest() == b._digest()
+
+    conn.execute("INSERT INTO b VALUES (3, 'c')")
+    conn.commit()
+    conn.close()
+
+    assert a._digest() != b._digest()
+    client.close()
+
+
+def test_validates_option():
+    with pytest.raises(ValueError) as excinfo:
+        DAGConfiguration().outdated_by_digest = 'yes'
+
+    assert 'outdated_by_digest must be True or False' in str(excinfo.value)
@@ -128,6 +128,25 @@ def test_update_with_non_string_keys():
     assert metadata.params == {1: 1}
 
 
+def test_update_stores_elapsed():
+    prod = FakeProduct(identifier='fake-product')
+    metadata = Metadata(prod)
+
+    metadata.update('new code', params={}, elapsed=1.5)
+
+    assert metadata.elapsed == 1.5
+
+
+def test_update_keeps_elapsed_if_none():
+    prod = FakeProduct(identifier='fake-product')
+    metadata = Metadata(prod)
+
+    metadata.update('code', params={}, elapsed=1.5)
+    metadata.update('code', params={})
+
+    assert metadata.elapsed == 1.5
+
+
 @pytest.mark.parametrize(
     'method, kwargs',
     [['clear', dict()], ['update', dict(source_code='', params={})],
@@ -214,10 +233,10 @@ def test_metadata_collection_update_forwards_to_all_products():
 
     m = MetadataCollection([p1, p2])
 
-    m.update(arg, arg2)
+    m.update(arg, arg2, elapsed=1.5)
 
-    p1.metadata.update.assert_called_once_with(arg, arg2)
-    p2.metadata.update.assert_called_once_with(arg, arg2)
+    p1.metadata.update.assert_called_once_with(arg, arg2, elapsed=1.5)
+    p2.metadata.update.assert_called_once_with(arg, arg2, elapsed=1.5)
 
 
 def test_metadata_collection_update_locally_forwards_to_all_products():
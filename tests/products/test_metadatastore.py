@@ -0,0 +1,145 @@
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from ploomber import DAG
+from ploomber.constants import TaskStatus
+from ploomber.executors import Serial, Parallel
+from ploomber.products import File
+from ploomber.products._metadatastore import SQLiteMetadataStore
+from ploomber.tasks import PythonCallable
+
+
+def _touch(product):
+    Path(str(product)).touch()
+
+
+def _touch_many(product):
+    for prod in product:
+        Path(str(prod)).touch()
+
+
+def _touch_upstream(product, upstream):
+    Path(str(product)).touch()
+
+
+def _make_dag(executor=None, **kwargs):
+    dag = DAG(executor=executor or Serial(build_in_subprocess=False))
+    dag._params.metadata_store = SQLiteMetadataStore()
+
+    root = PythonCallable(_touch, File('root.txt'), dag, name='root')
+    many = PythonCallable(_touch_many, {
+        'a': File('a.txt'),
+        'b': File('b.txt')
+    },
+                          dag,
+                          name='many')
+    final = PythonCallable(_touch_upstream,
+                           File('final.txt'),
+                           dag,
+                           name='final')
+    root >> final
+    many >> final
+
+    return dag
+
+
+def test_save_fetch_and_delete(tmp_directory):
+    store = SQLiteMetadataStore()
+
+    store.save('file.txt', {'a': 1})
+
+    assert store.fetch('file.txt') == {'a': 1}
+    assert store.fetch(Path('file.txt').resolve()) == {'a': 1}
+    assert store.fetch('another.txt') is None
+    assert Path('.ploomber', 'metadata.db').is_file()
+
+    store.delete('file.txt')
+
+    assert store.fetch('file.txt') is None
+
+
+def test_keys_are_relative_to_project_root(tmp_directory):
+    store = SQLiteMetadataStore()
+    store.save(Path('data', 'file.txt'), {'a': 1})
+
+    assert store.fetch_all() == {'data/file.txt': {'a': 1}}
+
+
+def test_batch_saves_on_exit(tmp_directory):
+    store = SQLiteMetadataStore()
+    another = SQLiteMetadataStore()
+
+    with store.batch():
+        store.save('a.txt', {'a': 1})
+        store.save('b.txt', {'b': 2})
+
+        assert another.fetch_all() == {}
+
+    assert another.fetch_all() == {'a.txt': {'a': 1}, 'b.txt': {'b': 2}}
+
+
+def test_pickle(tmp_directory):
+    store = SQLiteMetadataStore()
+    store.save('file.txt', {'a': 1})
+
+    loaded = pickle.loads(pickle.dumps(store))
+
+    assert loaded.fetch('file.txt') == {'a': 1}
+
+
+def test_metadata_store_config_invalid_value():
+    dag = DAG()
+
+    with pytest.raises(ValueError) as excinfo:
+        dag._params.metadata_store = 'postgres'
+
+    assert 'metadata_store must be None' in str(excinfo.value)
+
+
+@pytest.mark.parametrize('executor', [
+    Serial(build_in_subprocess=False),
+    Serial(build_in_subprocess=True),
+    Parallel(processes=2),
+])
+def test_build_uses_metadata_store(tmp_directory, executor):
+    dag = _make_dag(executor=executor)
+    dag.build()
+
+    # no sidecar files
+    assert not list(Path('.').glob('.*.metadata'))
+
+    stored = SQLiteMetadataStore().fetch_all()
+    assert set(stored) == {'root.txt', 'a.txt', 'b.txt', 'final.txt'}
+
+    dag = _make_dag()
+    dag.render()
+
+    assert {t.exec_status for t in dag.values()} == {TaskStatus.Skipped}
+
+
+def test_migrates_sidecar_metadata(tmp_directory):
+    dag = DAG(executor=Serial(build_in_subprocess=False))
+    PythonCallable(_touch, File('root.txt'), dag, name='root')
+    dag.build()
+
+    sidecar = Path('.root.txt.metadata')
+    metadata = json.loads(sidecar.read_text())
+
+    dag = _make_dag()
+    dag.render()
+
+    assert dag['root'].exec_status == TaskStatus.Skipped
+    assert SQLiteMetadataStore().fetch('root.txt') == metadata
+    assert not sidecar.exists()
+
+
+def test_delete_metadata(tmp_directory):
+    dag = _make_dag()
+    dag.build()
+
+    dag['root'].product.metadata.delete()
+
+    assert SQLiteMetadataStore().fetch('root.txt') is None
@@ -19,6 +19,7 @@ from ploomber.sources.notebooksource import (
     _jupytext_fmt,
 )
 from ploomber.sources.nb_utils import find_cell_with_tag
+from ploomber.sources import notebooksource, _nbcache
 from ploomber.products import File
 from ploomber.exceptions import RenderError, SourceInitializationError
 
@@ -981,3 +982,89 @@ kernelspec:
 1 + 1
 ```
 """, extension) == 'md:myst'
+
+
+@pytest.fixture
+def count_parse(monkeypatch):
+    _nbcache.clear()
+    calls = []
+    original = notebooksource._to_nb_obj
+
+    def _to_nb_obj(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(notebooksource, '_to_nb_obj', _to_nb_obj)
+    yield calls
+    _nbcache.clear()
+
+
+def test_sources_with_the_same_code_share_parsed_notebook(count_parse):
+    first = NotebookSource(new_nb(fmt='py:light'), ext_in='py')
+    second = NotebookSource(new_nb(fmt='py:light'), ext_in='py')
+
+    first.render(Params._from_dict({'product': File('first.ipynb')}))
+    second.render(Params._from_dict({'product': File('second.ipynb')}))
+
+    assert len(count_parse) == 1
+    assert first._nb_obj_unrendered is second._nb_obj_unrendered
+    assert 'first.ipynb' in first.nb_str_rendered
+    assert 'second.ipynb' in second.nb_str_rendered
+
+
+def test_render_does_not_modify_cached_notebook(count_parse):
+    source = NotebookSource(new_nb(fmt='py:light'), ext_in='py')
+    before = nbformat.writes(source._nb_obj_unrendered)
+
+    source.render(Params._from_dict({'product': File('out.ipynb')}))
+
+    assert nbformat.writes(source._nb_obj_unrendered) == before
+    assert 'injected-parameters' not in before
+    assert 'papermill' not in source._nb_obj_unrendered.metadata
+    assert find_cell_with_tag(source.nb_obj_rendered, 'injected-parameters')
+
+
+def test_notebook_cache_stores_parsed_notebooks(tmp_directory, count_parse):
+    cache = _nbcache.NotebookCache('cache.db')
+    source = NotebookSource(new_nb(fmt='py:light'),
+                            ext_in='py',
+                            notebook_cache=cache)
+    expected = source._nb_str_unrendered
+
+    # simulate a new process
+    _nbcache.clear()
+    another = NotebookSource(new_nb(fmt='py:light'),
+                             ext_in='py',
+                             notebook_cache=cache)
+
+    assert len(count_parse) == 1
+    assert another._nb_str_unrendered == expected
+    assert Path('cache.db').exists()
+
+
+def test_notebook_cache_evicts_oldest_entries(tmp_directory):
+    cache = _nbcache.NotebookCache('cache.db', max_size=2)
+
+    for key in ['a', 'b', 'c']:
+        cache.set(key, f'nb-{key}')
+
+    assert cache.get('a') is None
+    assert cache.get('b') == 'nb-b'
+    assert cache.get('c') == 'nb-c'
+
+
+def test_hot_reload_reads_changes(tmp_directory, count_parse):
+    path = Path('nb.py')
+    path.write_text(new_nb(fmt='py:light'))
+    source = NotebookSource(path, hot_reload=True)
+    source.render(Params._from_dict({'product': File('out.ipynb')}))
+
+    # unchanged file, the notebook is not parsed again
+    source.render(Params._from_dict({'product': File('out.ipynb')}))
+    assert len(count_parse) == 1
+
+    path.write_text(new_nb(fmt='py:light', code=['1', 'x = 42']))
+    source.render(Params._from_dict({'product': File('out.ipynb')}))
+
+    assert len(count_parse) == 2
+    assert 'x = 42' in source.nb_str_rendered
@@ -472,6 +472,18 @@ def test_file_spec_resolves_sources_location(tmp_nbs):
     assert all(str(t['source']).startswith(absolute) for t in spec['tasks'])
 
 
+def test_sqlite_metadata_store_is_relative_to_spec(tmp_nbs):
+    spec = DAGSpec('pipeline.yaml')
+    spec['config'] = {'metadata_store': 'sqlite'}
+    Path('subdir').mkdir()
+    os.chdir('subdir')
+
+    dag = spec.to_dag()
+
+    expected = Path(tmp_nbs, '.ploomber', 'metadata.db').resolve()
+    assert dag._params.metadata_store.path == expected
+
+
 @pytest.mark.parametrize(
     'spec',
     [
@@ -272,6 +272,59 @@ def some_hook():
     assert t.on_failure
 
 
+def test_resources(tmp_directory, tmp_imports):
+    task = {
+        'product': 'notebook.ipynb',
+        'source': 'source.py',
+        'resources': {
+            'db': 1,
+            'memory_gb': 16
+        },
+    }
+    meta = Meta.default_meta()
+    meta['extract_product'] = False
+
+    Path('source.py').write_text("""
+# + tags=["parameters"]
+# some code
+    """)
+
+    dag = DAG()
+    t, _ = TaskSpec(task, meta, project_root='.').to_task(dag)
+
+    assert t.resources == {'db': 1, 'memory_gb': 16}
+
+
+@pytest.mark.parametrize('resources, error', [
+    [['db'], TypeError],
+    [{
+        'db': -1
+    }, ValueError],
+    [{
+        'db': 'one'
+    }, ValueError],
+])
+def test_error_on_invalid_resources(tmp_directory, tmp_imports, resources,
+                                    error):
+    task = {
+        'product': 'notebook.ipynb',
+        'source': 'source.py',
+        'resources': resources,
+    }
+    meta = Meta.default_meta()
+    meta['extract_product'] = False
+
+    Path('source.py').write_text("""
+# + tags=["parameters"]
+# some code
+    """)
+
+    with pytest.raises(error) as excinfo:
+        TaskSpec(task, meta, project_root='.').to_task(DAG())
+
+    assert "task 'source'" in str(excinfo.value)
+
+
 def test_loads_serializer_and_unserializer(backup_online, tmp_imports):
     meta = Meta.default_meta()
     meta['extract_product'] = False
@@ -540,6 +593,28 @@ def test_grid_with_hook(backup_spec_with_functions_flat, tmp_imports):
     assert all(t.on_failure.callable is hooks.on_failure for t in dag.values())
 
 
+def test_grid_with_resources(backup_spec_with_functions_flat, tmp_imports):
+    grid_spec = {
+        'source': 'my_tasks_flat.raw.function',
+        'name': 'function-',
+        'product': 'some_file.txt',
+        'grid': {
+            'a': [1, 2],
+        },
+        'resources': {
+            'memory_gb': 8
+        },
+    }
+
+    meta = Meta.default_meta()
+    dag = DAG()
+
+    TaskSpec(grid_spec, meta, project_root='.').to_task(dag=dag)
+
+    assert len(dag) == 2
+    assert all(t.resources == {'memory_gb': 8} for t in dag.values())
+
+
 def test_grid_with_hook_lazy_import(backup_spec_with_functions_flat,
                                     tmp_imports):
     grid_spec = {
@@ -0,0 +1,166 @@
+import datetime
+from decimal import Decimal
+from sqlite3 import connect
+
+import pytest
+
+from ploomber import DAG
+from ploomber.clients import DBAPIClient, SQLAlchemyClient
+from ploomber.products import SQLiteRelation
+from ploomber.tasks import SQLTransfer
+from ploomber.tasks import _bulk
+
+
+class FakeCursor:
+    def __init__(self, names):
+        self.description = [(name, None) for name in names]
+
+
+def test_copy_text():
+    rows = [
+        (1, 'a\tb', None, b'\x00\xff', True),
+        (2.5, 'back\\slash\nline', Decimal('1.1'),
+         datetime.date(2020, 1, 1), False),
+    ]
+
+    assert _bulk.copy_text(rows) == (
+        '1\ta\\tb\t\\N\t\\\\x00ff\tTrue\n'
+        '2.5\tback\\\\slash\\nline\t1.1\t2020-01-01\tFalse\n')
+
+
+@pytest.mark.parametrize('flavor, expected', [
+    ['sqlite', ['INTEGER', 'REAL', 'TEXT', 'TEXT', 'INTEGER']],
+    ['postgresql', ['BIGINT', 'DOUBLE PRECISION', 'TEXT', 'TEXT', 'BOOLEAN']],
+])
+def test_column_types(flavor, expected):
+    cursor = FakeCursor(['a', 'b', 'c', 'd', 'e'])
+    rows = [(None, 1.0, 'x', None, True), (1, None, None, None, False)]
+
+    types = _bulk.column_types(cursor, rows)
+
+    assert _bulk.sql_types(types, flavor) == expected
+
+
+@pytest.mark.parametrize('chunksize', [1, 2, 10])
+def test_transfer_with_dbapiclient(tmp_directory, chunksize):
+    conn = connect('in.db')
+    conn.execute('CREATE TABLE numbers (a INTEGER, b REAL, "my col" TEXT)')
+    rows = [(1, 1.5, 'a'), (2, None, None), (None, 3.5, "it's")]
+    conn.executemany('INSERT INTO numbers VALUES (?, ?, ?)', rows)
+    conn.commit()
+    conn.close()
+
+    client_in = DBAPIClient(connect, dict(database='in.db'))
+    client_out = SQLAlchemyClient('sqlite:///out.db')
+
+    dag = DAG()
+    SQLTransfer('SELECT * FROM numbers',
+                SQLiteRelation((None, 'numbers', 'table'),
+                               client=client_out),
+                dag,
+                name='transfer',
+                client=client_in,
+                chunksize=chunksize)
+    dag.build()
+
+    conn = connect('out.db')
+    transferred = conn.execute('SELECT * FROM numbers').fetchall()
+    sql = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'numbers'").fetchone()[0]
+    conn.close()
+
+    assert transferred == rows
+    assert sql == ('CREATE TABLE "numbers" ("a" INTEGER, "b" REAL, '
+                   '"my col" TEXT)')
+
+
+def test_transfer_empty_result(tmp_directory):
+    conn = connect('in.db')
+    conn.execute('CREATE TABLE numbers (a INTEGER)')
+    conn.commit()
+    conn.close()
+
+    client_in = DBAPIClient(connect, dict(database='in.db'))
+    client_out = DBAPIClient(connect, dict(database='out.db'))
+
+    dag = DAG()
+    SQLTransfer('SELECT * FROM numbers',
+                SQLiteRelation((None, 'numbers', 'table'),
+                               client=client_out),
+                dag,
+                name='transfer',
+                client=client_in)
+    dag.build()
+
+    conn = connect('out.db')
+    count = conn.execute('SELECT COUNT(*) FROM numbers').fetchone()[0]
+    conn.close()
+
+    assert count == 0
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, query, params):
+        self.calls.append((query, params))
+
+
+@pytest.mark.parametrize('paramstyle, query, params', [
+    ['qmark', 'INSERT INTO t ("a", "b") VALUES (?, ?), (?, ?)', [1, 2, 3, 4]],
+    [
+        'numeric', 'INSERT INTO t ("a", "b") VALUES (:1, :2), (:3, :4)',
+        [1, 2, 3, 4]
+    ],
+    [
+        'named', 'INSERT INTO t ("a", "b") VALUES (:c0, :c1), (:c2, :c3)',
+        dict(c0=1, c1=2, c2=3, c3=4)
+    ],
+])
+def test_insert_values(monkeypatch, paramstyle, query, params):
+    monkeypatch.setattr(_bulk, '_MAX_PARAMS', 4)
+    cursor = RecordingCursor()
+
+    _bulk.insert_values(cursor, 't', ['a', 'b'], [[(1, 2), (3, 4), (5, 6)]],
+                        paramstyle)
+
+    assert cursor.calls[0] == (query, params)
+    assert len(cursor.calls) == 2
+
+
+@pytest.mark.parametrize('size', [1, 5, 8192, -1])
+def test_copy_stream(size):
+    batches = [[(1, 'a'), (2, None)], [], [(3, 'tab\there')]]
+    stream = _bulk.CopyStream(batches)
+
+    chunks = iter(lambda: stream.read(size), '')
+
+    assert ''.join(chunks) == ''.join(_bulk.copy_text(b) for b in batches)
+
+
+def test_copy_stream_encodes_lazily():
+    def batches():
+        yield [(1, )]
+        raise ValueError('should not read the second batch')
+
+    stream = _bulk.CopyStream(batches())
+
+    assert stream.read(1) == '1'
+
+
+def test_read_parquet_row_groups(tmp_directory):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.table({'a': [1, 2, 3, 4, 5], 'b': ['a', 'b', None, 'd', 'e']})
+    pq.write_table(table, 'data.parquet', row_group_size=2)
+
+    names, types, batches = _bulk.read_parquet('data.parquet',
+                                               batch_size=10,
+                                               columns=['b'])
+
+    assert names == ['b']
+    assert types == [str]
+    assert list(batches) == [[('a', ), ('b', )], [(None, ), ('d', )],
+                             [('e', )]]
@@ -1,4 +1,7 @@
+import os
 import sys
+import threading
+import subprocess
 from pathlib import Path, PurePosixPath
 from unittest.mock import ANY, Mock
 
@@ -10,12 +13,14 @@ from debuglater.pydump import debug_dump
 
 from ploomber import DAG, DAGConfigurator
 from ploomber.clients import LocalStorageClient
+from ploomber.constants import TaskStatus
 from ploomber.exceptions import (DAGBuildError, DAGRenderError, TaskBuildError,
                                  TaskInitializationError)
-from ploomber.executors import Serial
+from ploomber.executors import Serial, Parallel
 from ploomber.products import File
 from ploomber.sources.nb_utils import find_cell_with_tag
-from ploomber.tasks import NotebookRunner, notebook
+from ploomber.tasks import (NotebookRunner, PythonCallable, notebook,
+                            _kernel_pool)
 
 
 def fake_from_notebook_node(self, nb, resources):
@@ -1354,3 +1359,475 @@ def test_notebook_add_parameters_cell_if_missing(tmp_directory, code, name,
     fmt, _ = (('ipynb', None) if path.suffix == '.ipynb' else
               jupytext.guess_format(path.read_text(), ext=path.suffix))
     assert fmt == expected_fmt
+
+
+_kernel_pool_nb = """
+# + tags=["parameters"]
+upstream = None
+product = None
+
+# +
+import os
+from pathlib import Path
+
+Path(product['data']).write_text(
+    f'{os.getpid()},{"leftover" in globals()},{Path("input.txt").is_file()}')
+leftover = 1
+"""
+
+
+@pytest.fixture
+def kernel_pool():
+    yield
+    _kernel_pool.close_pools()
+
+
+def _make_kernel_pool_dag(n, **options):
+    dag = DAG()
+    Path('nb.py').write_text(_kernel_pool_nb)
+
+    for i in range(n):
+        NotebookRunner(Path('nb.py'), {
+            'nb': File(f'out/{i}.ipynb'),
+            'data': File(f'out/{i}.txt')
+        },
+                       dag=dag,
+                       name=f'nb-{i}',
+                       papermill_params=dict(engine_name='kernel_pool',
+                                             **options))
+
+    return dag
+
+
+def _read_kernel_pool_outputs(n):
+    outputs = []
+
+    for i in range(n):
+        pid, leftover, input_exists = Path(f'out/{i}.txt').read_text().split(
+            ',')
+        outputs.append((int(pid), leftover == 'True', input_exists == 'True'))
+
+    return outputs
+
+
+def test_kernel_pool_is_imported_only_when_used():
+    code = ('import sys, ploomber, ploomber.tasks; '
+            'print("ploomber.tasks._kernel_pool" in sys.modules)')
+    out = subprocess.run([sys.executable, '-c', code],
+                         check=True,
+                         capture_output=True,
+                         text=True).stdout
+
+    assert out.strip() == 'False'
+
+
+def test_kernel_pool_spawned_worker(tmp_directory, kernel_pool):
+    dag = _make_kernel_pool_dag(2)
+    # spawned workers do not inherit the engine registered by the parent
+    dag.executor = Parallel(processes=1, start_method='spawn')
+    dag.build()
+
+    assert len(_read_kernel_pool_outputs(2)) == 2
+
+
+def test_kernel_pool_reuses_kernel(tmp_directory, kernel_pool):
+    _make_kernel_pool_dag(3).build()
+
+    outputs = _read_kernel_pool_outputs(3)
+
+    assert len({pid for pid, _, _ in outputs}) == 1
+    # variables from previous notebooks are deleted
+    assert not any(leftover for _, leftover, _ in outputs)
+
+
+def test_kernel_pool_parallel(tmp_directory, kernel_pool):
+    dag = _make_kernel_pool_dag(3)
+    dag.executor = Parallel(processes=1)
+    dag.build()
+
+    outputs = _read_kernel_pool_outputs(3)
+
+    # kernels are kept by the worker process
+    assert len({pid for pid, _, _ in outputs}) == 1
+    assert not any(leftover for _, leftover, _ in outputs)
+
+
+@pytest.mark.parametrize('options', [
+    dict(max_tasks_per_kernel=1),
+    dict(max_memory_per_kernel=1),
+    dict(reset='restart'),
+])
+def test_kernel_pool_replaces_kernel(tmp_directory, kernel_pool, options):
+    _make_kernel_pool_dag(3, **options).build()
+
+    outputs = _read_kernel_pool_outputs(3)
+
+    assert len({pid for pid, _, _ in outputs}) == 3
+
+
+def test_kernel_pool_max_tasks_per_kernel(tmp_directory, kernel_pool):
+    _make_kernel_pool_dag(4, max_tasks_per_kernel=2).build()
+
+    pids = [pid for pid, _, _ in _read_kernel_pool_outputs(4)]
+
+    assert pids[0] == pids[1]
+    assert pids[2] == pids[3]
+    assert pids[0] != pids[2]
+
+
+def test_kernel_pool_local_execution(tmp_directory, kernel_pool):
+    Path('nb').mkdir()
+    Path('nb', 'input.txt').touch()
+    Path('nb', 'nb.py').write_text(_kernel_pool_nb)
+
+    dag = DAG()
+
+    for i in range(2):
+        NotebookRunner(Path('nb', 'nb.py'), {
+            'nb': File(f'out/{i}.ipynb'),
+            'data': File(Path(f'out/{i}.txt').resolve())
+        },
+                       dag=dag,
+                       name=f'nb-{i}',
+                       local_execution=i == 0,
+                       papermill_params=dict(engine_name='kernel_pool'))
+
+    dag.build()
+
+    (pid, _, input_exists), (pid_other, _, input_exists_other) = \
+        _read_kernel_pool_outputs(2)
+
+    assert pid == pid_other
+    assert input_exists
+    # runs in the current directory again
+    assert not input_exists_other
+
+
+def test_kernel_pool_preload(tmp_directory, kernel_pool):
+    Path('nb.py').write_text("""
+# + tags=["parameters"]
+product = None
+
+# +
+import sys
+from pathlib import Path
+Path(product['data']).write_text(str('csv' in sys.modules))
+""")
+
+    dag = DAG()
+    NotebookRunner(Path('nb.py'), {
+        'nb': File('out.ipynb'),
+        'data': File('data.txt')
+    },
+                   dag=dag,
+                   papermill_params=dict(engine_name='kernel_pool',
+                                         preload=['csv']))
+    dag.build()
+
+    assert Path('data.txt').read_text() == 'True'
+
+
+def test_kernel_pool_error_in_notebook(tmp_directory, kernel_pool):
+    Path('nb.py').write_text("""
+# + tags=["parameters"]
+product = None
+
+# +
+raise ValueError('some error')
+""")
+
+    dag = DAG()
+    NotebookRunner(Path('nb.py'),
+                   File('out.ipynb'),
+                   dag=dag,
+                   papermill_params=dict(engine_name='kernel_pool'))
+
+    with pytest.raises(DAGBuildError) as excinfo:
+        dag.build()
+
+    assert 'some error' in str(excinfo.value)
+
+    # the kernel goes back to the pool
+    pool, = [pool for _, pool in _kernel_pool._pools.values()]
+    assert len(pool._idle) == 1
+
+
+@pytest.mark.parametrize('options, message', [
+    [dict(pool_size=0), 'pool_size must be a positive integer'],
+    [dict(preload='pandas'), 'preload must be a list of module names'],
+    [
+        dict(max_tasks_per_kernel=0),
+        'max_tasks_per_kernel must be a positive integer or None'
+    ],
+    [
+        dict(max_memory_per_kernel=-1),
+        'max_memory_per_kernel must be a positive number or None'
+    ],
+    [dict(reset='something'), 'reset must be one of'],
+])
+def test_kernel_pool_validates_options(tmp_directory, options, message):
+    Path('nb.py').write_text(_kernel_pool_nb)
+
+    with pytest.raises(ValueError) as excinfo:
+        NotebookRunner(Path('nb.py'),
+                       File('out.ipynb'),
+                       dag=DAG(),
+                       papermill_params=dict(engine_name='kernel_pool',
+                                             **options))
+
+    assert message in str(excinfo.value)
+
+
+def test_kernel_pool_error_if_debug_mode(tmp_directory):
+    Path('nb.py').write_text(_kernel_pool_nb)
+
+    with pytest.raises(ValueError) as excinfo:
+        NotebookRunner(Path('nb.py'),
+                       File('out.ipynb'),
+                       dag=DAG(),
+                       papermill_params=dict(engine_name='kernel_pool'),
+                       debug_mode='later')
+
+    assert "Cannot use 'kernel_pool' engine" in str(excinfo.value)
+
+
+_inprocess_nb = """
+# + tags=["parameters"]
+upstream = None
+product = None
+
+# +
+import os
+from pathlib import Path
+
+print('some output')
+Path(product['data']).write_text(str(os.getpid()))
+os.getpid()
+"""
+
+
+def test_execute_in_process(tmp_directory):
+    Path('nb.py').write_text(_inprocess_nb)
+    dag = DAG()
+    NotebookRunner(Path('nb.py'), {
+        'nb': File('out.ipynb'),
+        'data': File('data.txt')
+    },
+                   dag=dag,
+                   executor='inprocess')
+
+    dag.build()
+
+    assert Path('data.txt').read_text() == str(os.getpid())
+
+    nb = nbformat.read('out.ipynb', as_version=nbformat.NO_CONVERT)
+    stream, result = nb.cells[-1].outputs
+
+    assert stream['text'] == 'some output\n'
+    assert result['data']['text/plain'] == str(os.getpid())
+    assert result['execution_count'] == nb.cells[-1].execution_count
+
+
+def test_execute_in_process_converts_output(tmp_directory):
+    Path('nb.py').write_text(_inprocess_nb)
+    dag = DAG()
+    NotebookRunner(Path('nb.py'), {
+        'nb': File('out.html'),
+        'data': File('data.txt')
+    },
+                   dag=dag,
+                   executor='inprocess')
+
+    dag.build()
+
+    assert 'some output' in Path('out.html').read_text()
+
+
+def test_execute_in_process_local_execution(tmp_directory):
+    Path('nb').mkdir()
+    Path('nb', 'nb.py').write_text("""
+# + tags=["parameters"]
+upstream = None
+product = None
+
+# +
+from pathlib import Path
+Path(product['data']).write_text(str(Path('.').resolve()))
+""")
+    dag = DAG()
+    NotebookRunner(Path('nb', 'nb.py'), {
+        'nb': File('out.ipynb'),
+        'data': File(Path('data.txt').resolve())
+    },
+                   dag=dag,
+                   local_execution=True,
+                   executor='inprocess')
+
+    dag.build()
+
+    assert Path('data.txt').read_text() == str(Path('nb').resolve())
+
+
+def test_execute_in_process_with_error(tmp_directory):
+    Path('nb.py').write_text("""
+# + tags=["parameters"]
+product = None
+
+# +
+print('before error')
+raise ValueError('some error')
+
+# +
+print('not executed')
+""")
+    dag = DAG()
+    NotebookRunner(Path('nb.py'),
+                   File('out.ipynb'),
+                   dag=dag,
+                   executor='inprocess')
+
+    with pytest.raises(DAGBuildError) as excinfo:
+        dag.build()
+
+    assert 'Partially executed notebook available at out.ipynb' in str(
+        excinfo.value)
+    assert "ValueError: some error" in str(excinfo.value)
+
+    nb = nbformat.read('out.ipynb', as_version=nbformat.NO_CONVERT)
+    failed, not_executed = nb.cells[-2:]
+    stream, error = failed.outputs
+
+    assert stream['text'] == 'before error\n'
+    assert error['ename'] == 'ValueError'
+    assert not not_executed.outputs
+
+
+def test_error_on_invalid_executor(tmp_directory):
+    Path('nb.py').write_text(_inprocess_nb)
+
+    with pytest.raises(ValueError) as excinfo:
+        NotebookRunner(Path('nb.py'),
+                       File('out.ipynb'),
+                       dag=DAG(),
+                       executor='something')
+
+    assert "'something' is an invalid value for 'executor'" in str(
+        excinfo.value)
+
+
+def test_error_if_in_process_and_debug_mode(tmp_directory):
+    Path('nb.py').write_text(_inprocess_nb)
+
+    with pytest.raises(ValueError) as excinfo:
+        NotebookRunner(Path('nb.py'),
+                       File('out.ipynb'),
+                       dag=DAG(),
+                       executor='inprocess',
+                       debug_mode='later')
+
+    assert '"debug_mode" is not supported' in str(excinfo.value)
+
+
+_deferred_nb = """
+# + tags=["parameters"]
+upstream = None
+product = None
+
+# +
+from pathlib import Path
+Path(product['data']).write_text('data')
+"""
+
+_downstream_started = threading.Event()
+
+
+def _downstream(upstream, product):
+    _downstream_started.set()
+    Path(product).write_text(Path(upstream['nb']['data']).read_text())
+
+
+def _make_deferred_dag(executor):
+    dag = DAG(executor=executor)
+    Path('nb.py').write_text(_deferred_nb)
+    nb = NotebookRunner(Path('nb.py'), {
+        'nb_ipynb': File('out/nb.ipynb'),
+        'nb_html': File('out/report.html'),
+        'data': File('out/data.txt')
+    },
+                        dag=dag,
+                        name='nb',
+                        nb_product_key=['nb_ipynb', 'nb_html'],
+                        executor='inprocess',
+                        defer_conversion=True)
+    nb >> PythonCallable(_downstream, File('out/final.txt'), dag=dag)
+    return dag
+
+
+@pytest.mark.parametrize('executor', [
+    Serial(build_in_subprocess=False),
+    Serial(build_in_subprocess=True),
+    Parallel(processes=2),
+],
+                         ids=['serial', 'serial-subprocess', 'parallel'])
+def test_defer_conversion(tmp_directory, executor):
+    _make_deferred_dag(executor).build()
+
+    assert Path('out/report.html').read_text().startswith('<!DOCTYPE html>')
+    assert nbformat.read('out/nb.ipynb', as_version=nbformat.NO_CONVERT)
+    assert Path('out/final.txt').read_text() == 'data'
+
+    # converting the notebook does not make the task outdated
+    dag = _make_deferred_dag(executor)
+    dag.render()
+    assert dag['nb'].exec_status == TaskStatus.Skipped
+
+
+def test_defer_conversion_downstream_does_not_wait(tmp_directory,
+                                                   monkeypatch):
+    _downstream_started.clear()
+    started = []
+    convert = notebook.NotebookConverter.convert
+
+    def slow_convert(self):
+        started.append(_downstream_started.wait(timeout=30))
+        convert(self)
+
+    monkeypatch.setattr(notebook.NotebookConverter, 'convert', slow_convert)
+
+    _make_deferred_dag(Serial(build_in_subprocess=False)).build()
+
+    # html and ipynb products (the latter is a no-op)
+    assert started == [True, True]
+    assert Path('out/report.html').read_text().startswith('<!DOCTYPE html>')
+
+
+def test_defer_conversion_error(tmp_directory, monkeypatch):
+    def fail(self):
+        raise ValueError('conversion failed')
+
+    monkeypatch.setattr(notebook.NotebookConverter, 'convert', fail)
+    dag = _make_deferred_dag(Serial(build_in_subprocess=False))
+
+    with pytest.raises(DAGBuildError) as excinfo:
+        dag.build()
+
+    message = str(excinfo.value)
+    assert "Error converting the output notebook of task 'nb'" in message
+    assert 'ValueError: conversion failed' in message
+    # downstream tasks are not affected
+    assert dag['_downstream'].exec_status == TaskStatus.Executed
+
+    # the metadata is deleted, so the task runs again
+    monkeypatch.undo()
+    dag = _make_deferred_dag(Serial(build_in_subprocess=False))
+    dag.render()
+    assert dag['nb'].exec_status == TaskStatus.WaitingExecution
+
+
+def test_converts_when_building_task_without_executor(tmp_directory):
+    dag = _make_deferred_dag(Serial(build_in_subprocess=False))
+    dag.render()
+
+    dag['nb'].build()
+
+    assert Path('out/report.html').read_text().startswith('<!DOCTYPE html>')
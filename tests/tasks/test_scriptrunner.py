@@ -1,6 +1,7 @@
 """
 Tests for ScriptRunner
 """
+import os
 from pathlib import Path
 
 import jupytext
@@ -168,3 +169,124 @@ def test_execute_script_add_parameters_cell_if_missing(tmp_directory, code,
     fmt, _ = (('ipynb', None) if path.suffix == '.ipynb' else
               jupytext.guess_format(path.read_text(), ext=path.suffix))
     assert fmt == expected_fmt
+
+
+def test_execute_script_in_process(tmp_directory):
+    Path('script.py').write_text("""
+# %% tags=["parameters"]
+upstream = None
+
+# %%
+import os
+from pathlib import Path
+Path(product).write_text(str(os.getpid()))
+""")
+    dag = DAG()
+    ScriptRunner(Path('script.py'),
+                 File('output.txt'),
+                 dag=dag,
+                 executor='inprocess')
+
+    dag.build()
+
+    assert Path('output.txt').read_text() == str(os.getpid())
+    # does not leak variables
+    assert 'product' not in globals()
+
+
+def test_execute_script_in_process_local_execution(tmp_directory):
+    Path('scripts').mkdir()
+    Path('scripts', 'script.py').write_text("""
+# %% tags=["parameters"]
+upstream = None
+
+# %%
+from pathlib import Path
+Path(product).write_text(str(Path('.').resolve()))
+""")
+    dag = DAG()
+    ScriptRunner(Path('scripts', 'script.py'),
+                 File(Path('output.txt').resolve()),
+                 dag=dag,
+                 local_execution=True,
+                 executor='inprocess')
+
+    dag.build()
+
+    assert Path('output.txt').read_text() == str(Path('scripts').resolve())
+    # goes back to the original directory
+    assert Path('output.txt').is_file()
+
+
+@pytest.mark.parametrize('script, message', [
+    ['script-with-exception.py', 'ValueError: error'],
+    ['script-with-magics.py', 'IPython magics are not supported'],
+])
+def test_execute_script_in_process_with_error(tmp_env, script, message):
+    dag = DAG()
+    ScriptRunner(Path(script),
+                 File('output.txt'),
+                 dag=dag,
+                 executor='inprocess')
+
+    with pytest.raises(DAGBuildError) as excinfo:
+        dag.build()
+
+    assert message in str(excinfo.value)
+
+
+@pytest.mark.parametrize('code, succeeds', [
+    ['sys.exit()', True],
+    ['sys.exit(0)', True],
+    ['sys.exit(1)', False],
+])
+def test_execute_script_in_process_with_exit(tmp_directory, code, succeeds):
+    Path('script.py').write_text(f"""
+# %% tags=["parameters"]
+upstream = None
+
+# %%
+import sys
+from pathlib import Path
+Path(product).touch()
+{code}
+
+# %%
+raise ValueError('should not run')
+""")
+    dag = DAG()
+    ScriptRunner(Path('script.py'),
+                 File('output.txt'),
+                 dag=dag,
+                 executor='inprocess')
+
+    if succeeds:
+        dag.build()
+    else:
+        with pytest.raises(DAGBuildError):
+            dag.build()
+
+
+def test_execute_script_in_process_only_python(tmp_env):
+    dag = DAG()
+    ScriptRunner(Path('script.R'),
+                 File('output.txt'),
+                 dag=dag,
+                 executor='inprocess')
+
+    with pytest.raises(DAGBuildError) as excinfo:
+        dag.build()
+
+    assert ("ScriptRunner with executor='inprocess' only works with Python"
+            in str(excinfo.value))
+
+
+def test_error_on_invalid_executor(tmp_env):
+    with pytest.raises(ValueError) as excinfo:
+        ScriptRunner(Path('script.py'),
+                     File('output.txt'),
+                     dag=DAG(),
+                     executor='something')
+
+    assert "'something' is an invalid value for 'executor'" in str(
+        excinfo.value)
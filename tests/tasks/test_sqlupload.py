@@ -11,6 +11,7 @@ from ploomber.products import (PostgresRelation, File, GenericSQLRelation,
                                SQLiteRelation)
 from ploomber.tasks import SQLUpload, PythonCallable
 from ploomber.clients import SQLAlchemyClient
+from ploomber.exceptions import DAGBuildError
 
 
 def make_data(product):
@@ -160,3 +161,111 @@ def test_custom_io_handler(tmp_directory):
     client.close()
 
     assert other.equals(df)
+
+
+@pytest.mark.parametrize('method', [None, 'executemany', 'values'])
+@pytest.mark.parametrize('chunksize', [None, 2])
+def test_bulk_upload_csv(tmp_directory, method, chunksize, caplog):
+    client = SQLAlchemyClient('sqlite:///database.db')
+    dag = DAG()
+    dag.clients[SQLUpload] = client
+    dag.clients[SQLiteRelation] = client
+
+    df = pd.DataFrame({
+        'a': [1, 2, None, 4, 5],
+        'b': ['a', None, 'c', 'd', 'e'],
+        'c': [0.5, 1.5, 2.5, None, 4.5],
+    })
+    df.to_csv('data.csv', index=False)
+
+    SQLUpload('data.csv',
+              SQLiteRelation(('My Table', 'table')),
+              dag=dag,
+              name='task',
+              chunksize=chunksize,
+              method=method,
+              to_sql_kwargs=dict(if_exists='replace', index=False))
+
+    with caplog.at_level('INFO'):
+        dag.build()
+
+    other = pd.read_sql('SELECT * FROM "My Table"', con=client.engine)
+
+    client.close()
+
+    assert other.equals(df)
+    assert f'with {method or "values"}...' in caplog.text
+
+
+def test_bulk_upload_parquet(tmp_directory):
+    client = SQLAlchemyClient('sqlite:///database.db')
+    dag = DAG()
+    dag.clients[SQLUpload] = client
+    dag.clients[SQLiteRelation] = client
+
+    df = pd.DataFrame({'a': [1, 2, 3], 'b': ['a', None, 'c']})
+    Path('data.parquet').mkdir()
+    df.iloc[:2].to_parquet('data.parquet/0.parquet', index=False)
+    df.iloc[2:].to_parquet('data.parquet/1.parquet', index=False)
+
+    SQLUpload('data.parquet',
+              SQLiteRelation(('numbers', 'table')),
+              dag=dag,
+              name='task',
+              chunksize=1)
+
+    dag.build()
+
+    other = pd.read_sql('SELECT * FROM numbers', con=client.engine)
+
+    client.close()
+
+    assert other.equals(df)
+
+
+def test_bulk_upload_if_exists(tmp_directory):
+    client = SQLAlchemyClient('sqlite:///database.db')
+    dag = DAG()
+    dag.clients[SQLUpload] = client
+    dag.clients[SQLiteRelation] = client
+
+    pd.DataFrame({'a': [1, 2, 3]}).to_csv('data.csv', index=False)
+
+    task = SQLUpload('data.csv',
+                     SQLiteRelation(('numbers', 'table')),
+                     dag=dag,
+                     name='task',
+                     to_sql_kwargs=dict(if_exists='append'))
+
+    dag.build()
+    dag.build(force=True)
+
+    task.to_sql_kwargs = dict(if_exists='fail')
+
+    with pytest.raises(DAGBuildError) as excinfo:
+        dag.build(force=True)
+
+    rows = pd.read_sql('SELECT * FROM numbers', con=client.engine)
+
+    client.close()
+
+    assert rows.a.tolist() == [1, 2, 3, 1, 2, 3]
+    assert 'already exists' in str(excinfo.value)
+
+
+@pytest.mark.parametrize('kwargs, error', [
+    [dict(method='bulk'), 'method must be one of'],
+    [
+        dict(method='values', to_sql_kwargs=dict(dtype={'a': 'TEXT'})),
+        'use method="pandas"'
+    ],
+])
+def test_validates_method(kwargs, error):
+    with pytest.raises(ValueError) as excinfo:
+        SQLUpload('data.csv',
+                  SQLiteRelation(('numbers', 'table')),
+                  dag=DAG(),
+                  name='task',
+                  **kwargs)
+
+    assert error in str(excinfo.value)
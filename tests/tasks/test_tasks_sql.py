@@ -9,7 +9,7 @@ from ploomber.tasks import SQLDump, SQLTransfer, SQLScript, PythonCallable
 from ploomber.products import File, SQLiteRelation
 from ploomber.clients import SQLAlchemyClient, DBAPIClient
 from ploomber.executors import Serial
-from ploomber.exceptions import DAGBuildError
+from ploomber.exceptions import DAGBuildError, DAGRenderError
 from ploomber import io
 
 import pytest
@@ -119,6 +119,168 @@ def test_can_dump_sqlite_to_csv(tmp_directory):
     assert dump.equals(db)
 
 
+def test_sqldump_writes_chunks_in_background(tmp_directory, sample_data):
+    client = DBAPIClient(connect, dict(database='database.db'))
+
+    dag = DAG()
+    SQLDump('SELECT * FROM numbers',
+            File('dump'),
+            dag,
+            name='dump',
+            client=client,
+            chunksize=10,
+            io_handler=io.CSVIO,
+            write_queue_size=2)
+
+    dag.build()
+
+    dump = pd.concat(
+        [pd.read_csv(Path('dump', f'{i}.csv')) for i in range(10)],
+        ignore_index=True)
+    db = pd.read_sql_query('SELECT * FROM numbers',
+                           connect('database.db'))
+
+    client.close()
+
+    assert dump.equals(db)
+
+
+class FailingIO(io.CSVIO):
+    def write(self, data, headers):
+        if self.i == 2:
+            raise ValueError('cannot write chunk')
+
+        super().write(data, headers)
+
+
+def test_sqldump_shows_error_from_background_writer(tmp_directory,
+                                                    sample_data):
+    client = DBAPIClient(connect, dict(database='database.db'))
+
+    dag = DAG()
+    SQLDump('SELECT * FROM numbers',
+            File('dump'),
+            dag,
+            name='dump',
+            client=client,
+            chunksize=10,
+            io_handler=FailingIO,
+            write_queue_size=1)
+
+    with pytest.raises(DAGBuildError) as excinfo:
+        dag.build()
+
+    client.close()
+
+    assert 'cannot write chunk' in str(excinfo.value)
+
+
+def _read_partitions(path):
+    return pd.concat([pd.read_csv(f) for f in sorted(Path(path).iterdir())],
+                     ignore_index=True)
+
+
+@pytest.mark.parametrize('partitions, n', [
+    [['a < 50', 'a >= 50'], 2],
+    [{
+        'column': 'a',
+        'n': 3
+    }, 3],
+])
+@pytest.mark.parametrize('chunksize', [None, 10])
+def test_sqldump_partitions(tmp_directory, sample_data, partitions, n,
+                            chunksize):
+    client = SQLAlchemyClient('sqlite:///database.db')
+
+    dag = DAG()
+    SQLDump('SELECT * FROM numbers WHERE {{partition}}',
+            File('dump'),
+            dag,
+            name='dump',
+            client=client,
+            chunksize=chunksize,
+            io_handler=io.CSVIO,
+            partitions=partitions)
+
+    dag.build()
+
+    files = {f.name.split('-')[0] for f in Path('dump').iterdir()}
+    dump = _read_partitions('dump').sort_values('a', ignore_index=True)
+    db = pd.read_sql_query('SELECT * FROM numbers', connect('database.db'))
+
+    client.close()
+
+    assert files == {str(i) for i in range(n)}
+    assert dump.equals(db)
+
+
+def test_sqldump_range_partitions_include_nulls(tmp_directory):
+    conn = connect('database.db')
+    conn.execute('CREATE TABLE numbers (a INTEGER)')
+    conn.executemany('INSERT INTO numbers VALUES (?)',
+                     [(1, ), (2, ), (None, ), (10, )])
+    conn.commit()
+    conn.close()
+
+    client = DBAPIClient(connect, dict(database='database.db'))
+
+    dag = DAG()
+    SQLDump('SELECT * FROM numbers WHERE {{partition}}',
+            File('dump'),
+            dag,
+            name='dump',
+            client=client,
+            chunksize=None,
+            io_handler=io.CSVIO,
+            partitions=dict(column='a', n=2))
+
+    dag.build()
+    client.close()
+
+    first = pd.read_csv(Path('dump', '0-0.csv'))
+    second = pd.read_csv(Path('dump', '1-0.csv'))
+
+    assert set(first.a) == {1, 2}
+    assert len(second) == 2
+    assert second.a.max() == 10
+    assert second.a.isna().sum() == 1
+
+
+def test_sqldump_partitions_require_placeholder(tmp_directory, sample_data):
+    client = DBAPIClient(connect, dict(database='database.db'))
+
+    dag = DAG()
+    SQLDump('SELECT * FROM numbers',
+            File('dump'),
+            dag,
+            name='dump',
+            client=client,
+            partitions=['a < 50', 'a >= 50'])
+
+    with pytest.raises(DAGRenderError) as excinfo:
+        dag.render()
+
+    client.close()
+
+    assert "unused parameters: {'partition'}" in str(excinfo.value)
+
+
+@pytest.mark.parametrize('partitions, error', [
+    [dict(column='a'), 'must have keys "column" and "n"'],
+    [dict(column='a', n=0), 'must be an integer greater than zero'],
+    [[], 'must be a non-empty list'],
+])
+def test_sqldump_validates_partitions(partitions, error):
+    with pytest.raises(ValueError) as excinfo:
+        SQLDump('SELECT * FROM numbers WHERE {{partition}}',
+                File('dump'),
+                DAG(),
+                name='dump',
+                partitions=partitions)
+
+    assert error in str(excinfo.value)
+
+
 def test_sqldump_with_dbapiclient(tmp_directory):
     client = DBAPIClient(connect, dict(database='my_db.db'))
 
@@ -295,6 +457,140 @@ def test_sql_script_shows_executed_code_if_fails(tmp_directory, sample_data):
     assert 'near "SOME": syntax error' in str(excinfo.value)
 
 
+def test_sql_script_logs_slowest_statements(tmp_directory, sample_data,
+                                            caplog):
+    dag = DAG(executor=Serial(build_in_subprocess=False))
+
+    client = SQLAlchemyClient('sqlite:///database.db', batch_size=10)
+    dag.clients[SQLScript] = client
+    dag.clients[SQLiteRelation] = client
+
+    SQLScript(
+        'DROP TABLE IF EXISTS {{product}};'
+        'CREATE TABLE {{product}} AS SELECT * FROM numbers;'
+        'DELETE FROM {{product}} WHERE a > 10',
+        SQLiteRelation(('subset', 'table')),
+        dag=dag,
+        name='task')
+
+    with caplog.at_level('INFO'):
+        dag.build()
+
+    records = [
+        r.getMessage() for r in caplog.records
+        if r.getMessage().startswith('Slowest statements in task')
+    ]
+
+    assert len(records) == 1
+    assert '(statement 1): CREATE TABLE subset AS SELECT' in records[0]
+
+    with connect('database.db') as conn:
+        assert conn.execute('SELECT COUNT(*) FROM subset').fetchone() == (11, )
+
+
+def test_can_dump_sqlite_to_single_parquet_file(tmp_directory,
+                                                sample_data):
+    import pyarrow.parquet as pq
+
+    client = SQLAlchemyClient('sqlite:///database.db')
+
+    dag = DAG()
+    SQLDump('SELECT * FROM numbers',
+            File('dump.parquet'),
+            dag,
+            name='dump',
+            client=client,
+            chunksize=10,
+            io_handler=io.ParquetRowGroupIO)
+    dag.build()
+
+    dump = pd.read_parquet('dump.parquet')
+    db = pd.read_sql_query('SELECT * FROM numbers', client.engine)
+    client.close()
+
+    assert Path('dump.parquet').is_file()
+    assert pq.ParquetFile('dump.parquet').num_row_groups == 10
+    assert dump.equals(db)
+
+
+@pytest.mark.parametrize('write_queue_size', [None, 2])
+def test_dump_zero_rows_to_single_parquet_file(tmp_directory, sample_data,
+                                               write_queue_size):
+    import pyarrow.parquet as pq
+
+    client = SQLAlchemyClient('sqlite:///database.db')
+
+    dag = DAG()
+    SQLDump('SELECT * FROM numbers WHERE 1 = 0',
+            File('dump.parquet'),
+            dag,
+            name='dump',
+            client=client,
+            chunksize=10,
+            write_queue_size=write_queue_size,
+            io_handler=io.ParquetRowGroupIO)
+    dag.build()
+    client.close()
+
+    table = pq.read_table('dump.parquet')
+
+    assert table.num_rows == 0
+    assert table.column_names == ['a', 'b']
+
+
+class ArrowCursor:
+    """Cursor that returns data in Arrow format (like DuckDB's)
+    """
+    def __init__(self, table):
+        self.table = table
+        self.closed = False
+
+    def execute(self, code):
+        pass
+
+    def fetch_record_batch(self, rows_per_batch):
+        import pyarrow as pa
+
+        batches = self.table.to_batches(max_chunksize=rows_per_batch)
+        return pa.RecordBatchReader.from_batches(self.table.schema, batches)
+
+    def fetch_arrow_table(self):
+        return self.table
+
+    def fetchmany(self):
+        raise AssertionError('fetchmany should not be called')
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize('chunksize, io_handler, num_row_groups', [
+    [None, io.ParquetIO, 1],
+    [10, io.ParquetRowGroupIO, 10],
+])
+def test_dump_fetches_arrow_batches(tmp_directory, chunksize, io_handler,
+                                    num_row_groups):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.table({'a': range(100), 'b': range(100, 200)})
+    client = Mock()
+    client.connection.cursor.return_value = ArrowCursor(table)
+
+    dag = DAG()
+    SQLDump('SELECT * FROM numbers',
+            File('dump.parquet'),
+            dag,
+            name='dump',
+            client=client,
+            chunksize=chunksize,
+            io_handler=io_handler)
+    dag.build()
+
+    assert pq.read_table('dump.parquet').equals(table)
+    assert pq.ParquetFile('dump.parquet').num_row_groups == num_row_groups
+
+
 def test_can_dump_postgres(tmp_directory, pg_client_and_schema):
     pg_client, _ = pg_client_and_schema
 
@@ -1,5 +1,18 @@
+import pickle
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from ploomber.codediffer import CodeDiffer, normalize_python
+from ploomber import DAG
+from ploomber.codediffer import (CodeDiffer, NormalizedCodeCache,
+                                 normalize_python)
+from ploomber.products import File
+from ploomber.tasks import PythonCallable
+
+
+def _touch(product):
+    Path(str(product)).touch()
+
 
 fn_w_docsting = '''
 def x():
@@ -189,3 +202,153 @@ def test_different_with_unserializable_params(a_params, b_params, expected):
                                  extension='py')
 
     assert res is expected
+
+
+@pytest.fixture
+def counting_normalizer(monkeypatch):
+    calls = []
+
+    def normalizer(code):
+        calls.append(code)
+        return code.strip()
+
+    monkeypatch.setitem(CodeDiffer.NORMALIZERS, 'py', normalizer)
+    return calls
+
+
+def test_normalize_is_memoized(counting_normalizer):
+    differ = CodeDiffer()
+
+    assert differ.normalize(' x = 1', extension='py') == 'x = 1'
+    assert differ.normalize(' x = 1', extension='py') == 'x = 1'
+    assert counting_normalizer == [' x = 1']
+
+
+def test_memo_is_bounded(counting_normalizer):
+    differ = CodeDiffer(max_size=2)
+
+    for code in ['a', 'b', 'c', 'a']:
+        differ.normalize(code, extension='py')
+
+    assert counting_normalizer == ['a', 'b', 'c', 'a']
+
+
+def test_copies_share_memo(counting_normalizer):
+    differ = CodeDiffer()
+    differ.normalize(' x = 1', extension='py')
+
+    copy = pickle.loads(pickle.dumps(differ))
+
+    assert copy.normalize(' x = 1', extension='py') == 'x = 1'
+    assert counting_normalizer == [' x = 1']
+
+
+def test_normalize_from_several_threads(counting_normalizer):
+    differ = CodeDiffer()
+    copies = [pickle.loads(pickle.dumps(differ)) for _ in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(lambda d: d.normalize(' x = 1', extension='py'),
+                         copies))
+
+    assert results == ['x = 1'] * 8
+    assert counting_normalizer == [' x = 1']
+
+
+def test_normalize_uses_disk_cache(tmp_directory, counting_normalizer):
+    CodeDiffer(cache='normalized.db').normalize(' x = 1', extension='py')
+    differ = CodeDiffer(cache='normalized.db')
+
+    assert differ.normalize(' x = 1', extension='py') == 'x = 1'
+    assert counting_normalizer == [' x = 1']
+
+
+def test_disk_cache_is_bounded(tmp_directory):
+    cache = NormalizedCodeCache('normalized.db', max_size=2)
+
+    for key in ['a', 'b', 'c']:
+        cache.set(key, key)
+
+    assert cache.get('a') is None
+    assert cache.get('b') == 'b'
+    assert cache.get('c') == 'c'
+
+
+def test_is_different_does_not_normalize_equal_code(counting_normalizer):
+    differ = CodeDiffer()
+
+    res, _ = differ.is_different(a='x = 1',
+                                 b='x = 1',
+                                 a_params={},
+                                 b_params={},
+                                 extension='py')
+
+    assert res is False
+    assert counting_normalizer == []
+
+
+def test_is_different_uses_stored_digest(counting_normalizer):
+    differ = CodeDiffer()
+    a_digest = CodeDiffer().normalized_digest(' x = 1', extension='py')
+    counting_normalizer.clear()
+
+    res, _ = differ.is_different(a=' x = 1',
+                                 b='x = 1 ',
+                                 a_params={},
+                                 b_params={},
+                                 extension='py',
+                                 a_digest=a_digest)
+
+    assert res is False
+    assert counting_normalizer == ['x = 1 ']
+
+
+def test_is_different_ignores_digest_from_other_code(counting_normalizer):
+    differ = CodeDiffer()
+    a_digest = differ.normalized_digest('x = 2', extension='py')
+
+    res, _ = differ.is_different(a='x = 1',
+                                 b='x = 2',
+                                 a_params={},
+                                 b_params={},
+                                 extension='py',
+                                 a_digest=a_digest)
+
+    assert res is True
+
+
+def test_does_not_normalize_when_storing_metadata(tmp_directory,
+                                                  counting_normalizer):
+    dag = DAG()
+    PythonCallable(_touch, File('file.txt'), dag, name='touch')
+    dag.build()
+
+    assert counting_normalizer == []
+    assert dag['touch'].product.metadata.normalized_digest is None
+
+
+def test_stores_normalized_digest_in_metadata_if_cached(tmp_directory):
+    dag = DAG()
+    PythonCallable(_touch, File('file.txt'), dag, name='touch')
+    source = str(dag['touch'].source)
+    # e.g., normalized when rendering because the code changed
+    dag.differ.normalize(source, extension='py')
+    dag.build()
+
+    assert (dag['touch'].product.metadata.normalized_digest ==
+            CodeDiffer().normalized_digest(source, extension='py'))
+
+
+def test_normalized_digest_without_computing(counting_normalizer):
+    differ = CodeDiffer()
+
+    assert differ.normalized_digest(' x = 1', extension='py',
+                                    compute=False) is None
+
+    differ.normalize(' x = 1', extension='py')
+
+    assert (differ.normalized_digest(' x = 1', extension='py',
+                                     compute=False) ==
+            differ.normalized_digest(' x = 1', extension='py'))
+    assert counting_normalizer == [' x = 1']
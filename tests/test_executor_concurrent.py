@@ -0,0 +1,125 @@
+import os
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from ploomber import DAG
+from ploomber.exceptions import DAGBuildError
+from ploomber.executors import Concurrent
+from ploomber.clients import SQLAlchemyClient
+from ploomber.products import File, SQLiteRelation
+from ploomber.tasks import PythonCallable, SQLScript
+
+
+def write_worker(product):
+    Path(str(product)).write_text(
+        f'{os.getpid()},{threading.current_thread().name}')
+
+
+def write_worker_upstream(upstream, product):
+    write_worker(product)
+
+
+def failing(product):
+    raise Exception('Bad things happened')
+
+
+def _read_worker(path):
+    pid, thread = Path(path).read_text().split(',')
+    return int(pid), thread
+
+
+def test_runs_io_bound_tasks_in_threads(tmp_directory):
+    dag = DAG(executor=Concurrent(threads=2, processes=2))
+    io_bound = PythonCallable(write_worker, File('io.txt'), dag, name='io')
+    io_bound.IO_BOUND = True
+    cpu_bound = PythonCallable(write_worker_upstream,
+                               File('cpu.txt'),
+                               dag,
+                               name='cpu')
+    io_bound >> cpu_bound
+
+    dag.build()
+
+    pid, thread = _read_worker('io.txt')
+    assert pid == os.getpid()
+    assert thread.startswith('ploomber-task')
+
+    pid, _ = _read_worker('cpu.txt')
+    assert pid != os.getpid()
+
+
+def test_sql_tasks(tmp_directory):
+    client = SQLAlchemyClient('sqlite:///database.db')
+    dag = DAG(executor=Concurrent(threads=4))
+    dag.clients[SQLScript] = client
+    dag.clients[SQLiteRelation] = client
+
+    for name in ['a', 'c']:
+        SQLScript('CREATE TABLE {{product}} AS SELECT 1 AS x',
+                  SQLiteRelation((name, 'table')),
+                  dag,
+                  name=name)
+
+    b = SQLScript('CREATE TABLE {{product}} AS SELECT * FROM {{upstream.a}}',
+                  SQLiteRelation(('b', 'table')),
+                  dag,
+                  name='b')
+    dag['a'] >> b
+
+    report = dag.build()
+
+    assert set(report['name']) == {'a', 'b', 'c'}
+
+    with sqlite3.connect('database.db') as conn:
+        tables = conn.execute("SELECT name FROM sqlite_master "
+                              "WHERE type = 'table'").fetchall()
+
+    assert {('a', ), ('b', ), ('c', )} <= set(tables)
+
+
+def test_failing_io_bound_task(tmp_directory):
+    dag = DAG(executor=Concurrent(threads=2))
+    task = PythonCallable(failing, File('a.txt'), dag, name='a')
+    task.IO_BOUND = True
+
+    with pytest.raises(DAGBuildError) as excinfo:
+        dag.build()
+
+    assert 'Bad things happened' in str(excinfo.value)
+
+
+def test_reuse_workers(tmp_directory):
+    executor = Concurrent(threads=2, reuse_workers=True)
+    dag = DAG(executor=executor)
+    task = PythonCallable(write_worker, File('a.txt'), dag, name='a')
+    task.IO_BOUND = True
+
+    dag.build()
+    pool = executor._thread_pool
+
+    dag.build(force=True)
+
+    assert executor._thread_pool is pool
+
+    executor.close()
+
+    assert executor._thread_pool is None
+
+
+def test_pickle():
+    executor = pickle.loads(pickle.dumps(Concurrent(threads=3)))
+
+    assert executor.threads == 3
+    assert executor._thread_pool is None
+
+
+@pytest.mark.parametrize('threads', [0, '1'])
+def test_error_on_invalid_threads(threads):
+    with pytest.raises(ValueError) as excinfo:
+        Concurrent(threads=threads)
+
+    assert 'threads must be a positive integer' in str(excinfo.value)
@@ -1,8 +1,16 @@
 from pathlib import Path
 
+import pytest
+
 from ploomber import DAG
-from ploomber.products import File
-from ploomber.tasks import PythonCallable
+from ploomber.constants import TaskStatus
+from ploomber.exceptions import DAGBuildError
+from ploomber.executors import Parallel
+from ploomber.executors._scheduler import (ReadyQueue, Capacity,
+                                           critical_path_ranks)
+from ploomber.clients import SQLAlchemyClient
+from ploomber.products import File, SQLiteRelation
+from ploomber.tasks import PythonCallable, SQLScript
 
 # FIXME: test_dag also uses the parallel executor to test interaction of the
 # executor with other features, here, we should add executor-specific features
@@ -33,3 +41,290 @@ def test_parallel_execution(tmp_directory):
     (a1 + a2) >> b >> c
 
     dag.build()
+
+
+def test_parallel_execution_aborts_downstream(tmp_directory):
+    dag = DAG('dag', executor=Parallel(processes=2))
+
+    a = PythonCallable(failing, File('a.txt'), dag, 'a')
+    b = PythonCallable(touch_root, File('b.txt'), dag, 'b')
+    c = PythonCallable(touch, File('c.txt'), dag, 'c')
+    d = PythonCallable(touch, File('d.txt'), dag, 'd')
+
+    (a + b) >> c >> d
+
+    with pytest.raises(DAGBuildError):
+        dag.build()
+
+    assert a.exec_status == TaskStatus.Errored
+    assert b.exec_status == TaskStatus.Executed
+    assert c.exec_status == TaskStatus.Aborted
+    assert d.exec_status == TaskStatus.Aborted
+
+
+def test_ready_queue(tmp_directory):
+    dag = DAG('dag')
+
+    a1 = PythonCallable(touch_root, File('a1.txt'), dag, 'a1')
+    a2 = PythonCallable(touch_root, File('a2.txt'), dag, 'a2')
+    b = PythonCallable(touch, File('b.txt'), dag, 'b')
+    c = PythonCallable(touch, File('c.txt'), dag, 'c')
+
+    (a1 + a2) >> b >> c
+
+    dag.render()
+    ready = ReadyQueue(dag)
+
+    assert {ready.pop().name, ready.pop().name} == {'a1', 'a2'}
+    assert ready.pop() is None
+
+    a1.exec_status = TaskStatus.Executed
+    assert ready.done(a1) == []
+    assert ready.pop() is None
+
+    a2.exec_status = TaskStatus.Executed
+    ready.done(a2)
+    assert ready.pop() is b
+    assert not ready.all_finished
+
+
+def test_ready_queue_retires_aborted_tasks(tmp_directory):
+    dag = DAG('dag')
+
+    a = PythonCallable(touch_root, File('a.txt'), dag, 'a')
+    b = PythonCallable(touch, File('b.txt'), dag, 'b')
+    c = PythonCallable(touch, File('c.txt'), dag, 'c')
+
+    a >> b >> c
+
+    dag.render()
+    ready = ReadyQueue(dag)
+
+    assert ready.pop() is a
+
+    a.exec_status = TaskStatus.Errored
+
+    assert ready.done(a) == [b, c]
+    assert ready.pop() is None
+    assert ready.all_finished
+
+
+def _make_sql_dag(client, executor=None):
+    dag = DAG('dag', executor=executor or Parallel(processes=2))
+    dag.clients[SQLScript] = client
+    dag.clients[SQLiteRelation] = client
+
+    for name in ['a', 'b', 'c']:
+        SQLScript('CREATE TABLE {{product}} AS SELECT 1 AS x',
+                  SQLiteRelation((name, 'table')),
+                  dag,
+                  name=name)
+
+    PythonCallable(touch_root, File('d.txt'), dag, 'd')
+
+    return dag
+
+
+def test_ready_queue_admits_tasks_within_client_limits(tmp_directory):
+    client = SQLAlchemyClient('sqlite:///database.db', max_concurrency=2)
+    dag = _make_sql_dag(client)
+    dag.render()
+
+    ready = ReadyQueue(dag)
+    capacity = Capacity()
+    submitted = []
+
+    for _ in range(3):
+        task = ready.pop(admit=capacity.fits)
+        capacity.acquire(task)
+        submitted.append(task.name)
+
+    assert submitted == ['a', 'b', 'd']
+    assert ready.pop(admit=capacity.fits) is None
+
+    capacity.release(dag['a'])
+
+    assert ready.pop(admit=capacity.fits) is dag['c']
+
+    client.close()
+
+
+def test_parallel_execution_with_pooled_client(tmp_directory):
+    client = SQLAlchemyClient('sqlite:///database.db',
+                              pool_size=1,
+                              max_concurrency=1)
+    dag = _make_sql_dag(client)
+
+    report = dag.build()
+
+    assert set(report['name']) == {'a', 'b', 'c', 'd'}
+    assert all(dag[name].product.exists() for name in ['a', 'b', 'c'])
+
+    client.close()
+
+
+def _make_resources_dag(executor):
+    dag = DAG(executor=executor)
+
+    for name, resources in [('a', {
+            'db': 1
+    }), ('b', {
+            'db': 1,
+            'memory_gb': 16
+    }), ('c', {
+            'memory_gb': 16
+    }), ('d', {
+            'unknown': 100
+    }), ('e', {})]:
+        task = PythonCallable(touch_root, File(f'{name}.txt'), dag, name)
+        task.resources = resources
+
+    return dag
+
+
+def test_ready_queue_admits_tasks_within_resources(tmp_directory):
+    dag = _make_resources_dag(Parallel())
+    dag.render()
+
+    ready = ReadyQueue(dag)
+    capacity = Capacity({'db': 1, 'memory_gb': 16})
+    submitted = []
+
+    while True:
+        task = ready.pop(admit=capacity.fits)
+
+        if task is None:
+            break
+
+        capacity.acquire(task)
+        submitted.append(task.name)
+
+    # b does not fit (db is taken by a) and c takes all the memory
+    assert submitted == ['a', 'c', 'd', 'e']
+
+    capacity.release(dag['a'])
+
+    assert ready.pop(admit=capacity.fits) is None
+
+    capacity.release(dag['c'])
+
+    assert ready.pop(admit=capacity.fits) is dag['b']
+
+
+def test_parallel_execution_with_resources(tmp_directory):
+    dag = _make_resources_dag(
+        Parallel(processes=2, resources={
+            'db': 1,
+            'memory_gb': 16
+        }))
+
+    report = dag.build()
+
+    assert set(report['name']) == {'a', 'b', 'c', 'd', 'e'}
+
+
+def test_error_if_task_requires_more_than_available(tmp_directory):
+    dag = _make_resources_dag(Parallel(resources={'db': 1, 'memory_gb': 8}))
+
+    with pytest.raises(ValueError) as excinfo:
+        dag.build()
+
+    assert ("Task 'b' requires 16 of resource 'memory_gb' but the executor "
+            "only has 8") in str(excinfo.value)
+    assert not Path('a.txt').exists()
+
+
+@pytest.mark.parametrize('resources', [
+    {
+        'db': -1
+    },
+    {
+        'db': True
+    },
+])
+def test_error_on_invalid_executor_resources(resources):
+    with pytest.raises(ValueError) as excinfo:
+        Parallel(resources=resources)
+
+    assert 'Invalid resources for Parallel' in str(excinfo.value)
+
+
+def test_parallel_execution_critical_path(tmp_directory):
+    dag = DAG('dag', executor=Parallel(processes=2,
+                                       priority='critical_path'))
+
+    a1 = PythonCallable(touch_root, File('a1.txt'), dag, 'a1')
+    a2 = PythonCallable(touch_root, File('a2.txt'), dag, 'a2')
+    b = PythonCallable(touch, File('b.txt'), dag, 'b')
+    c = PythonCallable(touch, File('c.txt'), dag, 'c')
+
+    (a1 + a2) >> b >> c
+
+    dag.build()
+
+    assert isinstance(b.product.metadata.elapsed, float)
+
+
+def test_invalid_priority():
+    with pytest.raises(ValueError) as excinfo:
+        Parallel(priority='unknown')
+
+    assert 'Invalid priority' in str(excinfo.value)
+
+
+def test_ready_queue_critical_path(tmp_directory):
+    dag = DAG('dag')
+
+    short = PythonCallable(touch_root, File('short.txt'), dag, 'short')
+    long_ = PythonCallable(touch_root, File('long.txt'), dag, 'long')
+    down = PythonCallable(touch, File('down.txt'), dag, 'down')
+    long_ >> down
+
+    dag.render()
+
+    # no historical data, the longest chain goes first
+    ready = ReadyQueue(dag, priority='critical_path')
+    assert ready.pop() is long_
+    assert ready.pop() is short
+
+    # tasks are weighted by their elapsed time
+    short.product.metadata.update_locally({'elapsed': 10})
+    long_.product.metadata.update_locally({'elapsed': 1})
+    down.product.metadata.update_locally({'elapsed': 1})
+
+    ranks = critical_path_ranks(dag)
+    assert ranks == {'short': (-10, 0), 'long': (-2, -1), 'down': (-1, 0)}
+
+    ready = ReadyQueue(dag, priority='critical_path')
+    assert ready.pop() is short
+    assert ready.pop() is long_
+
+
+def test_critical_path_ties_broken_by_number_of_descendants(tmp_directory):
+    dag = DAG('dag')
+
+    shallow = PythonCallable(touch_root, File('shallow.txt'), dag, 'shallow')
+    shallow_down = PythonCallable(touch, File('shallow-down.txt'), dag,
+                                  'shallow-down')
+    deep = PythonCallable(touch_root, File('deep.txt'), dag, 'deep')
+    deep_down = PythonCallable(touch, File('deep-down.txt'), dag, 'deep-down')
+    deep_last = PythonCallable(touch, File('deep-last.txt'), dag, 'deep-last')
+    shallow >> shallow_down
+    deep >> deep_down >> deep_last
+
+    dag.render()
+
+    # both paths cost 3 and both roots have a single direct dependent
+    shallow.product.metadata.update_locally({'elapsed': 2})
+    shallow_down.product.metadata.update_locally({'elapsed': 1})
+
+    for task in (deep, deep_down, deep_last):
+        task.product.metadata.update_locally({'elapsed': 1})
+
+    ranks = critical_path_ranks(dag)
+    assert ranks['shallow'] == (-3, -1)
+    assert ranks['deep'] == (-3, -2)
+
+    ready = ReadyQueue(dag, priority='critical_path')
+    assert ready.pop() is deep
+    assert ready.pop() is shallow
@@ -18,7 +18,7 @@ import pytest
 from jupyter_server import serverapp
 
 from ploomber import DAG
-from ploomber.jupyter.manager import derive_class
+from ploomber.jupyter.manager import derive_class, FileWatcher
 from ploomber.jupyter.dag import JupyterDAGManager
 from ploomber.spec import DAGSpec
 
@@ -1061,7 +1061,7 @@ entry-point = pipeline.another.yaml
     assert dag_first is not dag_second
 
 
-def test_reloads_dag_if_upstream_changes(tmp_nbs, monkeypatch):
+def test_updates_task_if_upstream_changes(tmp_nbs, monkeypatch):
     monkeypatch.setenv('ENTRY_POINT', 'pipeline.extract-upstream.yaml')
 
     cm = PloomberContentsManager()
@@ -1075,10 +1075,81 @@ def test_reloads_dag_if_upstream_changes(tmp_nbs, monkeypatch):
     jupytext.write(nb, 'plot.py')
 
     # request the one whose upstream changed
+    model = cm.get('plot.py')
+    dag_second = cm.dag
+
+    # only the task is updated
+    assert dag_first is dag_second
+    assert set(dag_second['plot'].upstream) == {'load'}
+    assert 'load' in get_injected_cell(model['content'])['source']
+
+
+def test_reloads_dag_if_upstream_does_not_exist(tmp_nbs, monkeypatch):
+    monkeypatch.setenv('ENTRY_POINT', 'pipeline.extract-upstream.yaml')
+
+    cm = PloomberContentsManager()
+
+    cm.get('load.py')
+    dag_first = cm.dag
+
+    nb = jupytext.read('plot.py')
+    nb['cells'][1]['source'] = 'upstream = ["load"]'
+    jupytext.write(nb, 'plot.py')
     cm.get('plot.py')
+
+    nb['cells'][1]['source'] = 'upstream = ["missing"]'
+    jupytext.write(nb, 'plot.py')
+    cm.get('plot.py')
+
+    # the pipeline is reloaded and it fails to initialize
+    assert dag_first['plot'].upstream.keys() == {'load'}
+    assert cm.dag is None
+
+
+def test_caches_dag_if_spec_is_touched(tmp_nbs):
+    cm = PloomberContentsManager()
+
+    cm.get('load.py')
+    dag_first = cm.dag
+
+    Path('pipeline.yaml').touch()
+
+    cm.get('clean.py')
     dag_second = cm.dag
 
-    assert dag_first is not dag_second
+    assert dag_first is dag_second
+
+
+def test_file_watcher(tmp_directory):
+    watcher = FileWatcher(racy_window=0)
+    path = Path('file.txt')
+    path.write_text('content')
+
+    assert watcher.changed(path)
+
+    watcher.record(path)
+
+    assert not watcher.changed(path)
+
+    path.write_text('new content')
+
+    assert watcher.changed(path)
+
+    watcher.record(path)
+    path.unlink()
+
+    assert watcher.changed(path)
+
+
+def test_file_watcher_does_not_record_recently_modified_files(
+        tmp_directory):
+    watcher = FileWatcher(racy_window=60)
+    path = Path('file.txt')
+    path.write_text('content')
+
+    watcher.record(path)
+
+    assert watcher.changed(path)
 
 
 def test_caches_dag_if_upstream_changes_but_extra_upstream_is_false(tmp_nbs):